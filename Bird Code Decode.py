@@ -1,17 +1,48 @@
+import sys
+
+# Hand off to an already running instance before loading anything heavy,
+# so second launches exit within milliseconds
+if __name__ == "__main__":
+    from bird_code_profiling import configure_from_argv
+    sys.argv[1:] = configure_from_argv(sys.argv[1:])
+    from bird_code_storm import parse_load_test_args
+    load_test, sys.argv[1:] = parse_load_test_args(sys.argv[1:])
+    testing = load_test.soak is not None or load_test.storm is not None
+    if testing:
+        # The load tests use their own listener and tray, so the real
+        # backends (which need a display) are not loaded
+        import os
+        os.environ.setdefault("PYNPUT_BACKEND", "dummy")
+        os.environ.setdefault("PYSTRAY_BACKEND", "dummy")
+    from bird_code_daemon import forward_to_running_instance
+    if not testing and forward_to_running_instance(sys.argv[1:]):
+        sys.exit(0)
+
 import json
 import tkinter as tk
-import pyperclip
 import threading
-import platform
-import pyautogui
+import itertools
 import os
-import sys
 import time
 from pynput import keyboard
 import pystray
 from PIL import Image, ImageDraw, ImageFont
 from tkinter import messagebox, simpledialog
 from bird_code_manager import BirdCodeManager
+from bird_code_annotate import expand_codes
+from bird_code_clipboard import ClipboardError, ClipboardWatcher, FakeClipboard, default_backend
+from bird_code_daemon import AlreadyRunning, CommandServer
+from bird_code_history import get_history, parse_as_of
+from bird_code_images import PREFETCH_LIMIT, ImageCards
+from bird_code_locales import LocaleNames, available_locales, load_locale_setting, save_locale_setting
+from bird_code_memory import MemoryMonitor, format_soak_report, soak_test
+from bird_code_popup import PopupHost
+from bird_code_prefix import PrefixIndex
+from bird_code_profiling import profiled, snapshot_memory, start_profile
+from bird_code_providers import default_chain, format_answers, is_code
+from bird_code_repository import get_repository
+from bird_code_session import SessionLog, likely_codes
+from bird_code_storm import CapturingListener, FakePopupHost, FakeTray, format_storm_report, storm_test
 
 
 # ------- CONFIGURATION -------
@@ -22,44 +53,79 @@ POPUP_DURATION = 3000
 POPUP_BG = "black"
 POPUP_FG = "white"
 POPUP_FONT = ("Arial", 14)
+
+# Most completions listed for 1-3 letters on the clipboard
+COMPLETION_LIMIT = 8
+
+# Show species thumbnails from the "images" folder in popups
+SHOW_IMAGES = True
+
+# Decodes driven by --soak when no count is given
+SOAK_ITERATIONS = 5000
+
+# Hotkey presses per second and seconds of --storm when not given
+STORM_RATE = 100
+STORM_DURATION = 600
+
+# Seconds each clipboard text is kept during --storm, so some hotkey
+# actions find the clipboard unchanged
+STORM_HOLD = 1.0
 # ---------------------------
 
 # Global variables
 code_map = None
+popup_names = None
 tray_icon = None
+command_server = None
+session_log = SessionLog()
+popup_host = PopupHost(POPUP_DURATION, POPUP_BG, POPUP_FG, POPUP_FONT)
+code_prefixes = PrefixIndex()
+code_history = get_history()
+# Clipboard read in-process through the popup host's Tk root, with
+# pyperclip as the fallback
+clipboard = ClipboardWatcher(default_backend(popup_host))
+# Last message shown for the clipboard, reused while it and the
+# decode_state() it was made in are unchanged, and the key of its popup
+# so slower lookups can update it
+last_message = None
+last_state = None
+last_key = None
+popup_keys = itertools.count()
+# Where codes are looked up: the code database first, then other lists
+lookup_chain = None
+memory_monitor = None
+image_cards = None
 setup_aborted = False
 
-# Load the code data from JSON file
+# Get the shared code repository, loading it from the JSON file on first use
 def load_codes():
-    try:
-        with open("bird codes.json", "r") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        # Sample data as fallback
-        sample_data = {"TEST": "This is a test code", "ABCD": "Sample code description"}
-        # Save sample data
-        with open("bird codes.json", "w") as f:
-            json.dump(sample_data, f, indent=4)
-        return sample_data
-    except Exception as e:
-        return {"ERROR": "Failed to load data"}
+    return get_repository()
 
 # Function to open the codes file
 def open_codes_file():
     """Opens the bird code manager window instead of the raw file"""
     try:
-        # Create the manager window with current root window as master
-        BirdCodeManager(None, callback=lambda: reload_codes())
+        # Create the manager window. It edits the shared repository, so
+        # saved changes are visible to lookups without reloading the file
+        BirdCodeManager(None, repository=code_map)
         return True
     except Exception as e:
         show_popup(f"Error opening code manager:\n{str(e)}")
         return False
 
-# Reload codes after editing
+# Reload codes from disk, e.g. after the file was edited by hand
 def reload_codes():
-    global code_map
-    code_map = load_codes()
-    return True
+    try:
+        code_map.load()
+        code_history.load()
+        lookup_chain.clear_cache()
+        # Pick up photos imported or edited since they were loaded
+        if image_cards is not None:
+            image_cards.refresh()
+        return True
+    except Exception as e:
+        show_popup(f"Error reloading codes:\n{str(e)}")
+        return False
 
 # Create a simple icon image
 def create_icon_image():
@@ -237,6 +303,11 @@ def setup_tray_icon():
     
     # Function to exit the application
     def exit_action(icon):
+        session_log.stop()
+        if memory_monitor is not None:
+            memory_monitor.stop()
+        if command_server is not None:
+            command_server.stop()
         icon.stop()
         os._exit(0)
     
@@ -252,11 +323,47 @@ def setup_tray_icon():
     def open_welcome(icon):
         show_welcome_screen()
     
+    # Menu entry for one locale; choosing it swaps the popup's name shard
+    def locale_item(locale):
+        def select(icon, item):
+            if popup_names.set_locale(locale):
+                save_locale_setting(locale)
+        return pystray.MenuItem(locale, select, radio=True,
+                                checked=lambda item: popup_names.locale == locale)
+    
+    # Function to show the running tallies for this session
+    def show_tally(icon):
+        show_popup(session_log.summary_text())
+    
+    # Function to show memory use, and growth if the budget monitor is on
+    def show_memory(icon):
+        monitor = memory_monitor or MemoryMonitor(log_path=None)
+        show_popup(monitor.summary_text())
+    
+    # Function to write names next to the codes on the clipboard
+    def expand_clipboard(icon):
+        show_popup(rewrite_clipboard())
+    
+    # Function to export the session tallies to a timestamped CSV file
+    def export_tally(icon):
+        path = time.strftime("session tally %Y%m%d-%H%M%S.csv")
+        try:
+            count = session_log.export_csv(path)
+            show_popup(f"Exported {count} species to\n{os.path.abspath(path)}")
+        except Exception as e:
+            show_popup(f"Error exporting tally:\n{str(e)}")
+    
     try:
         # Create the menu
         menu = pystray.Menu(
             pystray.MenuItem("Show Welcome", open_welcome),
             pystray.MenuItem("Edit Codes", edit_codes),
+            pystray.MenuItem("Session Tally", show_tally),
+            pystray.MenuItem("Export Tally", export_tally),
+            pystray.MenuItem("Expand Codes on Clipboard", expand_clipboard),
+            pystray.MenuItem("Language", pystray.Menu(
+                lambda: (locale_item(locale) for locale in available_locales()))),
+            pystray.MenuItem("Memory Usage", show_memory),
             pystray.MenuItem("Help", show_help),
             pystray.MenuItem("Quit", exit_action)
         )
@@ -282,73 +389,146 @@ def setup_tray_icon():
         return None
 
 # Show popup window at mouse position
-def show_popup(message):
+@profiled("popup")
+def show_popup(message, image=None, key=None):
+    # With memory profiling on, record allocation growth between popups
+    snapshot_memory(f"popup: {message.splitlines()[0] if message else ''}")
     try:
-        # Get current mouse position
-        mouse_x, mouse_y = pyautogui.position()
-        
-        # Function to create and display the popup
-        def create_popup():
-            # Create root window
-            popup = tk.Tk()
-            popup.withdraw()  # Hide initially
-            popup.overrideredirect(True)  # Remove title bar and borders
-            popup.attributes("-topmost", True)  # Keep on top
-            
-            # Create a frame with border
-            frame = tk.Frame(popup, bg=POPUP_BG, padx=15, pady=10,
-                           highlightbackground="white", highlightthickness=1)
-            frame.pack()
-            
-            # Add the text label
-            label = tk.Label(frame, text=message, bg=POPUP_BG, fg=POPUP_FG,
-                           font=POPUP_FONT, justify=tk.LEFT)
-            label.pack()
-            
-            # Position window near mouse cursor
-            popup.update_idletasks()
-            width = popup.winfo_width()
-            height = popup.winfo_height()
-            
-            popup.geometry(f"+{mouse_x + 20}+{mouse_y + 20}")
-            popup.deiconify()  # Make visible
-            popup.update()  # Force update to show immediately
-            
-            # Auto-close after set duration
-            popup.after(POPUP_DURATION, popup.destroy)
-            popup.mainloop()
-        
-        # Run in a new thread to avoid blocking
-        thread = threading.Thread(target=create_popup)
-        thread.daemon = True
-        thread.start()
-        
-        return True
-        
+        # All popups come from one resident Tk root on its own thread
+        return popup_host.show(message, image, key)
     except Exception as e:
         #print(f"Error showing popup: {e}")
         return False
 
 def get_clipboard_text():
     try:
-        current_os = platform.system()
-        if current_os == "Linux":
-            # pyperclip should work if xclip or xsel is installed
-            return pyperclip.paste()
-        elif current_os == "Windows" or current_os == "Darwin":
-            return pyperclip.paste()
-        else:
-            return None
-    except pyperclip.PyperclipException:
+        return clipboard.read()[0]
+    except ClipboardError:
         return None
 
+# Build the popup message for a piece of clipboard text. Lookups that
+# take longer (other lists, a lookup service) call on_update with the
+# new message as they answer.
+def decode_text(text, on_update=None):
+    # Trim and convert to uppercase
+    text = text.strip().upper()
+    
+    # Check if it's a valid 4-letter code
+    if len(text) == 4 and text.isalpha():
+        tally_code(text)
+        # Show the name in the chosen locale, plus what other lists say
+        updated = None
+        if on_update is not None:
+            updated = lambda answers, pending: on_update(code_message(text, answers, pending))
+        answers, pending = lookup_chain.lookup(text, updated)
+        return code_message(text, answers, pending)
+    
+    # A code and a year ("MYWA 1970"): what the code meant back then
+    as_of = parse_as_of(text)
+    if as_of is not None:
+        code, year = as_of
+        name = code_history.name_as_of(code, year, code_map.get(code))
+        if name is None:
+            return f"{code}: Not in use in {year}"
+        return f"{code} ({year}): {name}"
+    
+    # The start of a code: list the codes it could be
+    if 1 <= len(text) <= 3 and text.isalpha():
+        return completion_text(text)
+    
+    # A species name: show its code
+    answers, pending = lookup_chain.lookup(text)
+    if answers:
+        return format_answers(text, answers, pending)
+    
+    # Invalid code format - show more detailed error
+    if len(text) > 20:
+        # If clipboard content is very long, truncate it
+        preview = text[:17] + "..."
+        return f"Invalid content: '{preview}'\nNeed a 4-letter code."
+    return f"Invalid code: '{text}'\nNeed a 4-letter code."
+
+# Count a decoded code in the session tally if it is in the code database
+def tally_code(code):
+    name = code_map.get(code)
+    if name is not None:
+        session_log.record(code, name)
+
+# What a code's popup depends on besides the code: the codes, their
+# history and the locale. A popup made in another state is not reused.
+def decode_state():
+    return code_map.version, code_history.version, popup_names.locale
+
+# Replace the clipboard with the same text, each known code followed by
+# its name ("AMRO" -> "AMRO (American Robin)"). Tabs and line breaks are
+# kept, so copied spreadsheet cells paste straight back. Returns the
+# message to show.
+def rewrite_clipboard():
+    try:
+        text = get_clipboard_text()
+        if not text:
+            return "Clipboard is empty.\nCopy some text with codes first."
+        expanded, count = expand_codes(text, code_map)
+        if count == 0:
+            return "No codes to expand on the clipboard."
+        # One write, whatever the size of the selection
+        clipboard.write(expanded)
+        return f"Expanded {count} code{'s' if count != 1 else ''} on the clipboard."
+    except ClipboardError:
+        return "Could not access clipboard.\nPlease try again."
+
+# Popup text for a code, with its earlier meanings if it has any
+def code_message(code, answers, pending=0):
+    message = format_answers(code, answers, pending)
+    if code in code_history:
+        message += f"\nEarlier meanings:\n{code_history.summary(code)}"
+    return message
+
+# Code whose thumbnail goes with the popup for some text, or None
+def popup_image(text):
+    code = text.strip().upper()
+    return code if image_cards is not None and code in code_map else None
+
+# Load thumbnails for the codes decoded most often lately, so their
+# first popups are as quick as the rest
+def start_image_cards():
+    global image_cards
+    if not SHOW_IMAGES:
+        return
+    cards = ImageCards(popup_host, code_map)
+    if not cards.available:
+        return
+    image_cards = popup_host.images = cards
+    cards.prefetch(likely_codes(session_log.path, PREFETCH_LIMIT))
+
+# Popup listing the codes that start with a prefix, the ones decoded
+# most this session first
+def completion_text(prefix):
+    codes, total = code_prefixes.complete(prefix, COMPLETION_LIMIT, session_log.session_counts)
+    if not codes:
+        return f"{prefix}: No codes start with '{prefix}'"
+    lines = [f"{prefix}…: {total} code{'s' if total != 1 else ''}"]
+    for code in codes:
+        lines.append(f"{code}  {popup_names.name(code, code_map.get(code, ''))}")
+    if total > len(codes):
+        lines.append(f"… and {total - len(codes)} more")
+    return "\n".join(lines)
+
+# Start of the popups on_hotkey_action shows when it fails; the storm
+# test counts them as errors
+CLIPBOARD_FAILED = "Clipboard access failed"
+HOTKEY_FAILED = "Error processing clipboard"
+
 # Action to perform when hotkey is triggered
+@profiled("hotkey")
 def on_hotkey_action():
+    global last_message, last_state, last_key
     try:
         # Get text from clipboard
-        clipboard_text = get_clipboard_text()
-        if clipboard_text is None:
-            show_popup("Clipboard access failed.\nOn Linux, install 'xclip' or 'xsel'.")
+        try:
+            clipboard_text, changed = clipboard.read()
+        except ClipboardError:
+            show_popup(f"{CLIPBOARD_FAILED}.\nOn Linux, install 'xclip' or 'xsel'.")
             return
 
         
@@ -356,32 +536,81 @@ def on_hotkey_action():
         if not clipboard_text:
             show_popup("Clipboard is empty.\nCopy a 4-letter code first.")
             return
-            
-        # Trim and convert to uppercase
-        clipboard_text = clipboard_text.strip().upper()
         
-        # Check if it's a valid 4-letter code
-        if len(clipboard_text) == 4 and clipboard_text.isalpha():
-            # Look up the code
-            result = code_map.get(clipboard_text, "Code not found")
-            # Show the result
-            show_popup(f"{clipboard_text}: {result}")
+        # The same code as last time, in the same state: show the same
+        # popup without looking it up again, but still count it. Other
+        # text is decoded every time, as completions are ranked by the
+        # session tally.
+        code = clipboard_text.strip().upper()
+        state = decode_state()
+        if not changed and last_message is not None and state == last_state and is_code(code):
+            tally_code(code)
         else:
-            # Invalid code format - show more detailed error
-            if len(clipboard_text) > 20:
-                # If clipboard content is very long, truncate it
-                clipboard_preview = clipboard_text[:17] + "..."
-                show_popup(f"Invalid content: '{clipboard_preview}'\nNeed a 4-letter code.")
-            else:
-                show_popup(f"Invalid code: '{clipboard_text}'\nNeed a 4-letter code.")
-    except pyperclip.PyperclipException:
-        show_popup("Could not access clipboard.\nPlease try again.")
+            last_key = next(popup_keys)
+            last_state = state
+            last_message = decode_text(clipboard_text, popup_updater(last_key))
+        show_popup(last_message, popup_image(clipboard_text), last_key)
     except Exception as e:
         # A more detailed error message for debugging
         error_msg = str(e)
         if len(error_msg) > 50:  # Truncate very long error messages
             error_msg = error_msg[:47] + "..."
-        show_popup(f"Error processing clipboard:\n{error_msg}")
+        show_popup(f"{HOTKEY_FAILED}:\n{error_msg}")
+
+# Callback that puts slower lookup answers into the popup with key
+def popup_updater(key):
+    def update(message):
+        global last_message
+        if key == last_key:
+            last_message = message
+        popup_host.update(key, message)
+    return update
+
+# Commands accepted over the instance socket from later launches
+# and from the command-line client (bird_code_daemon.py)
+def create_command_handlers():
+    def decode(text):
+        message = decode_text(text or "")
+        show_popup(message, popup_image(text or ""))
+        return message
+    
+    # With text, return it expanded; without, rewrite the clipboard
+    def expand(text):
+        if text:
+            return expand_codes(text, code_map)[0]
+        message = rewrite_clipboard()
+        show_popup(message)
+        return message
+    
+    def reload(text):
+        reload_codes()
+        return f"Reloaded {len(code_map)} codes"
+    
+    def open_manager(text):
+        threading.Thread(target=open_codes_file, daemon=True).start()
+        return "Opening code manager"
+    
+    def show_stats(text):
+        summary = session_log.summary_text()
+        show_popup(summary)
+        return summary
+    
+    def ping(text):
+        return "Bird Code Decode is running"
+    
+    def activate(text):
+        show_popup("Bird Code Decode is already running.\nUse the tray icon for options.")
+        return "Bird Code Decode is already running"
+    
+    return {
+        "decode": decode,
+        "expand": expand,
+        "reload": reload,
+        "open-manager": open_manager,
+        "show-stats": show_stats,
+        "ping": ping,
+        "activate": activate,
+    }
 
 # Run a test popup
 def test_popup():
@@ -399,10 +628,25 @@ def test_popup():
 def main():
     
     global setup_aborted
+    global command_server, memory_monitor
+    
+    # Profile startup up to the main loop when enabled
+    startup_profile = start_profile("startup")
     
     # Load codes first
-    global code_map
+    global code_map, popup_names, lookup_chain
     code_map = load_codes()
+    popup_names = LocaleNames(code_map, load_locale_setting())
+    code_prefixes.attach(code_map)
+    lookup_chain = default_chain(code_map, popup_names)
+    
+    # Own the instance socket so later launches forward to this one
+    command_server = CommandServer(create_command_handlers())
+    try:
+        command_server.start()
+    except AlreadyRunning:
+        print("Bird Code Decode is already running. Exiting.")
+        return
     
     # Check for first-time setup by looking for config files
     key_file = "hotkey_config.json"
@@ -418,6 +662,7 @@ def main():
         result = setup_keyboard_listener()
         if result is None or result[0] is None:
             print("Setup was aborted. Exiting application.")
+            command_server.stop()
             return
             
         listener, first_time_setup = result
@@ -426,6 +671,7 @@ def main():
         result = setup_keyboard_listener()
         if result is None or result[0] is None:
             print("Setup was aborted. Exiting application.")
+            command_server.stop()
             return
             
         listener, first_time_setup = result
@@ -433,9 +679,20 @@ def main():
     # Start the listener
     listener.start()
     
+    # Start writing the decode session log in the background
+    session_log.start()
+    
+    # Watch memory use if a budget is set in app_config.json
+    memory_monitor = MemoryMonitor.from_config(on_warning=show_popup)
+    if memory_monitor is not None:
+        memory_monitor.start()
+    
     # Set up the system tray icon
     setup_tray_icon()
     
+    # Species thumbnails for popups, loaded ahead in the background
+    start_image_cards()
+    
     # Only show welcome screen on subsequent runs if user has opted to see it
     if not first_time_ever and (first_time_setup or should_show_welcome()):
         show_welcome_screen()
@@ -443,6 +700,8 @@ def main():
         # If not showing welcome, show test popup instead
         test_popup()
     
+    startup_profile.stop()
+    
     # This is the key part: keep the main thread alive
     try:
         print("Entering main loop")
@@ -456,22 +715,26 @@ def main():
     finally:
         print("Shutting down...")
         # Perform cleanup
+        session_log.stop()
+        command_server.stop()
+        if memory_monitor is not None:
+            memory_monitor.stop()
         if tray_icon is not None:
             tray_icon.stop()
 
-# Run setup keyboard listener function (keeping it unchanged)
-def setup_keyboard_listener():
+# Run setup keyboard listener function (keeping it unchanged). The storm
+# test passes its own listener class and hotkey character.
+def setup_keyboard_listener(listener_class=None, hotkey_char=None):
     global setup_aborted  # Access the global flag
     
     # First check if we have a saved key detection
     key_file = "hotkey_config.json"
-    hotkey_char = None
     
     # Flag to indicate if we're running configuration
     first_time_setup = False
     
     try:
-        if os.path.exists(key_file):
+        if hotkey_char is None and os.path.exists(key_file):
             with open(key_file, "r") as f:
                 config = json.load(f)
                 # The actual key code might be stored as an escape sequence
@@ -586,7 +849,7 @@ def setup_keyboard_listener():
             pass
 
     # Create and return the listener
-    listener = keyboard.Listener(on_press=on_press, on_release=on_release)
+    listener = (listener_class or keyboard.Listener)(on_press=on_press, on_release=on_release)
     
     # Return both the listener and the first_time_setup flag
     return listener, first_time_setup
@@ -721,5 +984,76 @@ def run_setup_wizard():
     # Return the detected key
     return detected_key
 
+# Leak soak test: decode thousands of codes through the real popup path
+# and report what memory and objects are left behind.
+#   python "Bird Code Decode.py" --soak [count]
+def run_soak_test(iterations=SOAK_ITERATIONS):
+    global code_map, popup_names, session_log, lookup_chain
+    code_map = load_codes()
+    popup_names = LocaleNames(code_map, load_locale_setting())
+    code_prefixes.attach(code_map)
+    lookup_chain = default_chain(code_map, popup_names)
+    # Keep the soak decodes out of the real session log. The log runs as
+    # usual, minus the rolling windows, whose by-design growth over the
+    # hour would otherwise be reported as a leak; it is flushed before
+    # every sample so unwritten entries are not counted either.
+    session_log = SessionLog(os.devnull, windows=())
+    session_log.start()
+    inputs = list(code_map)[:500] + ["ZZZX", "not a code"]
+    
+    def decode(text):
+        show_popup(decode_text(text))
+    
+    def settle():
+        session_log.flush()
+        popup_host.drain()
+    
+    try:
+        report = soak_test(decode, inputs, iterations, settle=settle)
+    finally:
+        session_log.stop()
+        popup_host.stop()
+        lookup_chain.shutdown()
+    print(format_soak_report(report))
+    return 0
+
+# Hotkey storm: press the hotkey `rate` times a second for `duration`
+# seconds through the real listener callbacks, with fake clipboard,
+# popups and tray, and report how the app kept up.
+#   python "Bird Code Decode.py" --storm [rate] [duration] [burst] [pause]
+def run_storm_test(rate=STORM_RATE, duration=STORM_DURATION, burst=None, pause=0.0):
+    global code_map, popup_names, session_log, lookup_chain, popup_host, clipboard, tray_icon
+    code_map = load_codes()
+    popup_names = LocaleNames(code_map, load_locale_setting())
+    code_prefixes.attach(code_map)
+    lookup_chain = default_chain(code_map, popup_names)
+    # A running log without rolling windows, as in the soak test, so its
+    # buffers are not counted as growth
+    session_log = SessionLog(os.devnull, windows=())
+    session_log.start()
+    popup_host = FakePopupHost(error_prefixes=(CLIPBOARD_FAILED, HOTKEY_FAILED))
+    fake_clipboard = FakeClipboard()
+    clipboard = ClipboardWatcher(fake_clipboard)
+    tray_icon = FakeTray()
+    
+    hotkey_char = '\x0c'
+    listener, _ = setup_keyboard_listener(CapturingListener, hotkey_char)
+    chord = [keyboard.Key.ctrl_l, keyboard.Key.shift, keyboard.KeyCode.from_char(hotkey_char)]
+    inputs = list(code_map)[:500] + ["ZZZX", "AM", "not a code"]
+    print(f"Pressing the hotkey {rate:g} times a second for {duration:g} s...")
+    try:
+        report = storm_test(listener, chord, popup_host, fake_clipboard, inputs, rate, duration,
+                            burst, pause, hold=rate * STORM_HOLD, settle=session_log.flush)
+    finally:
+        session_log.stop()
+        lookup_chain.shutdown()
+    print(format_storm_report(report))
+    return 0 if report.dropped == 0 and report.errors == 0 else 1
+
 if __name__ == "__main__":
+    if load_test.storm is not None:
+        defaults = [STORM_RATE, STORM_DURATION, None, 0.0]
+        sys.exit(run_storm_test(*(load_test.storm + defaults[len(load_test.storm):])))
+    if load_test.soak is not None:
+        sys.exit(run_soak_test(load_test.soak or SOAK_ITERATIONS))
     main()
\ No newline at end of file
@@ -0,0 +1,77 @@
+import re
+import sys
+
+# Expand the codes in a block of text, such as cells copied from a
+# spreadsheet, leaving everything else (tabs, line breaks, other words)
+# exactly as it was so the result pastes straight back.
+
+# How each known code is written out
+ANNOTATE = "annotate"   # AMRO -> AMRO (American Robin)
+REPLACE = "replace"     # AMRO -> American Robin
+STYLES = (ANNOTATE, REPLACE)
+
+# A whole 4-letter word, not already followed by " (" so expanding twice
+# changes nothing
+CODE_PATTERN = re.compile(r"\b[A-Z]{4}\b(?! \()")
+CODE_PATTERN_ANY_CASE = re.compile(r"\b[A-Za-z]{4}\b(?! \()")
+
+
+# Expand every known code in text. `lookup` maps a code to its name
+# (a dict, CodeStore or anything with .get). Returns (new_text, count).
+# re.sub walks the text once and joins the pieces once, so large
+# selections take linear time.
+def expand_codes(text, lookup, style=ANNOTATE, ignore_case=False):
+    pattern = CODE_PATTERN_ANY_CASE if ignore_case else CODE_PATTERN
+    count = 0
+
+    def expand(match):
+        nonlocal count
+        word = match.group()
+        code = word.upper()
+        name = lookup.get(code)
+        if name is None:
+            return word
+        count += 1
+        return name if style == REPLACE else f"{code} ({name})"
+
+    return pattern.sub(expand, text), count
+
+
+# Command line entry point, for files too big to go through the clipboard:
+#   python bird_code_annotate.py records.tsv -o named.tsv [--replace]
+def main(argv=None):
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Write bird names next to the codes in a text file")
+    parser.add_argument("input", help="Text, CSV or TSV file ('-' for standard input)")
+    parser.add_argument("-o", "--output", default="-", help="Output file (default: standard output)")
+    parser.add_argument("--codes", default="bird codes.json", help="JSON code file")
+    parser.add_argument("--replace", action="store_true", help="Replace codes with names instead of annotating")
+    parser.add_argument("--ignore-case", action="store_true", help="Also expand lower-case codes")
+    args = parser.parse_args(argv)
+
+    with open(args.codes, "r") as f:
+        code_data = json.load(f)
+    style = REPLACE if args.replace else ANNOTATE
+
+    source = sys.stdin if args.input == "-" else open(args.input, "r", newline="", encoding="utf-8")
+    output = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+    total = 0
+    try:
+        # Line by line, so memory stays flat however big the file is
+        for line in source:
+            line, count = expand_codes(line, code_data, style, args.ignore_case)
+            output.write(line)
+            total += count
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+    print(f"Expanded {total} codes", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
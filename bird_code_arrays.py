@@ -0,0 +1,282 @@
+# Array-level access to the bird code database for analysis work:
+#
+#   names, found = bird_code_arrays.decode(df["species"])
+#   names, found = bird_code_arrays.decode(df["species"], years=df["date"])
+#   codes, found = bird_code_arrays.encode(df["common_name"])
+#
+# Inputs may be lists, NumPy arrays or pandas Series; Series in give Series
+# out with the same index. With years (numbers or dates), codes with a
+# taxonomy history are decoded as of each row's year. Requires NumPy
+# (pandas is optional).
+import threading
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from bird_code_history import get_history, record_year
+from bird_code_repository import get_repository
+from bird_code_store import CODE_SPACE, code_to_index
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("bird_code_arrays needs NumPy: pip install numpy")
+
+
+# Split a pandas Series into its values and index; other inputs pass through
+def _unwrap(values):
+    if type(values).__module__.startswith("pandas") and hasattr(values, "index"):
+        return values.to_numpy(), values.index
+    return values, None
+
+
+# Wrap results back into Series when the input was one
+def _wrap(index, *arrays):
+    if index is None:
+        return arrays
+    import pandas as pd
+    return tuple(pd.Series(array, index=index) for array in arrays)
+
+
+# Turn any sequence of strings into a fixed-width unicode array. Entries
+# that are not strings (None, NaN) become empty strings.
+def _as_unicode(values):
+    texts, inverse = _unicode_parts(values)
+    return texts if inverse is None else texts[inverse]
+
+
+# Like _as_unicode, but columns that repeat a few values come back as
+# (distinct texts, position of each row's text) so callers can work on the
+# distinct values only. Other inputs give (texts, None).
+def _unicode_parts(values):
+    array = np.asarray(values)
+    if array.dtype.kind == "U":
+        return array.reshape(-1), None
+    if array.dtype.kind == "S":
+        return np.char.decode(array.reshape(-1), "ascii", "replace"), None
+    flat = array.reshape(-1)
+    if flat.dtype.kind == "O" and _repeats_values(flat):
+        # Gaps factorize to -1, which picks the trailing empty string
+        import pandas as pd
+        inverse, uniques = pd.factorize(flat)
+        texts = np.array([value if isinstance(value, str) else "" for value in uniques] + [""],
+                         dtype=str)
+        return texts, inverse
+    return np.array([value if isinstance(value, str) else "" for value in flat], dtype=str), None
+
+
+# Rows sampled to decide whether a column is worth factorizing
+FACTORIZE_SAMPLE = 10000
+
+
+# True if pandas is available and a sample of an object array holds few
+# distinct values, as code columns do
+def _repeats_values(flat):
+    if flat.size < FACTORIZE_SAMPLE:
+        return False
+    try:
+        import pandas as pd
+    except ImportError:
+        return False
+    _, uniques = pd.factorize(flat[:FACTORIZE_SAMPLE])
+    return len(uniques) * 10 <= FACTORIZE_SAMPLE
+
+
+# Normalize a name for reverse lookups
+def _name_key(name):
+    return " ".join(name.lower().split())
+
+
+# Lookup tables for vectorized decoding. Codes map to a position in the
+# AAAA..ZZZZ space by base-26 arithmetic, and a dense table of that size
+# gives each code's row in the name array.
+class CodeArrays:
+    def __init__(self, code_data, history=None):
+        _require_numpy()
+        items = sorted(code_data.items())
+        self.codes = np.array([code for code, _ in items] + [""], dtype=object)
+        self.names = np.array([name for _, name in items] + [None], dtype=object)
+        self.missing_row = len(items)
+
+        # Dense code-space index -> row; unknown codes point at the missing row
+        self.rows = np.full(CODE_SPACE, self.missing_row, dtype=np.int32)
+        for row, (code, _) in enumerate(items):
+            index = code_to_index(code)
+            if index >= 0:
+                self.rows[index] = row
+
+        self.rows_by_name = {}
+        for row, (_, name) in enumerate(items):
+            self.rows_by_name.setdefault(_name_key(name), row)
+
+        # Revisions per code-space index as (starts, ends, names, in use)
+        # arrays, and a flag table marking the codes that have any
+        self.revisions = {}
+        self.has_history = np.zeros(CODE_SPACE, dtype=bool)
+        for code in (history.codes() if history is not None else ()):
+            index = code_to_index(code)
+            revisions = history.revisions(code)
+            if index < 0 or not revisions:
+                continue
+            self.has_history[index] = True
+            self.revisions[index] = (
+                np.array([revision.start for revision in revisions], dtype=np.int64),
+                np.array([revision.end for revision in revisions], dtype=np.int64),
+                np.array([revision.name for revision in revisions], dtype=object),
+                np.array([revision.name is not None for revision in revisions], dtype=bool))
+
+    # Convert codes to code-space indices. Returns (indices, valid) where
+    # valid marks entries that are four letters (any case, outer spaces
+    # ignored); invalid entries get index 0.
+    def code_indices(self, codes):
+        array, inverse = _unicode_parts(codes)
+        indices, valid = self._text_indices(array)
+        if inverse is not None:
+            return indices[inverse], valid[inverse]
+        return indices, valid
+
+    def _text_indices(self, array):
+        if array.size == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=bool)
+        if array.dtype.itemsize > 16 or np.any(array.view(np.uint32) == 32):
+            array = np.char.strip(array)
+        raw = array.view(np.uint32).reshape(array.size, -1)
+        if raw.shape[1] < 4:
+            return np.zeros(array.size, dtype=np.int64), np.zeros(array.size, dtype=bool)
+
+        # Exactly four characters, each A-Z or a-z. OR-ing in 0x20 folds
+        # upper case onto lower case and leaves only letters in 97..122.
+        valid = np.ones(array.size, dtype=bool)
+        if raw.shape[1] > 4:
+            valid &= ~np.any(raw[:, 4:], axis=1)
+        indices = np.zeros(array.size, dtype=np.int64)
+        for column in range(4):
+            letter = (raw[:, column] | 32).astype(np.int64) - 97
+            valid &= (letter >= 0) & (letter < 26)
+            indices = indices * 26 + letter
+        indices[~valid] = 0
+        return indices, valid
+
+    # Decode codes to names. Returns (names, found); unknown or malformed
+    # codes get `missing`. With years, rows whose code has a history are
+    # decoded as of their year (codes not in use that year are not found).
+    def decode(self, codes, missing=None, years=None):
+        values, index = _unwrap(codes)
+        indices, valid = self.code_indices(values)
+        rows = np.where(valid, self.rows[indices], self.missing_row)
+        found = rows != self.missing_row
+        names = self.names[rows]
+        if years is not None and self.revisions:
+            self._apply_history(indices, valid, _years_array(years), names, found)
+        if missing is not None:
+            names[~found] = missing
+        return _wrap(index, names, found)
+
+    # Replace names, in place, for rows whose code had other meanings. Only
+    # those rows are touched, one vectorized pass per code with history.
+    def _apply_history(self, indices, valid, years, names, found):
+        affected = np.flatnonzero(valid & self.has_history[indices] & (years != _NO_YEAR))
+        if affected.size == 0:
+            return
+        affected_indices = indices[affected]
+        for code_index in np.unique(affected_indices):
+            rows = affected[affected_indices == code_index]
+            starts, ends, revision_names, in_use = self.revisions[int(code_index)]
+            row_years = years[rows]
+            position = np.searchsorted(starts, row_years, side="right") - 1
+            clipped = np.clip(position, 0, None)
+            in_revision = (position >= 0) & (row_years < ends[clipped])
+            after = row_years >= ends[-1]
+            names[rows] = np.where(in_revision, revision_names[clipped],
+                                   np.where(after, names[rows], None))
+            found[rows] = np.where(in_revision, in_use[clipped], after & found[rows])
+
+    # Reverse lookup of names to codes. Returns (codes, found). Matching
+    # ignores case and repeated spaces; each distinct name is looked up once.
+    def encode(self, names, missing=None):
+        values, index = _unwrap(names)
+        uniques, inverse = _factorize(values)
+        unique_rows = np.array(
+            [self.rows_by_name.get(_name_key(name), self.missing_row)
+             if isinstance(name, str) else self.missing_row for name in uniques],
+            dtype=np.int64)
+        rows = unique_rows[inverse] if len(inverse) else np.zeros(0, dtype=np.int64)
+        found = rows != self.missing_row
+        codes = self.codes[rows]
+        codes[~found] = missing
+        return _wrap(index, codes, found)
+
+
+# Marks rows without a usable year
+_NO_YEAR = np.iinfo(np.int64).min if np is not None else None
+
+
+# Years as an int64 array. Numbers are used as they are; date objects and
+# text are read once per distinct value.
+def _years_array(years):
+    values, _ = _unwrap(years)
+    array = np.asarray(values)
+    if array.dtype.kind in "iu":
+        return array.astype(np.int64).reshape(-1)
+    if array.dtype.kind == "f":
+        flat = array.reshape(-1)
+        unknown = np.isnan(flat)
+        return np.where(unknown, _NO_YEAR, np.where(unknown, 0, flat).astype(np.int64))
+    if array.dtype.kind == "M":
+        flat = array.reshape(-1)
+        return np.where(np.isnat(flat), _NO_YEAR,
+                        flat.astype("datetime64[Y]").astype(np.int64) + 1970)
+    uniques, inverse = _factorize(values)
+    parsed = []
+    for value in uniques:
+        year = record_year(value)
+        parsed.append(_NO_YEAR if year is None else year)
+    return np.array(parsed, dtype=np.int64)[inverse]
+
+
+# Distinct values and, for each input, the position of its value
+def _factorize(values):
+    try:
+        import pandas as pd
+    except ImportError:
+        pd = None
+    if pd is not None:
+        inverse, uniques = pd.factorize(np.asarray(values, dtype=object).reshape(-1))
+        return list(uniques) + [None], np.where(inverse < 0, len(uniques), inverse)
+    array = _as_unicode(values)
+    uniques, inverse = np.unique(array, return_inverse=True)
+    return list(uniques), inverse.reshape(-1)
+
+
+# Tables built from the shared repository and history, rebuilt after
+# either changes
+_default_arrays = None
+_default_lock = threading.Lock()
+
+
+def _invalidate(*args):
+    global _default_arrays
+    _default_arrays = None
+
+
+# The lookup tables for the repository that the decoder and manager use
+def get_code_arrays():
+    global _default_arrays
+    with _default_lock:
+        if _default_arrays is None:
+            repository = get_repository()
+            history = get_history()
+            repository.subscribe(_invalidate)
+            history.subscribe(_invalidate)
+            _default_arrays = CodeArrays(repository.snapshot(), history)
+        return _default_arrays
+
+
+def decode(codes, missing=None, years=None):
+    return get_code_arrays().decode(codes, missing, years)
+
+
+def encode(names, missing=None):
+    return get_code_arrays().encode(names, missing)
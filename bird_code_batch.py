@@ -0,0 +1,122 @@
+import json
+import re
+import sys
+
+from bird_code_merge import DESCRIPTION_CHANGED, REMOVED, RENAMED, Change, apply_changes, format_diff
+from bird_code_store import code_to_index
+
+# Batch edits over many codes at once. Each function only plans the edit:
+# it returns the list of merge Changes (plus any problems), which callers
+# apply in one go with bird_code_merge.apply_changes.
+
+
+# Delete every listed code
+def delete_changes(code_data, codes):
+    return [Change(REMOVED, code, code_data[code], None, None)
+            for code in codes if code in code_data]
+
+
+# Replace old_prefix with new_prefix on every listed code that starts with
+# it. Returns (changes, problems); problems are (code, reason) pairs for
+# codes that cannot be renamed, and the batch should not be applied while
+# there are any.
+def prefix_rename_changes(code_data, codes, old_prefix, new_prefix):
+    old_prefix = old_prefix.strip().upper()
+    new_prefix = new_prefix.strip().upper()
+    renaming = [code for code in codes if code in code_data and code.startswith(old_prefix)]
+    moving_away = set(renaming)
+
+    changes = []
+    problems = []
+    targets = {}
+    for code in renaming:
+        new_code = new_prefix + code[len(old_prefix):]
+        if new_code == code:
+            continue
+        if code_to_index(new_code) < 0:
+            problems.append((code, f"{new_code} is not a 4-letter code"))
+        elif new_code in code_data and new_code not in moving_away:
+            problems.append((code, f"{new_code} already exists"))
+        elif new_code in targets:
+            problems.append((code, f"{new_code} would also come from {targets[new_code]}"))
+        else:
+            targets[new_code] = code
+            changes.append(Change(RENAMED, code, code_data[code], code_data[code], new_code))
+    return changes, problems
+
+
+# Find and replace text in the descriptions of the listed codes. With
+# regex set, find is a regular expression and replace may use \1 etc.
+def find_replace_changes(code_data, codes, find, replace, regex=False, ignore_case=False):
+    flags = re.IGNORECASE if ignore_case else 0
+    pattern = re.compile(find if regex else re.escape(find), flags)
+    if not regex:
+        # Keep backslashes in the replacement literal
+        replace = replace.replace("\\", "\\\\")
+    changes = []
+    for code in codes:
+        name = code_data.get(code)
+        if name is None:
+            continue
+        new_name = pattern.sub(replace, name)
+        if new_name != name:
+            changes.append(Change(DESCRIPTION_CHANGED, code, name, new_name, code))
+    return changes
+
+
+# Command line entry point, selecting codes with the manager's search syntax:
+#   python bird_code_batch.py delete "code:XX*" [--apply]
+#   python bird_code_batch.py rename-prefix "code:AM*" AM AX [--apply]
+#   python bird_code_batch.py replace "name:grey" grey gray [--regex] [--apply]
+def main(argv=None):
+    import argparse
+    from bird_code_search import SearchIndex
+
+    parser = argparse.ArgumentParser(description="Edit many bird codes at once")
+    parser.add_argument("-i", "--input", default="bird codes.json", help="JSON code file")
+    parser.add_argument("--apply", action="store_true", help="Write the result back to the file")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    delete_parser = subparsers.add_parser("delete", help="Delete the matching codes")
+    delete_parser.add_argument("query")
+    rename_parser = subparsers.add_parser("rename-prefix", help="Change the prefix of matching codes")
+    rename_parser.add_argument("query")
+    rename_parser.add_argument("old_prefix")
+    rename_parser.add_argument("new_prefix")
+    replace_parser = subparsers.add_parser("replace", help="Find and replace in descriptions")
+    replace_parser.add_argument("query")
+    replace_parser.add_argument("find")
+    replace_parser.add_argument("replace")
+    replace_parser.add_argument("--regex", action="store_true")
+    replace_parser.add_argument("--ignore-case", action="store_true")
+    args = parser.parse_args(argv)
+
+    with open(args.input, "r") as f:
+        code_data = json.load(f)
+    index = SearchIndex.from_entries(
+        (code, {"code": code, "name": name}) for code, name in code_data.items())
+    codes = index.search(args.query)
+
+    problems = []
+    if args.command == "delete":
+        changes = delete_changes(code_data, codes)
+    elif args.command == "rename-prefix":
+        changes, problems = prefix_rename_changes(code_data, codes, args.old_prefix, args.new_prefix)
+    else:
+        changes = find_replace_changes(code_data, codes, args.find, args.replace,
+                                       args.regex, args.ignore_case)
+
+    for code, reason in problems:
+        print(f"! {code}: {reason}", file=sys.stderr)
+    print(format_diff(changes))
+    if problems:
+        return 1
+
+    if args.apply and changes:
+        apply_changes(code_data, changes)
+        with open(args.input, "w") as f:
+            json.dump(code_data, f, indent=4, sort_keys=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
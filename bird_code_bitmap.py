@@ -0,0 +1,216 @@
+import json
+import re
+import sys
+from array import array
+
+from bird_code_repository import ADDED, RELOADED, REMOVED
+from bird_code_store import ALPHABET, CODE_SPACE, code_to_index, index_to_code
+
+# Finds the first byte that still has a free bit
+NOT_FULL = re.compile(rb"[^\xff]")
+# Maps full bytes to 0 and everything else to 1 for backward searches
+FREE_BYTES = bytes(0 if value == 0xFF else 1 for value in range(256))
+
+
+# One bit per possible 4-letter code (26^4 bits, about 56 KB), plus
+# running counts per first letter and per two-letter prefix. Codes that
+# are not four letters A-Z are ignored.
+class CodeBitmap:
+    def __init__(self):
+        self._bits = bytearray((CODE_SPACE + 7) // 8)
+        self.letter_counts = array("I", bytes(4 * 26))
+        self.prefix_counts = array("I", bytes(4 * 26 * 26))
+        self.count = 0
+
+    @classmethod
+    def from_codes(cls, codes):
+        bitmap = cls()
+        for code in codes:
+            bitmap.add(code)
+        return bitmap
+
+    def _set(self, index, occupied):
+        byte, bit = divmod(index, 8)
+        mask = 1 << bit
+        if bool(self._bits[byte] & mask) == occupied:
+            return False
+        self._bits[byte] ^= mask
+        step = 1 if occupied else -1
+        self.letter_counts[index // 17576] += step
+        self.prefix_counts[index // 676] += step
+        self.count += step
+        return True
+
+    # Mark a code as used; returns True if it was free
+    def add(self, code):
+        index = code_to_index(code)
+        return index >= 0 and self._set(index, True)
+
+    # Mark a code as free; returns True if it was used
+    def discard(self, code):
+        index = code_to_index(code)
+        return index >= 0 and self._set(index, False)
+
+    def _occupied(self, index):
+        return bool(self._bits[index >> 3] & (1 << (index & 7)))
+
+    def __contains__(self, code):
+        index = code_to_index(code)
+        return index >= 0 and self._occupied(index)
+
+    def __len__(self):
+        return self.count
+
+    # Number of used codes starting with a prefix of 0-4 letters
+    def count_prefix(self, prefix):
+        prefix = prefix.upper()
+        if not prefix:
+            return self.count
+        if len(prefix) == 1:
+            index = code_to_index(prefix + "AAA")
+            return self.letter_counts[index // 17576] if index >= 0 else 0
+        if len(prefix) == 2:
+            index = code_to_index(prefix + "AA")
+            return self.prefix_counts[index // 676] if index >= 0 else 0
+        start = code_to_index(prefix.ljust(4, "A"))
+        if start < 0 or len(prefix) > 4:
+            return 0
+        size = 26 ** (4 - len(prefix))
+        return sum(1 for index in range(start, start + size) if self._occupied(index))
+
+    # First free code at or after a code (wrapping round to AAAA), or None
+    def next_free(self, code, wrap=True):
+        index = code_to_index(code)
+        if index < 0:
+            return None
+        found = self._next_free_index(index)
+        if found is None and wrap:
+            found = self._next_free_index(0)
+        return index_to_code(found) if found is not None else None
+
+    # Last free code at or before a code, or None
+    def previous_free(self, code):
+        index = code_to_index(code)
+        if index < 0:
+            return None
+        found = self._previous_free_index(index)
+        return index_to_code(found) if found is not None else None
+
+    # Free code closest to a code in alphabetical order, or None if full
+    def nearest_free(self, code):
+        index = code_to_index(code)
+        if index < 0:
+            return None
+        after = self._next_free_index(index)
+        before = self._previous_free_index(index)
+        if after is None and before is None:
+            return None
+        if before is None or (after is not None and after - index <= index - before):
+            return index_to_code(after)
+        return index_to_code(before)
+
+    # Up to limit free codes, nearest first
+    def free_near(self, code, limit=10):
+        index = code_to_index(code)
+        if index < 0:
+            return []
+        results = []
+        after = self._next_free_index(index)
+        before = self._previous_free_index(index - 1) if index > 0 else None
+        while len(results) < limit and (after is not None or before is not None):
+            if before is None or (after is not None and after - index <= index - before):
+                results.append(index_to_code(after))
+                after = self._next_free_index(after + 1) if after + 1 < CODE_SPACE else None
+            else:
+                results.append(index_to_code(before))
+                before = self._previous_free_index(before - 1) if before > 0 else None
+        return results
+
+    def _next_free_index(self, index):
+        bits = self._bits
+        byte = index >> 3
+        # Finish the partly used first byte bit by bit
+        for candidate in range(index, min((byte + 1) * 8, CODE_SPACE)):
+            if not self._occupied(candidate):
+                return candidate
+        match = NOT_FULL.search(bits, byte + 1)
+        if match is None:
+            return None
+        start = match.start() * 8
+        for candidate in range(start, min(start + 8, CODE_SPACE)):
+            if not self._occupied(candidate):
+                return candidate
+        return None
+
+    def _previous_free_index(self, index):
+        if index < 0:
+            return None
+        byte = index >> 3
+        for candidate in range(index, byte * 8 - 1, -1):
+            if not self._occupied(candidate):
+                return candidate
+        found = self._bits.translate(FREE_BYTES).rfind(b"\x01", 0, byte)
+        if found < 0:
+            return None
+        for candidate in range(found * 8 + 7, found * 8 - 1, -1):
+            if candidate < CODE_SPACE and not self._occupied(candidate):
+                return candidate
+        return None
+
+    # Keep the bitmap in step with a repository's change events
+    def attach(self, repository):
+        def on_change(events):
+            for event in events:
+                if event.action == RELOADED:
+                    self.rebuild(repository)
+                elif event.action == ADDED:
+                    self.add(event.code)
+                elif event.action == REMOVED:
+                    self.discard(event.code)
+                # Name changes do not affect occupancy
+        self.rebuild(repository)
+        repository.subscribe(on_change)
+        return on_change
+
+    # Replace the contents with a fresh set of codes
+    def rebuild(self, codes):
+        fresh = CodeBitmap.from_codes(codes)
+        self._bits = fresh._bits
+        self.letter_counts = fresh.letter_counts
+        self.prefix_counts = fresh.prefix_counts
+        self.count = fresh.count
+
+
+# Command line entry point:
+#   python bird_code_bitmap.py count AM
+#   python bird_code_bitmap.py free-near NEWA [-n 10]
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Query which 4-letter codes are in use")
+    parser.add_argument("-i", "--input", default="bird codes.json", help="JSON code file")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    count_parser = subparsers.add_parser("count", help="Count codes starting with a prefix")
+    count_parser.add_argument("prefix", nargs="?", default="")
+    near_parser = subparsers.add_parser("free-near", help="List free codes near a code")
+    near_parser.add_argument("code")
+    near_parser.add_argument("-n", type=int, default=10, help="Number of codes to list")
+    args = parser.parse_args(argv)
+
+    with open(args.input, "r") as f:
+        bitmap = CodeBitmap.from_codes(json.load(f))
+
+    if args.command == "count":
+        if args.prefix:
+            print(bitmap.count_prefix(args.prefix))
+        else:
+            for letter in ALPHABET:
+                print(f"{letter}\t{bitmap.count_prefix(letter)}")
+    else:
+        for code in bitmap.free_near(args.code.upper(), args.n):
+            print(code)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+import hashlib
+import threading
+
+# Clipboard backends. Every backend has read() and write(text), and raises
+# ClipboardError when it cannot reach the clipboard.
+#
+#   TkClipboard         reads the selection in-process through the popup
+#                       host's resident Tk root (no subprocess per read)
+#   PyperclipClipboard  pyperclip, which on Linux runs xclip/xsel each time
+#   FakeClipboard       in-memory text, for tests and load runs
+#
+# default_backend() tries them in order of CLIPBOARD_BACKENDS.
+
+# ------- CONFIGURATION -------
+# Backends to try, first choice first
+CLIPBOARD_BACKENDS = ("tk", "pyperclip")
+
+# Seconds to wait for the Tk thread before falling back
+TK_TIMEOUT = 1.0
+# ---------------------------
+
+
+# The clipboard could not be read or written
+class ClipboardError(Exception):
+    pass
+
+
+class TkClipboard:
+    name = "tk"
+
+    def __init__(self, host, timeout=TK_TIMEOUT):
+        self.host = host
+        self.timeout = timeout
+
+    def _call(self, func):
+        try:
+            return self.host.call(func, self.timeout)
+        except Exception as e:
+            raise ClipboardError(f"Tk clipboard unavailable: {e}")
+
+    def read(self):
+        return self._call(_tk_read)
+
+    def write(self, text):
+        def write(root):
+            root.clipboard_clear()
+            root.clipboard_append(text)
+            root.update_idletasks()
+        self._call(write)
+
+
+# Runs on the Tk thread. An empty clipboard, or one holding only non-text
+# data, raises TclError, which here just means "no text".
+def _tk_read(root):
+    import tkinter as tk
+    try:
+        return root.clipboard_get(type="UTF8_STRING")
+    except tk.TclError:
+        pass
+    try:
+        return root.clipboard_get()
+    except tk.TclError:
+        return ""
+
+
+class PyperclipClipboard:
+    name = "pyperclip"
+
+    def _run(self, action):
+        try:
+            import pyperclip
+        except ImportError:
+            raise ClipboardError("pyperclip is not installed")
+        try:
+            return action(pyperclip)
+        except pyperclip.PyperclipException as e:
+            raise ClipboardError(str(e))
+
+    def read(self):
+        return self._run(lambda pyperclip: pyperclip.paste())
+
+    def write(self, text):
+        self._run(lambda pyperclip: pyperclip.copy(text))
+
+
+# Clipboard held in memory. Set `fail` to make every access raise.
+class FakeClipboard:
+    name = "fake"
+
+    def __init__(self, text=""):
+        self.text = text
+        self.fail = False
+        self.reads = 0
+        self.writes = 0
+
+    def read(self):
+        if self.fail:
+            raise ClipboardError("Fake clipboard failure")
+        self.reads += 1
+        return self.text
+
+    def write(self, text):
+        if self.fail:
+            raise ClipboardError("Fake clipboard failure")
+        self.writes += 1
+        self.text = text
+
+
+# Tries each backend in turn and sticks with the first one that works.
+class FallbackClipboard:
+    def __init__(self, backends):
+        self.backends = list(backends)
+        self.active = self.backends[0] if self.backends else None
+
+    @property
+    def name(self):
+        return self.active.name if self.active is not None else "none"
+
+    def _run(self, action):
+        errors = []
+        start = self.backends.index(self.active) if self.active in self.backends else 0
+        for backend in self.backends[start:] + self.backends[:start]:
+            try:
+                result = action(backend)
+            except ClipboardError as e:
+                errors.append(f"{backend.name}: {e}")
+                continue
+            self.active = backend
+            return result
+        raise ClipboardError("; ".join(errors) or "No clipboard backend")
+
+    def read(self):
+        return self._run(lambda backend: backend.read())
+
+    def write(self, text):
+        return self._run(lambda backend: backend.write(text))
+
+
+# The configured backends, falling back in order. `host` is the
+# PopupHost whose Tk root the "tk" backend uses.
+def default_backend(host, names=CLIPBOARD_BACKENDS):
+    backends = []
+    for name in names:
+        if name == "tk" and host is not None:
+            backends.append(TkClipboard(host))
+        elif name == "pyperclip":
+            backends.append(PyperclipClipboard())
+        elif name == "fake":
+            backends.append(FakeClipboard())
+    return FallbackClipboard(backends)
+
+
+# Short digest of the clipboard text
+def content_hash(text):
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+# Reads through a backend and tells whether the text changed since the
+# last read, so an unchanged clipboard need not be processed again.
+class ClipboardWatcher:
+    def __init__(self, backend):
+        self.backend = backend
+        self._last_hash = None
+        self._lock = threading.Lock()
+
+    # (text, changed). Raises ClipboardError like the backend.
+    def read(self):
+        text = self.backend.read()
+        digest = content_hash(text or "")
+        with self._lock:
+            changed = digest != self._last_hash
+            self._last_hash = digest
+        return text, changed
+
+    def write(self, text):
+        self.backend.write(text)
+
+    # Treat the next read as changed, e.g. after the codes were edited
+    def forget(self, *args):
+        with self._lock:
+            self._last_hash = None
@@ -0,0 +1,204 @@
+import getpass
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+
+# ------- CONFIGURATION -------
+# Seconds a client waits for the running instance to answer
+CLIENT_TIMEOUT = 2.0
+
+# Largest request or response accepted, in bytes
+MAX_MESSAGE = 1024 * 1024
+# ---------------------------
+
+# Commands understood by the running decoder. "activate" is sent by a
+# second launch without arguments.
+COMMANDS = ("decode", "expand", "reload", "open-manager", "show-stats", "ping", "activate")
+
+
+# Per-user socket path, so different users each get their own instance
+def default_socket_path():
+    try:
+        user = getpass.getuser()
+    except Exception:
+        user = "user"
+    return os.path.join(tempfile.gettempdir(), f"bird-code-decode-{user}.sock")
+
+
+SOCKET_PATH = default_socket_path()
+
+
+# Another instance already owns the command socket
+class AlreadyRunning(Exception):
+    pass
+
+
+# Read one newline-terminated JSON message from a socket
+def _read_message(conn):
+    data = bytearray()
+    while not data.endswith(b"\n"):
+        chunk = conn.recv(4096)
+        if not chunk:
+            break
+        data += chunk
+        if len(data) > MAX_MESSAGE:
+            raise ValueError("Message too large")
+    if not data:
+        return None
+    return json.loads(data.decode("utf-8"))
+
+
+def _write_message(conn, message):
+    conn.sendall(json.dumps(message).encode("utf-8") + b"\n")
+
+
+# Send a command to the running instance. Returns its response dict, or
+# None if no instance is running (or this platform has no Unix sockets).
+def send_command(command, text=None, path=None, timeout=CLIENT_TIMEOUT):
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    path = path or SOCKET_PATH
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.settimeout(timeout)
+            conn.connect(path)
+            _write_message(conn, {"command": command, "text": text})
+            return _read_message(conn)
+    except (OSError, ValueError):
+        return None
+
+
+# Pass a launch's command line to the running instance, if any. Plain
+# launches send "activate"; "decode AMRO" and the other commands can be
+# given as arguments. Returns True if a running instance handled it.
+def forward_to_running_instance(argv):
+    if argv and argv[0] in COMMANDS:
+        command, text = argv[0], " ".join(argv[1:])
+    else:
+        command, text = "activate", None
+    response = send_command(command, text)
+    if response is None:
+        return False
+    print(response.get("result") or response.get("error", ""))
+    return True
+
+
+# True if nothing is listening on the socket file any more. Only a
+# refused connection (or a vanished file) counts as stale; a busy
+# instance that is slow to answer still owns the socket.
+def socket_is_stale(path, timeout=CLIENT_TIMEOUT):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.settimeout(timeout)
+        try:
+            conn.connect(path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            return True
+        except OSError:
+            return False
+    return False
+
+
+# Listens on the Unix socket for commands from later launches and from
+# the command-line client. Handlers are called with the request text and
+# return a short result string; they must not block for long.
+class CommandServer:
+    def __init__(self, handlers, path=None):
+        self.handlers = handlers
+        self.path = path or SOCKET_PATH
+        self._socket = None
+        self._thread = None
+
+    # Take ownership of the socket. Raises AlreadyRunning if another
+    # instance is listening on it; a stale socket file is replaced.
+    def start(self):
+        if not hasattr(socket, "AF_UNIX"):
+            return False
+        if os.path.exists(self.path):
+            if not socket_is_stale(self.path):
+                raise AlreadyRunning(self.path)
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            server.bind(self.path)
+        except OSError:
+            server.close()
+            # Lost a race with another instance starting at the same time
+            raise AlreadyRunning(self.path)
+        os.chmod(self.path, 0o600)
+        server.listen(8)
+        self._socket = server
+
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+    def _serve(self):
+        while self._socket is not None:
+            try:
+                conn, _ = self._socket.accept()
+            except OSError:
+                return
+            with conn:
+                conn.settimeout(CLIENT_TIMEOUT)
+                try:
+                    self._handle(conn)
+                except (OSError, ValueError):
+                    pass
+
+    def _handle(self, conn):
+        request = _read_message(conn)
+        if not isinstance(request, dict):
+            return
+        handler = self.handlers.get(request.get("command"))
+        if handler is None:
+            _write_message(conn, {"ok": False, "error": f"Unknown command: {request.get('command')}"})
+            return
+        try:
+            result = handler(request.get("text"))
+            _write_message(conn, {"ok": True, "result": result})
+        except Exception as e:
+            _write_message(conn, {"ok": False, "error": str(e)})
+
+
+# Command line client:
+#   python bird_code_daemon.py decode AMRO
+#   python bird_code_daemon.py expand [text]
+#   python bird_code_daemon.py reload | open-manager | show-stats | ping
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Send a command to the running Bird Code Decode")
+    parser.add_argument("command", choices=COMMANDS)
+    parser.add_argument("text", nargs="*", help="Text to decode or expand")
+    args = parser.parse_args(argv)
+
+    response = send_command(args.command, " ".join(args.text) or None)
+    if response is None:
+        print("Bird Code Decode is not running.", file=sys.stderr)
+        return 2
+    if not response.get("ok"):
+        print(response.get("error", "Command failed"), file=sys.stderr)
+        return 1
+    if response.get("result"):
+        print(response["result"])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+import csv
+import io
+import json
+import os
+import struct
+import sys
+
+# ------- CONFIGURATION -------
+# Number of entries buffered before a chunk is written out
+CHUNK_SIZE = 1000
+# ---------------------------
+
+# Compact binary form: a header, then one record per code made of the
+# 4 ASCII code bytes, the UTF-8 name length (uint16) and the name bytes.
+BINARY_MAGIC = b"BCDB\x01"
+BINARY_RECORD = struct.Struct("<4sH")
+
+# File extensions used to pick a format when none is given
+FORMAT_EXTENSIONS = {
+    ".csv": "csv",
+    ".tsv": "tsv",
+    ".txt": "tsv",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".bcd": "binary",
+}
+
+
+# Yield (code, name) pairs in code order, limited to a prefix and/or a
+# case-insensitive search over codes and names
+def filter_entries(code_data, prefix=None, search=None):
+    prefix = prefix.upper() if prefix else None
+    search = search.lower() if search else None
+    for code, name in sorted(code_data.items()):
+        if prefix and not code.startswith(prefix):
+            continue
+        if search and search not in code.lower() and search not in name.lower():
+            continue
+        yield code, name
+
+
+# Delimited text exporter shared by CSV and TSV
+def iter_delimited(entries, delimiter, header=True, chunk_size=CHUNK_SIZE):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=delimiter, lineterminator="\n")
+    if header:
+        writer.writerow(("code", "name"))
+    rows = 0
+    for code, name in entries:
+        writer.writerow((code, name))
+        rows += 1
+        if rows % chunk_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def iter_csv(entries, header=True, chunk_size=CHUNK_SIZE):
+    return iter_delimited(entries, ",", header, chunk_size)
+
+
+def iter_tsv(entries, header=True, chunk_size=CHUNK_SIZE):
+    return iter_delimited(entries, "\t", header, chunk_size)
+
+
+# One JSON object per line
+def iter_ndjson(entries, chunk_size=CHUNK_SIZE):
+    lines = []
+    for code, name in entries:
+        lines.append(json.dumps({"code": code, "name": name}, ensure_ascii=False))
+        if len(lines) >= chunk_size:
+            lines.append("")
+            yield "\n".join(lines)
+            lines = []
+    if lines:
+        lines.append("")
+        yield "\n".join(lines)
+
+
+# Compact binary records; codes that are not 4 ASCII letters are skipped
+def iter_binary(entries, chunk_size=CHUNK_SIZE):
+    chunk = bytearray(BINARY_MAGIC)
+    rows = 0
+    for code, name in entries:
+        code_bytes = code.encode("ascii", "ignore")
+        if len(code_bytes) != 4:
+            continue
+        name_bytes = name.encode("utf-8")
+        if len(name_bytes) > 0xFFFF:
+            # Cut on a character boundary so the record still decodes
+            name_bytes = name_bytes[:0xFFFF].decode("utf-8", "ignore").encode("utf-8")
+        chunk += BINARY_RECORD.pack(code_bytes, len(name_bytes))
+        chunk += name_bytes
+        rows += 1
+        if rows % chunk_size == 0:
+            yield bytes(chunk)
+            chunk.clear()
+    if chunk:
+        yield bytes(chunk)
+
+
+# Read the compact binary form back as (code, name) pairs
+def read_binary(stream):
+    if stream.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+        raise ValueError("Not a bird code binary file")
+    while True:
+        record = stream.read(BINARY_RECORD.size)
+        if not record:
+            return
+        if len(record) != BINARY_RECORD.size:
+            raise ValueError("Truncated bird code binary file")
+        code, length = BINARY_RECORD.unpack(record)
+        name = stream.read(length)
+        if len(name) != length:
+            raise ValueError("Truncated bird code binary file")
+        yield code.decode("ascii"), name.decode("utf-8")
+
+
+# Exporter generator and whether it produces bytes, by format name
+EXPORTERS = {
+    "csv": (iter_csv, False),
+    "tsv": (iter_tsv, False),
+    "ndjson": (iter_ndjson, False),
+    "binary": (iter_binary, True),
+}
+
+
+# Pick a format from a file name
+def format_for_path(path):
+    extension = os.path.splitext(path)[1].lower()
+    return FORMAT_EXTENSIONS.get(extension, "csv")
+
+
+# Write chunks from an exporter to an open stream and return the number
+# of entries written
+def write_export(stream, entries, fmt):
+    exporter, _ = EXPORTERS[fmt]
+    count = 0
+
+    def counted():
+        nonlocal count
+        for entry in entries:
+            count += 1
+            yield entry
+
+    for chunk in exporter(counted()):
+        stream.write(chunk)
+    return count
+
+
+# Export codes to a file, optionally filtered by prefix or search text
+def export_file(path, code_data, fmt=None, prefix=None, search=None):
+    fmt = fmt or format_for_path(path)
+    if fmt not in EXPORTERS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    entries = filter_entries(code_data, prefix, search)
+    if EXPORTERS[fmt][1]:
+        with open(path, "wb") as f:
+            return write_export(f, entries, fmt)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        return write_export(f, entries, fmt)
+
+
+# Command line entry point:
+#   python bird_code_exporter.py -f csv --prefix AM -o am_codes.csv
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export bird codes to other formats")
+    parser.add_argument("-i", "--input", default="bird codes.json", help="JSON code file")
+    parser.add_argument("-o", "--output", help="Output file (stdout if omitted)")
+    parser.add_argument("-f", "--format", choices=sorted(EXPORTERS),
+                        help="Output format (from the output extension if omitted)")
+    parser.add_argument("--prefix", help="Only export codes starting with this prefix")
+    parser.add_argument("--search", help="Only export codes or names containing this text")
+    args = parser.parse_args(argv)
+
+    with open(args.input, "r") as f:
+        code_data = json.load(f)
+
+    if args.output:
+        count = export_file(args.output, code_data, args.format, args.prefix, args.search)
+    else:
+        fmt = args.format or "csv"
+        entries = filter_entries(code_data, args.prefix, args.search)
+        stream = sys.stdout.buffer if EXPORTERS[fmt][1] else sys.stdout
+        count = write_export(stream, entries, fmt)
+    print(f"Exported {count} codes", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+import json
+import sys
+from collections import Counter, namedtuple
+
+from bird_code_lint import candidate_codes, duplicate_key
+from bird_code_store import ALPHABET
+
+# Result statuses
+ASSIGNED = "assigned"
+RESOLVED = "resolved"
+CONFLICT = "conflict"
+EXISTS = "exists"
+NO_CODE = "no code"
+
+# One generated code. note explains collisions and how they were resolved.
+GeneratedCode = namedtuple("GeneratedCode", "name code status note")
+
+
+# Free codes sharing the leading letters of a code, used when every rule
+# candidate is taken: first the same three letters, then the same two
+def fallback_codes(code):
+    for keep in (3, 2):
+        prefix = code[:keep]
+        for suffix in _suffixes(4 - keep):
+            yield prefix + suffix
+
+
+def _suffixes(length):
+    if length == 0:
+        yield ""
+        return
+    for letter in ALPHABET:
+        for rest in _suffixes(length - 1):
+            yield letter + rest
+
+
+# Generate codes for a batch of species names.
+#
+# Each name's standard code is used when no existing code and no other new
+# name wants it. When two new names share a standard code neither keeps it,
+# and a name whose standard code is already taken never displaces the
+# existing entry. With auto_resolve, colliding names get the first free
+# tie-break alternate; otherwise they are reported as conflicts.
+def generate_codes(names, existing=None, auto_resolve=True):
+    existing = existing if existing is not None else {}
+
+    # Hash indexes over the existing codes and names
+    taken = set(existing)
+    existing_by_name = {}
+    for code, name in existing.items():
+        existing_by_name.setdefault(duplicate_key(name), code)
+
+    # Drop blank and repeated names, keeping the first spelling
+    unique_names = []
+    seen = set()
+    for name in names:
+        name = " ".join(name.split())
+        key = duplicate_key(name)
+        if key and key not in seen:
+            seen.add(key)
+            unique_names.append(name)
+
+    candidates = {name: candidate_codes(name) for name in unique_names}
+    primary_counts = Counter(c[0] for c in candidates.values() if c)
+    wanted = set(primary_counts)
+
+    results = {}
+    conflicts = []
+
+    # First pass: names whose standard code nobody else wants
+    for name in unique_names:
+        key = duplicate_key(name)
+        if key in existing_by_name:
+            results[name] = GeneratedCode(name, existing_by_name[key], EXISTS,
+                                          "Already in the list")
+            continue
+        name_candidates = candidates[name]
+        if not name_candidates:
+            results[name] = GeneratedCode(name, "", NO_CODE, "Name has no letters")
+            continue
+        primary = name_candidates[0]
+        if primary in taken:
+            conflicts.append((name, f"{primary} is taken by '{existing[primary]}'"))
+        elif primary_counts[primary] > 1:
+            conflicts.append((name, f"{primary} is shared by {primary_counts[primary]} new names"))
+        else:
+            taken.add(primary)
+            results[name] = GeneratedCode(name, primary, ASSIGNED, "")
+
+    # Second pass: resolve collisions with the tie-break alternates, never
+    # taking a code that is another new name's standard code
+    for name, reason in conflicts:
+        primary = candidates[name][0]
+        if not auto_resolve:
+            results[name] = GeneratedCode(name, primary, CONFLICT, reason)
+            continue
+        code = next((c for c in candidates[name][1:] if c not in taken and c not in wanted), None)
+        if code is None:
+            code = next((c for c in fallback_codes(primary) if c not in taken and c not in wanted),
+                        None)
+        if code is None:
+            results[name] = GeneratedCode(name, primary, CONFLICT, reason + "; no free code")
+            continue
+        taken.add(code)
+        results[name] = GeneratedCode(name, code, RESOLVED, reason)
+
+    return [results[name] for name in unique_names]
+
+
+# Command line entry point:
+#   python bird_code_generator.py checklist.txt --existing "bird codes.json"
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate 4-letter codes for species names")
+    parser.add_argument("names", help="Text file with one species name per line, or - for stdin")
+    parser.add_argument("--existing", help="JSON code file whose codes must not be reused")
+    parser.add_argument("--no-resolve", action="store_true",
+                        help="Report collisions instead of picking alternate codes")
+    parser.add_argument("-o", "--output", help="Write the new codes as JSON to this file")
+    args = parser.parse_args(argv)
+
+    if args.names == "-":
+        names = sys.stdin.read().splitlines()
+    else:
+        with open(args.names, "r", encoding="utf-8") as f:
+            names = f.read().splitlines()
+
+    existing = {}
+    if args.existing:
+        with open(args.existing, "r") as f:
+            existing = json.load(f)
+
+    results = generate_codes(names, existing, auto_resolve=not args.no_resolve)
+    for result in results:
+        print(f"{result.code}\t{result.name}\t{result.status}\t{result.note}")
+
+    if args.output:
+        new_codes = {r.code: r.name for r in results if r.status in (ASSIGNED, RESOLVED)}
+        with open(args.output, "w") as f:
+            json.dump(new_codes, f, indent=4, sort_keys=True)
+
+    conflicts = sum(1 for r in results if r.status in (CONFLICT, NO_CODE))
+    print(f"{len(results)} names, {conflicts} unresolved", file=sys.stderr)
+    return 1 if conflicts else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
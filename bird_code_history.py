@@ -0,0 +1,276 @@
+# Past meanings of codes, for decoding old records.
+#
+# "code history.json" lists the revisions of codes that were split, lumped
+# or renamed. Each revision covers the years from "from" (or forever, if
+# missing) up to but not including "to":
+#
+#   {
+#       "MYWA": [{"to": 1973, "name": "Myrtle Warbler"}],
+#       "YRWA": [{"from": 1973, "to": 2003, "name": "Yellow-rumped Warbler (incl. Audubon's)"}]
+#   }
+#
+# From the end of the last revision on, a code means what "bird codes.json"
+# says. A code with no revisions always means its current name.
+import json
+import numbers
+import os
+import re
+import sys
+import threading
+from bisect import bisect_right
+from collections import namedtuple
+
+# ------- CONFIGURATION -------
+# File holding the dated revisions
+HISTORY_FILE = "code history.json"
+# ---------------------------
+
+# Start year used for revisions with no "from"
+EARLIEST = -10 ** 6
+
+# Years a revision covers, start inclusive and end exclusive. A name of
+# None means the code was not in use.
+Revision = namedtuple("Revision", "start end name")
+
+# "AMRO 1998", "AMRO@1998" or "AMRO in 1998"
+AS_OF_PATTERN = re.compile(r"^\s*([A-Za-z]{4})\s*(?:@|\s|\bin\b)\s*(\d{4})\s*$", re.IGNORECASE)
+
+
+# Year of a record date such as 1998, "1998-06-14", "14/06/1998" or a
+# date object (datetime.date, pandas Timestamp)
+def record_year(value):
+    if isinstance(value, numbers.Integral):
+        return int(value)
+    year = getattr(value, "year", None)
+    if isinstance(year, numbers.Integral):
+        return int(year)
+    match = re.search(r"\d{4}", str(value or ""))
+    return int(match.group()) if match else None
+
+
+# Split "AMRO 1998" style text into (code, year), or None
+def parse_as_of(text):
+    match = AS_OF_PATTERN.match(text)
+    if match is None:
+        return None
+    return match.group(1).upper(), int(match.group(2))
+
+
+# Interval index over the revisions of each code. Revisions are kept
+# sorted by start year with a parallel list of start years, so finding the
+# revision covering a year is one bisect. Subscribers are called with no
+# arguments whenever the revisions change, and `version` goes up.
+class CodeHistory:
+    def __init__(self, path=HISTORY_FILE):
+        self.path = path
+        self.version = 0
+        # code -> (start years, revisions). Each pair is replaced as a
+        # whole, so lock-free readers never see one list without the other.
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._subscribers = []
+
+    def subscribe(self, callback):
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+
+    def _notify(self):
+        with self._lock:
+            self.version += 1
+        for callback in list(self._subscribers):
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error in code history subscriber: {e}")
+
+    @classmethod
+    def from_dict(cls, data, path=HISTORY_FILE):
+        history = cls(path)
+        for code, revisions in data.items():
+            for revision in revisions:
+                history.add_revision(code, revision.get("from"), revision["to"], revision.get("name"))
+        return history
+
+    # Read the history file; a missing file means no history
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = {}
+        fresh = CodeHistory.from_dict(data, self.path)
+        with self._lock:
+            self._entries = fresh._entries
+        self._notify()
+        return True
+
+    def save(self):
+        data = {
+            code: [self._revision_dict(revision) for revision in revisions]
+            for code, (_, revisions) in sorted(self._entries.items())
+        }
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+        return True
+
+    @staticmethod
+    def _revision_dict(revision):
+        entry = {}
+        if revision.start != EARLIEST:
+            entry["from"] = revision.start
+        entry["to"] = revision.end
+        entry["name"] = revision.name
+        return entry
+
+    # Add a revision; start may be None for "since forever". Raises
+    # ValueError if it overlaps a revision the code already has.
+    def add_revision(self, code, start, end, name):
+        code = code.upper()
+        start = EARLIEST if start is None else int(start)
+        end = int(end)
+        if end <= start:
+            raise ValueError(f"{code}: revision must end after it starts")
+        with self._lock:
+            revisions = list(self.revisions(code))
+            for other in revisions:
+                if start < other.end and other.start < end:
+                    raise ValueError(f"{code}: revision overlaps {self._describe(other)}")
+            revisions.append(Revision(start, end, name))
+            revisions.sort()
+            self._entries[code] = ([revision.start for revision in revisions], revisions)
+        self._notify()
+
+    def remove_revisions(self, code):
+        with self._lock:
+            _, removed = self._entries.pop(code, ((), []))
+        if removed:
+            self._notify()
+        return removed
+
+    def revisions(self, code):
+        entry = self._entries.get(code)
+        return entry[1] if entry is not None else []
+
+    def __contains__(self, code):
+        return code in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    # Codes that have any revisions
+    def codes(self):
+        return list(self._entries)
+
+    # What a code meant in a year. `current` is its name today, which
+    # applies after the last revision. Returns None if the code was not
+    # in use that year.
+    def name_as_of(self, code, year, current=None):
+        entry = self._entries.get(code)
+        if entry is None or year is None:
+            return current
+        starts, revisions = entry
+        i = bisect_right(starts, year) - 1
+        if i >= 0 and year < revisions[i].end:
+            return revisions[i].name
+        if year >= revisions[-1].end:
+            return current
+        return None
+
+    @staticmethod
+    def _describe(revision):
+        start = "" if revision.start == EARLIEST else revision.start
+        return f"{start}-{revision.end} {revision.name or '(not in use)'}"
+
+    # Short text listing a code's revisions, for popups and the manager
+    def summary(self, code):
+        return "\n".join(self._describe(revision) for revision in self.revisions(code))
+
+
+# The history shared by everything in this process
+_history = None
+_history_lock = threading.Lock()
+
+
+def get_history():
+    global _history
+    with _history_lock:
+        if _history is None:
+            _history = CodeHistory()
+            try:
+                _history.load()
+            except Exception as e:
+                print(f"Error loading code history: {e}")
+        return _history
+
+
+# Command line entry point:
+#   python bird_code_history.py lookup MYWA 1970
+#   python bird_code_history.py add MYWA --to 1973 --name "Myrtle Warbler"
+#   python bird_code_history.py decode records.csv --code-column species --date-column date -o out.csv
+def main(argv=None):
+    import argparse
+    import csv
+
+    parser = argparse.ArgumentParser(description="Look up codes as of a year")
+    parser.add_argument("--codes", default="bird codes.json", help="JSON code file")
+    parser.add_argument("--history", default=HISTORY_FILE, help="JSON history file")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    lookup_parser = subparsers.add_parser("lookup", help="What a code meant in a year")
+    lookup_parser.add_argument("code")
+    lookup_parser.add_argument("year", type=int)
+    add_parser = subparsers.add_parser("add", help="Add a revision to a code")
+    add_parser.add_argument("code")
+    add_parser.add_argument("--from", dest="start", type=int, help="First year (default: always)")
+    add_parser.add_argument("--to", dest="end", type=int, required=True, help="Year it stopped applying")
+    add_parser.add_argument("--name", help="Name in those years (omit if not in use)")
+    decode_parser = subparsers.add_parser("decode", help="Add names to a CSV of dated records")
+    decode_parser.add_argument("input")
+    decode_parser.add_argument("--code-column", default="code")
+    decode_parser.add_argument("--date-column", default="date")
+    decode_parser.add_argument("--name-column", default="name")
+    decode_parser.add_argument("-o", "--output", default="-")
+    args = parser.parse_args(argv)
+
+    history = CodeHistory(args.history)
+    history.load()
+    with open(args.codes, "r") as f:
+        current = json.load(f)
+
+    if args.command == "lookup":
+        code = args.code.upper()
+        name = history.name_as_of(code, args.year, current.get(code))
+        print(name if name is not None else f"{code} was not in use in {args.year}")
+        return 0 if name is not None else 1
+
+    if args.command == "add":
+        history.add_revision(args.code, args.start, args.end, args.name)
+        history.save()
+        print(history.summary(args.code.upper()))
+        return 0
+
+    with open(args.input, "r", newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        fieldnames = list(reader.fieldnames or [])
+        if args.name_column not in fieldnames:
+            fieldnames.append(args.name_column)
+        output = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+        try:
+            writer = csv.DictWriter(output, fieldnames=fieldnames)
+            writer.writeheader()
+            for row in reader:
+                code = (row.get(args.code_column) or "").strip().upper()
+                name = history.name_as_of(code, record_year(row.get(args.date_column)),
+                                          current.get(code))
+                row[args.name_column] = name or ""
+                writer.writerow(row)
+        finally:
+            if output is not sys.stdout:
+                output.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
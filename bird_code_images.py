@@ -0,0 +1,318 @@
+# Species thumbnails for the decode popup.
+#
+# Photos go in the "images" folder, named after the code or the species
+# ("AMRO.jpg" or "American Robin.jpg"). They are scaled down to popup size
+# once, when imported, and kept as PNG files in "images/thumbnails":
+#
+#   python bird_code_images.py import ~/Pictures/birds
+#
+# Photos added to "images" by hand, or changed since their thumbnail was
+# made, are scaled the next time their code is decoded. Images are read
+# and scaled on a background thread; a popup whose image is not ready yet
+# appears without it and gains it when it arrives. The popup keeps the Tk
+# images it has made in a small LRU cache, and codes likely to be decoded
+# next are loaded ahead in the background.
+import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    from PIL import Image, ImageTk
+except ImportError:
+    Image = ImageTk = None
+
+# ------- CONFIGURATION -------
+# Original photos, named by code or species name
+IMAGE_DIR = "images"
+
+# Pre-scaled thumbnails, named by code
+THUMB_DIR = os.path.join(IMAGE_DIR, "thumbnails")
+
+# Largest thumbnail size in pixels; aspect ratio is kept
+THUMB_SIZE = (120, 120)
+
+# Memory for decoded popup images, in bytes
+IMAGE_CACHE_BYTES = 8 * 1024 * 1024
+
+# Codes loaded ahead at startup
+PREFETCH_LIMIT = 50
+
+# Seconds before a code with no image is looked for again, in case a
+# photo was added for it
+MISSING_RECHECK = 5.0
+# ---------------------------
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp")
+
+CODE_PATTERN = re.compile(r"^[A-Z]{4}$")
+
+
+def thumbnail_path(code, thumb_dir=THUMB_DIR):
+    return os.path.join(thumb_dir, f"{code}.png")
+
+
+# Code a photo file is for, from its name ("AMRO.jpg", "American
+# Robin.jpg"), or None. `name_codes` maps lower-cased names to codes.
+def image_code(filename, name_codes):
+    stem, extension = os.path.splitext(os.path.basename(filename))
+    if extension.lower() not in IMAGE_EXTENSIONS:
+        return None
+    if CODE_PATTERN.match(stem.upper()) and stem.isupper():
+        return stem
+    return name_codes.get(" ".join(stem.replace("_", " ").split()).lower())
+
+
+# Lower-cased species name -> code, for photos named after the species
+def name_index(code_data):
+    return {name.lower(): code for code, name in code_data.items()}
+
+
+# Scale a photo down to thumbnail size and save it as PNG
+def make_thumbnail(source, dest, size=THUMB_SIZE):
+    if Image is None:
+        raise RuntimeError("Thumbnails need Pillow (pip install pillow)")
+    with Image.open(source) as image:
+        image = image.convert("RGBA") if image.mode in ("RGBA", "LA", "P") else image.convert("RGB")
+        image.thumbnail(size, Image.LANCZOS)
+        os.makedirs(os.path.dirname(dest) or ".", exist_ok=True)
+        temp_path = dest + ".tmp"
+        image.save(temp_path, "PNG")
+    os.replace(temp_path, dest)
+
+
+# Make thumbnails for every photo in a folder. Returns (made, skipped),
+# skipped being the files whose name matches no code.
+def import_images(source_dir, code_data, thumb_dir=THUMB_DIR, size=THUMB_SIZE, progress=None):
+    name_codes = name_index(code_data)
+    made = 0
+    skipped = []
+    for filename in sorted(os.listdir(source_dir)):
+        code = image_code(filename, name_codes)
+        if code is None or code not in code_data:
+            skipped.append(filename)
+            continue
+        make_thumbnail(os.path.join(source_dir, filename), thumbnail_path(code, thumb_dir), size)
+        made += 1
+        if progress is not None:
+            progress(code)
+    return made, skipped
+
+
+# Thumbnails for popups, decoded into Tk images on the popup thread.
+# photo() must be called on the PopupHost's thread and never touches the
+# disk: on a miss it starts a background load and returns None. Files are
+# read, and scaled if needed, on background threads that hand the results
+# to the popup thread through host.call(). Tk images are kept in an LRU
+# cache bounded by their pixel memory.
+class ImageCards:
+    def __init__(self, host, code_data, image_dir=IMAGE_DIR, thumb_dir=THUMB_DIR,
+                 size=THUMB_SIZE, max_bytes=IMAGE_CACHE_BYTES):
+        self.host = host
+        self.code_data = code_data
+        self.image_dir = image_dir
+        self.thumb_dir = thumb_dir
+        self.size = size
+        self.max_bytes = max_bytes
+        self._photos = OrderedDict()
+        self._bytes = 0
+        self._missing = set()
+        self._loading = set()
+        self._sources = None
+        self._folder_times = None
+        self._next_check = 0.0
+        self._generation = 0
+        self._photos_generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def available(self):
+        return ImageTk is not None and (os.path.isdir(self.thumb_dir) or os.path.isdir(self.image_dir))
+
+    # Forget which codes had no image and drop the Tk images already
+    # made, e.g. after importing or editing photos
+    def refresh(self):
+        self._forget_missing()
+        with self._lock:
+            self._generation += 1
+
+    def _forget_missing(self):
+        with self._lock:
+            self._missing.clear()
+            self._sources = None
+
+    # Photos added by hand are noticed without a refresh: when either
+    # folder changes, codes that had no image are looked for again
+    def _check_folders(self):
+        self._next_check = time.monotonic() + MISSING_RECHECK
+        times = []
+        for folder in (self.image_dir, self.thumb_dir):
+            try:
+                times.append(os.stat(folder).st_mtime_ns)
+            except OSError:
+                times.append(None)
+        with self._lock:
+            previous, self._folder_times = self._folder_times, times
+        if previous is not None and previous != times:
+            self._forget_missing()
+
+    # Original photo for a code in the image folder, or None
+    def _source(self, code):
+        with self._lock:
+            if self._sources is None:
+                name_codes = name_index(self.code_data)
+                self._sources = {}
+                try:
+                    filenames = os.listdir(self.image_dir)
+                except OSError:
+                    filenames = []
+                for filename in filenames:
+                    found = image_code(filename, name_codes)
+                    if found is not None:
+                        self._sources[found] = os.path.join(self.image_dir, filename)
+            return self._sources.get(code)
+
+    # Decoded thumbnail for a code, made from its photo if there is none
+    # or the photo is newer, or None. Reads the disk; not for the popup
+    # thread.
+    def load(self, code):
+        self._check_folders()
+        with self._lock:
+            if code in self._missing:
+                return None
+        path = thumbnail_path(code, self.thumb_dir)
+        try:
+            source = self._source(code)
+            if source is not None and (not os.path.exists(path) or
+                                       os.path.getmtime(source) > os.path.getmtime(path)):
+                make_thumbnail(source, path, self.size)
+            elif not os.path.exists(path):
+                with self._lock:
+                    self._missing.add(code)
+                return None
+            with Image.open(path) as image:
+                image.load()
+                return image.copy()
+        except Exception as e:
+            print(f"Error loading image for {code}: {e}")
+            with self._lock:
+                self._missing.add(code)
+            return None
+
+    # Tk image for a code, or None. Runs on the popup thread. With no
+    # decoded `image` and nothing cached, the image is loaded in the
+    # background and on_ready(photo) is called on the popup thread once
+    # it is there.
+    def photo(self, code, root, image=None, on_ready=None):
+        if self._photos_generation != self._generation:
+            self._photos.clear()
+            self._bytes = 0
+            self._photos_generation = self._generation
+        photo = self._photos.get(code)
+        if photo is not None:
+            self._photos.move_to_end(code)
+            return photo
+        if ImageTk is None:
+            return None
+        if image is None:
+            self._load_later(code, on_ready)
+            return None
+        photo = ImageTk.PhotoImage(image, master=root)
+        self._remember(code, photo)
+        return photo
+
+    def _load_later(self, code, on_ready):
+        with self._lock:
+            if code in self._loading:
+                return
+            if code in self._missing and time.monotonic() < self._next_check:
+                return
+            self._loading.add(code)
+
+        def run():
+            try:
+                image = self.load(code)
+                if image is None:
+                    return
+                self.host.call(lambda root: self._deliver(code, root, image, on_ready))
+            except Exception:
+                pass
+            finally:
+                with self._lock:
+                    self._loading.discard(code)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def _deliver(self, code, root, image, on_ready):
+        photo = self.photo(code, root, image)
+        if on_ready is not None:
+            on_ready(photo)
+
+    def _remember(self, code, photo):
+        self._photos[code] = photo
+        self._bytes += photo.width() * photo.height() * 4
+        while self._bytes > self.max_bytes and len(self._photos) > 1:
+            _, oldest = self._photos.popitem(last=False)
+            self._bytes -= oldest.width() * oldest.height() * 4
+
+    def __contains__(self, code):
+        return code in self._photos
+
+    def __len__(self):
+        return len(self._photos)
+
+    @property
+    def nbytes(self):
+        return self._bytes
+
+    # Load images for codes in the background, most likely first
+    def prefetch(self, codes):
+        codes = [code for code in codes if code not in self._photos]
+        if not codes or not self.available:
+            return None
+
+        def run():
+            for code in codes:
+                image = self.load(code)
+                if image is None:
+                    continue
+                try:
+                    self.host.call(lambda root, code=code, image=image: self.photo(code, root, image))
+                except Exception:
+                    return
+                if self._bytes >= self.max_bytes:
+                    return
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        return thread
+
+
+# Command line entry point:
+#   python bird_code_images.py import ~/Pictures/birds [--size 120]
+def main(argv=None):
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Make popup thumbnails from species photos")
+    parser.add_argument("--codes", default="bird codes.json", help="JSON code file")
+    parser.add_argument("--thumbnails", default=THUMB_DIR, help="Thumbnail folder")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    import_parser = subparsers.add_parser("import", help="Scale a folder of photos to thumbnails")
+    import_parser.add_argument("folder", nargs="?", default=IMAGE_DIR)
+    import_parser.add_argument("--size", type=int, default=THUMB_SIZE[0], help="Largest side in pixels")
+    args = parser.parse_args(argv)
+
+    with open(args.codes, "r") as f:
+        code_data = json.load(f)
+    made, skipped = import_images(args.folder, code_data, args.thumbnails, (args.size, args.size))
+    for filename in skipped:
+        print(f"Skipped {filename}: no matching code", file=sys.stderr)
+    print(f"Made {made} thumbnails in {args.thumbnails}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+import csv
+import itertools
+import json
+import re
+import sys
+
+# ------- CONFIGURATION -------
+# Report progress after this many imported rows
+PROGRESS_INTERVAL = 1000
+
+# Marker used in official lists for extinct or extirpated species
+DAGGER = "†"
+# ---------------------------
+
+# A banding code is four upper-case letters
+CODE_PATTERN = re.compile(r"^[A-Z]{4}$")
+
+# Header cells we recognise in CSV/TSV lists
+CODE_HEADERS = ("code", "alpha", "alpha code", "4-letter code", "spec", "b4")
+NAME_HEADERS = ("name", "common name", "commonname", "english name", "description")
+
+
+# Remove dagger markers and extra spaces from a name
+def clean_name(name):
+    return " ".join(name.replace(DAGGER, " ").split())
+
+
+# Check whether a single token looks like a banding code
+def is_code_token(token):
+    return DAGGER not in token and CODE_PATTERN.match(token) is not None
+
+
+# Guess the format from the first non-empty line
+def detect_format(line):
+    if "\t" in line:
+        return "tsv"
+    if "," in line:
+        first_cell = line.split(",", 1)[0].strip().strip('"')
+        if is_code_token(first_cell.upper()) or first_cell.lower() in CODE_HEADERS:
+            return "csv"
+    return "table"
+
+
+# Tokenize the "CODE Name CODE Name" table format in a single pass.
+# Lines are read one at a time, so only the entry currently being
+# built is held in memory.
+def iter_table_entries(lines):
+    code = None
+    name_parts = []
+    for line in lines:
+        for token in line.split():
+            if is_code_token(token):
+                if code is not None:
+                    yield code, clean_name(" ".join(name_parts))
+                code = token
+                name_parts = []
+            elif code is not None:
+                name_parts.append(token)
+    if code is not None:
+        yield code, clean_name(" ".join(name_parts))
+
+
+# Read CSV/TSV rows, using a header row to pick columns when present
+def iter_delimited_entries(lines, delimiter):
+    reader = csv.reader(lines, delimiter=delimiter)
+    code_col, name_col = 0, 1
+    first_row = True
+    for row in reader:
+        cells = [cell.strip() for cell in row]
+        if not any(cells):
+            continue
+        headers = [cell.lower() for cell in cells]
+        if first_row and any(h in CODE_HEADERS for h in headers):
+            first_row = False
+            # Header row - remember which columns hold the code and name
+            code_col = next(i for i, h in enumerate(headers) if h in CODE_HEADERS)
+            name_col = next((i for i, h in enumerate(headers) if h in NAME_HEADERS),
+                            1 if code_col != 1 else 0)
+            continue
+        first_row = False
+        if len(cells) <= max(code_col, name_col):
+            continue
+        code = cells[code_col].replace(DAGGER, "").strip().upper()
+        if not CODE_PATTERN.match(code):
+            continue
+        yield code, clean_name(cells[name_col])
+
+
+# Yield (code, name) pairs from an open text stream.
+# fmt may be "table", "csv", "tsv" or None to detect it from the input.
+def iter_entries(stream, fmt=None):
+    lines = iter(stream)
+    if fmt is None:
+        # Peek at the first non-empty line, then put it back in front
+        skipped = []
+        first = None
+        for line in lines:
+            if line.strip():
+                first = line
+                break
+            skipped.append(line)
+        if first is None:
+            return
+        fmt = detect_format(first)
+        lines = itertools.chain(skipped, [first], lines)
+
+    if fmt == "table":
+        yield from iter_table_entries(lines)
+    elif fmt == "csv":
+        yield from iter_delimited_entries(lines, ",")
+    elif fmt == "tsv":
+        yield from iter_delimited_entries(lines, "\t")
+    else:
+        raise ValueError(f"Unknown import format: {fmt}")
+
+
+# Import every entry from a stream into a dict.
+# progress is called with the number of rows read so far.
+def import_stream(stream, fmt=None, progress=None):
+    result = {}
+    count = 0
+    for code, name in iter_entries(stream, fmt):
+        result[code] = name
+        count += 1
+        if progress and count % PROGRESS_INTERVAL == 0:
+            progress(count)
+    if progress:
+        progress(count)
+    return result
+
+
+# Import a file from disk (or stdin when path is "-")
+def import_file(path, fmt=None, progress=None):
+    if path == "-":
+        return import_stream(sys.stdin, fmt, progress)
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        return import_stream(f, fmt, progress)
+
+
+# Command line entry point:
+#   python bird_code_importer.py official_list.txt -o "bird codes.json"
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert a bird code list to JSON")
+    parser.add_argument("input", nargs="?", default="-",
+                        help="File to import, or - for stdin")
+    parser.add_argument("-o", "--output", help="Write JSON here instead of stdout")
+    parser.add_argument("-f", "--format", choices=("table", "csv", "tsv"),
+                        help="Input format (detected automatically if omitted)")
+    parser.add_argument("--indent", type=int, default=4, help="JSON indent")
+    args = parser.parse_args(argv)
+
+    def report(count):
+        print(f"Imported {count} codes...", file=sys.stderr)
+
+    codes = import_file(args.input, args.format, report)
+    indent = args.indent or None
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(codes, f, indent=indent, sort_keys=True)
+    else:
+        json.dump(codes, sys.stdout, indent=indent, sort_keys=True)
+        sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+import json
+import re
+import sys
+from collections import namedtuple
+
+# Issue severities
+ERROR = "error"
+WARNING = "warning"
+INFO = "info"
+
+# Issue kinds
+INVALID_CODE = "invalid code"
+EMPTY_NAME = "empty name"
+DUPLICATE_NAME = "duplicate name"
+RULE_MISMATCH = "rule mismatch"
+
+# One problem found by the lint pass
+LintIssue = namedtuple("LintIssue", "severity kind code message")
+
+# A banding code is four upper-case letters
+CODE_PATTERN = re.compile(r"^[A-Z]{4}$")
+
+# Parenthesized qualifiers such as "(Yellow-shafted)" are not part of the name
+PARENTHESES = re.compile(r"\([^)]*\)")
+# Hyphens and spaces separate words; apostrophes and other marks are dropped
+NON_LETTERS = re.compile(r"[^A-Za-z\s\-]+")
+WORD_SPLIT = re.compile(r"[\s\-]+")
+
+
+# Split a common name into the words used by the banding-code rules
+def name_words(name):
+    if "(" in name:
+        name = PARENTHESES.sub(" ", name)
+    return [word for word in WORD_SPLIT.split(NON_LETTERS.sub("", name).upper()) if word]
+
+
+# Build a code from the leading letters of each word, e.g. (2, 2)
+def take_letters(words, counts):
+    return "".join(word[:count] for word, count in zip(words, counts))
+
+
+# Standard letter counts per word, by number of words
+PRIMARY_SPLITS = {
+    1: (4,),
+    2: (2, 2),
+    3: (1, 1, 2),
+    4: (1, 1, 1, 1),
+}
+
+# Tie-break letter counts tried after the standard ones
+ALTERNATE_SPLITS = {
+    1: (),
+    2: ((3, 1), (1, 3)),
+    3: ((1, 2, 1), (2, 1, 1)),
+    4: (),
+}
+
+
+# Reduce longer names to four words: the first three and the last
+def rule_words(words):
+    if len(words) > 4:
+        return words[:3] + words[-1:]
+    return words
+
+
+# Derive the standard 4-letter code from the words of a common name:
+#   one word      - first four letters            (Sora -> SORA)
+#   two words     - two letters of each           (American Robin -> AMRO)
+#   three words   - 1 + 1 + 2 letters             (Great Blue Heron -> GBHE)
+#   four words    - first letter of each          (Black-and-white Warbler -> BAWW)
+# Hyphenated parts count as separate words. Longer names use the first
+# letters of the first three words and of the last word.
+def code_from_words(words):
+    words = rule_words(words)
+    if not words:
+        return ""
+    return take_letters(words, PRIMARY_SPLITS[len(words)])
+
+
+def expected_code(name):
+    return code_from_words(name_words(name))
+
+
+# Every code the rules allow for a name, standard code first. Tie-breaks
+# shift letters between words, and may also treat a hyphenated word as one
+# word (Ring-necked Pheasant -> RIPH).
+def candidate_codes(name):
+    split_words = name_words(name)
+    joined_words = name_words(name.replace("-", ""))
+    candidates = []
+    for words in (split_words, joined_words):
+        words = rule_words(words)
+        if not words:
+            continue
+        splits = (PRIMARY_SPLITS[len(words)],) + ALTERNATE_SPLITS[len(words)]
+        for counts in splits:
+            code = take_letters(words, counts)
+            if len(code) == 4 and code not in candidates:
+                candidates.append(code)
+        if len(words) == 1:
+            # Single words keep their first three letters and try each later one
+            word = words[0]
+            for letter in word[4:]:
+                code = word[:3] + letter
+                if code not in candidates:
+                    candidates.append(code)
+    return candidates
+
+
+# Normalize a name for duplicate detection
+def duplicate_key(name):
+    return " ".join(name_words(name))
+
+
+# Lint every entry in a code mapping and return the issues found.
+# A code that differs from the standard one is accepted when it is one
+# of the tie-break alternates for its name.
+def run_lint(code_data, check_rules=True):
+    issues = []
+    codes_by_name = {}
+
+    for code, name in code_data.items():
+        if not CODE_PATTERN.match(code):
+            issues.append(LintIssue(ERROR, INVALID_CODE, code,
+                                    "Code must be 4 upper-case letters"))
+        if not name or not name.strip():
+            issues.append(LintIssue(ERROR, EMPTY_NAME, code, "Name is empty"))
+            continue
+
+        words = name_words(name)
+        if words:
+            codes_by_name.setdefault(" ".join(words), []).append(code)
+
+        if check_rules:
+            expected = code_from_words(words)
+            if len(expected) == 4 and expected != code and code not in candidate_codes(name):
+                issues.append(LintIssue(INFO, RULE_MISMATCH, code,
+                                        f"Rules give {expected} for '{name}'"))
+
+    for codes in codes_by_name.values():
+        if len(codes) > 1:
+            # Only the first six codes of a group are ever listed, so each
+            # member's message is built from that short head of the group
+            head = codes[:6]
+            more = len(codes) - 6
+            for code in codes:
+                listed = ", ".join([other for other in head if other != code][:5])
+                if more > 0:
+                    listed += f" and {more} more"
+                issues.append(LintIssue(WARNING, DUPLICATE_NAME, code,
+                                        f"Same name as {listed}"))
+
+    issues.sort(key=lambda issue: (issue.code, issue.kind))
+    return issues
+
+
+# Count issues that need attention (errors and warnings)
+def count_problems(issues):
+    return sum(1 for issue in issues if issue.severity != INFO)
+
+
+# Command line entry point:
+#   python bird_code_lint.py ["bird codes.json"] [--no-rules]
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Check a bird code file for problems")
+    parser.add_argument("input", nargs="?", default="bird codes.json", help="JSON code file")
+    parser.add_argument("--no-rules", action="store_true",
+                        help="Skip the banding-code rule check")
+    args = parser.parse_args(argv)
+
+    with open(args.input, "r") as f:
+        code_data = json.load(f)
+
+    issues = run_lint(code_data, check_rules=not args.no_rules)
+    for issue in issues:
+        print(f"{issue.code}\t{issue.severity}\t{issue.kind}\t{issue.message}")
+    print(f"{len(issues)} issues, {count_problems(issues)} errors or warnings",
+          file=sys.stderr)
+    return 1 if count_problems(issues) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+import json
+import os
+import threading
+
+from bird_code_store import CodeStore
+
+# ------- CONFIGURATION -------
+# Folder holding one name shard per locale, e.g. locales/fr.json
+LOCALES_DIR = "locales"
+
+# Names in the main code file are in this locale
+DEFAULT_LOCALE = "en"
+
+# Settings file shared with the decoder
+CONFIG_FILE = "app_config.json"
+# ---------------------------
+
+
+# Path of the shard file for a locale
+def shard_path(locale, directory=LOCALES_DIR):
+    return os.path.join(directory, f"{locale}.json")
+
+
+# Locales that can be selected: the default plus every shard on disk
+def available_locales(directory=LOCALES_DIR):
+    locales = [DEFAULT_LOCALE]
+    try:
+        for filename in sorted(os.listdir(directory)):
+            locale, extension = os.path.splitext(filename)
+            if extension == ".json" and locale != DEFAULT_LOCALE:
+                locales.append(locale)
+    except FileNotFoundError:
+        pass
+    return locales
+
+
+# Loads locale shards on first use and drops them again once no view is
+# using them, so memory follows the locales actually in use.
+class ShardCache:
+    def __init__(self, directory=LOCALES_DIR):
+        self.directory = directory
+        self._shards = {}
+        self._users = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, locale):
+        with self._lock:
+            if locale not in self._shards:
+                with open(shard_path(locale, self.directory), "r", encoding="utf-8") as f:
+                    self._shards[locale] = CodeStore.from_dict(json.load(f))
+            self._users[locale] = self._users.get(locale, 0) + 1
+            return self._shards[locale]
+
+    def release(self, locale):
+        with self._lock:
+            users = self._users.get(locale, 0) - 1
+            if users > 0:
+                self._users[locale] = users
+            else:
+                self._users.pop(locale, None)
+                self._shards.pop(locale, None)
+
+    # Locales currently held in memory
+    def loaded(self):
+        with self._lock:
+            return sorted(self._shards)
+
+
+# Shards shared by every view in this process
+shard_cache = ShardCache()
+
+
+# Names for one view (the popup or the manager) in its chosen locale.
+# Codes always come from the repository; switching locale only swaps the
+# name shard, and codes missing from it fall back to the default names.
+class LocaleNames:
+    def __init__(self, repository, locale=DEFAULT_LOCALE, cache=None):
+        self.repository = repository
+        self.cache = cache if cache is not None else shard_cache
+        self.locale = DEFAULT_LOCALE
+        self._shard = None
+        self.set_locale(locale)
+
+    # Switch locale; returns False (keeping the current one) if the shard
+    # cannot be loaded
+    def set_locale(self, locale):
+        if locale == self.locale:
+            return True
+        shard = None
+        if locale != DEFAULT_LOCALE:
+            try:
+                shard = self.cache.acquire(locale)
+            except (OSError, ValueError) as e:
+                print(f"Error loading {locale} names: {e}")
+                return False
+        if self.locale != DEFAULT_LOCALE:
+            self.cache.release(self.locale)
+        self.locale = locale
+        self._shard = shard
+        return True
+
+    # Name of a code in the active locale, or default if it is unknown
+    def name(self, code, default=None):
+        shard = self._shard
+        if shard is not None:
+            name = shard.get(code)
+            if name:
+                return name
+        return self.repository.get(code, default)
+
+    # Name from the shard only, or "" when the locale has none
+    def localized_name(self, code):
+        shard = self._shard
+        if shard is None:
+            return ""
+        return shard.get(code, "")
+
+    def close(self):
+        self.set_locale(DEFAULT_LOCALE)
+
+
+# Read the saved locale from the settings file
+def load_locale_setting():
+    try:
+        with open(CONFIG_FILE, "r") as f:
+            return json.load(f).get("locale", DEFAULT_LOCALE)
+    except Exception:
+        return DEFAULT_LOCALE
+
+
+# Save the locale to the settings file, keeping the other settings
+def save_locale_setting(locale):
+    try:
+        config = {}
+        if os.path.exists(CONFIG_FILE):
+            with open(CONFIG_FILE, "r") as f:
+                config = json.load(f)
+        config["locale"] = locale
+        with open(CONFIG_FILE, "w") as f:
+            json.dump(config, f, indent=4)
+    except Exception as e:
+        print(f"Error saving config: {e}")
@@ -1,22 +1,75 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
-import json
+from tkinter import ttk, messagebox, simpledialog, filedialog
+import os
 import re
+import threading
+import bird_code_batch
+import bird_code_exporter
+import bird_code_generator
+import bird_code_importer
+import bird_code_lint
+import bird_code_merge
+import bird_code_sync
+from bird_code_bitmap import CodeBitmap
+from bird_code_history import get_history
+from bird_code_locales import DEFAULT_LOCALE, LocaleNames, available_locales, load_locale_setting
+from bird_code_profiling import profiled, start_profile
+from bird_code_repository import get_repository
+from bird_code_search import QueryError, SearchIndex
+from bird_code_store import CodeStore, OverlayMap
+
+# ------- CONFIGURATION -------
+# Rows added to the list per step, so the window keeps responding while
+# a long list fills in
+POPULATE_CHUNK = 500
+# ---------------------------
 
 class BirdCodeManager:
-    def __init__(self, master=None, callback=None):
+    def __init__(self, master=None, callback=None, repository=None):
+        # Profile window setup (not the mainloop) when enabled
+        setup_profile = start_profile("manager")
+
         # Create a new top-level window
         self.window = tk.Toplevel(master) if master else tk.Tk()
         self.window.title("Bird Code Manager")
         self.window.geometry("800x500")
         self.window.minsize(600, 400)
         
-        # Store callback for when window is closed (to refresh main program's data)
+        # Store callback for when window is closed
         self.callback = callback
         
-        # Load the code data
-        self.original_data = self.load_codes()
-        self.code_data = self.original_data.copy()
+        # Edit the shared repository. Unsaved edits are kept in an overlay
+        # on top of its current snapshot, so the data is never copied.
+        # The codes, locale names, code bitmap and search index are loaded
+        # on a worker (see start_loading); until then they are empty and
+        # the controls that need them are disabled.
+        self.repository = repository
+        self.original_data = OverlayMap(CodeStore.from_dict({}))
+        self.code_data = OverlayMap(self.original_data)
+        # Issues from the last lint run and the data they were found in
+        self.lint_data = None
+        self.lint_issues = []
+        self.names = None
+        self.code_bitmap = CodeBitmap()
+        self.search_index = SearchIndex()
+        self.ready = False
+        self.closed = False
+        # What the loading worker produced and has not been installed yet;
+        # the lock decides whether the worker or on_close cleans it up
+        self.loading_outcome = None
+        self.loading_lock = threading.Lock()
+
+        # Dated revisions, for showing names as of a past year
+        self.history = get_history()
+
+        # Codes matching the search, and how many are in the list so far
+        self.listed_codes = []
+        self.listed_count = 0
+        self.listed_filter = None
+        self.populate_job = None
+
+        # Widgets enabled once the data is ready, with their enabled state
+        self.data_widgets = []
         
         # Track if changes have been made
         self.has_unsaved_changes = False
@@ -30,39 +83,111 @@ class BirdCodeManager:
         # Create the main layout
         self.create_layout()
         
-        # Populate the list
-        self.populate_code_list()
+        # Load the codes in the background; the list fills in when ready
+        self.update_status("Loading codes...")
+        self.start_loading()
         
         # Setup protocol for window close
         self.window.protocol("WM_DELETE_WINDOW", self.on_close)
+        setup_profile.stop()
         
         # If not a Toplevel window, run the mainloop
         if not master:
             self.window.mainloop()
             
-    def load_codes(self):
-        try:
-            with open("bird codes.json", "r") as f:
-                return json.load(f)
-        except FileNotFoundError:
-            # Sample data as fallback
-            sample_data = {"TEST": "This is a test code", "ABCD": "Sample code description"}
-            # Save sample data
-            with open("bird codes.json", "w") as f:
-                json.dump(sample_data, f, indent=4)
-            return sample_data
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load data: {str(e)}")
-            return {}
+    # Read and index the codes on a worker thread; the window polls for
+    # the end and stays responsive meanwhile
+    def start_loading(self):
+        locale = self.locale_var.get()
+        outcome = self.loading_outcome = {}
+
+        def work():
+            names = None
+            try:
+                repository = self.repository if self.repository is not None else get_repository()
+                names = LocaleNames(repository, locale)
+                data = repository.snapshot()
+                loaded = {
+                    "repository": repository,
+                    "names": names,
+                    "data": data,
+                    "bitmap": CodeBitmap.from_codes(data),
+                    "index": SearchIndex.from_entries(
+                        (code, self.search_fields(code, name, names)) for code, name in data.items()),
+                }
+            except Exception as e:
+                loaded = {"error": e}
+            with self.loading_lock:
+                abandoned = self.closed
+                if not abandoned:
+                    outcome.update(loaded)
+            # Nobody will use the names if the window closed first or
+            # loading failed, so let go of their locale shard
+            if names is not None and (abandoned or "error" in loaded):
+                names.close()
+
+        worker = threading.Thread(target=work, daemon=True)
+        worker.start()
+
+        def check():
+            if self.closed:
+                return
+            if worker.is_alive():
+                self.window.after(50, check)
+            else:
+                self.finish_loading(outcome)
+
+        self.window.after(50, check)
+
+    def finish_loading(self, outcome):
+        self.loading_outcome = None
+        if "error" in outcome:
+            messagebox.showerror("Error", f"Failed to load data: {outcome['error']}")
+            self.update_status("Failed to load codes")
+            return
+        self.repository = outcome["repository"]
+        if self.repository.load_error:
+            messagebox.showerror("Error", f"Failed to load data: {self.repository.load_error}")
+        self.names = outcome["names"]
+        self.original_data = outcome["data"]
+        self.code_data = OverlayMap(self.original_data)
+        self.code_bitmap = outcome["bitmap"]
+        self.search_index = outcome["index"]
+        self.ready = True
+
+        # Search and editing can start while the list is still filling in
+        for widget, state in self.data_widgets:
+            widget.config(state=state)
+        self.update_locale_column()
+        self.update_letter_counts()
+        self.populate_code_list(self.search_var.get().strip())
+
+    # Disable a widget until the data is ready
+    def needs_data(self, widget, state=tk.NORMAL):
+        widget.config(state=tk.DISABLED)
+        self.data_widgets.append((widget, state))
+        return widget
             
+    @profiled("save")
     def save_codes(self):
         try:
-            with open("bird codes.json", "w") as f:
-                json.dump(self.code_data, f, indent=4, sort_keys=True)
-            self.original_data = self.code_data.copy()
+            # Commit all edits as one transaction, then write the file
+            with self.repository.transaction() as transaction:
+                for code, name in self.code_data.diff():
+                    if name is None:
+                        transaction.delete(code)
+                    else:
+                        transaction.set(code, name)
+            self.repository.save()
+            self.original_data = self.repository.snapshot()
+            self.code_data = OverlayMap(self.original_data)
             self.has_unsaved_changes = False
             self.update_status(f"Saved {len(self.code_data)} codes successfully.")
             self.window.title("Bird Code Manager")
+
+            # Lint the saved data so problems are noticed straight away
+            saved = self.original_data
+            self.lint_in_background(saved, lambda issues: self.report_save_lint(saved, issues))
             return True
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save data: {str(e)}")
@@ -89,40 +214,61 @@ class BirdCodeManager:
         
         # Search entry
         self.search_var = tk.StringVar()
-        self.search_entry = ttk.Entry(search_frame, textvariable=self.search_var)
+        self.search_entry = self.needs_data(ttk.Entry(search_frame, textvariable=self.search_var))
         self.search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
         self.search_var.trace("w", self.on_search_change)
         
         # Clear search button
         ttk.Button(search_frame, text="✕", width=3, 
                 command=lambda: self.search_var.set("")).pack(side=tk.RIGHT)
+
+        # Locale used for the localized name column
+        self.locale_var = tk.StringVar(value=load_locale_setting())
+        locale_box = self.needs_data(ttk.Combobox(search_frame, textvariable=self.locale_var,
+                                                  values=available_locales(), width=5), "readonly")
+        locale_box.pack(side=tk.RIGHT, padx=5)
+        locale_box.bind("<<ComboboxSelected>>", self.on_locale_change)
+
+        # Year to show names as of; empty for current names
+        self.year_var = tk.StringVar()
+        self.needs_data(ttk.Entry(search_frame, textvariable=self.year_var, width=6)).pack(side=tk.RIGHT)
+        ttk.Label(search_frame, text="As of:").pack(side=tk.RIGHT, padx=(5, 0))
+        self.year_var.trace("w", self.on_search_change)
         
         # Add alphabetical quick filters
         filter_frame = ttk.Frame(list_frame)
         filter_frame.pack(fill=tk.X, padx=5, pady=2)
         
         # Create A-Z buttons in rows
+        # Each button also shows how many codes start with its letter
         letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+        self.letter_buttons = {}
         for i, letter in enumerate(letters):
             column = i % 13
             row = i // 13
-            btn = ttk.Button(filter_frame, text=letter, width=2,
-                          command=lambda l=letter: self.filter_by_letter(l))
+            btn = self.needs_data(ttk.Button(filter_frame, text=letter, width=3,
+                                             command=lambda l=letter: self.filter_by_letter(l)))
             btn.grid(row=row, column=column, padx=1, pady=1)
+            self.letter_buttons[letter] = btn
+        self.update_letter_counts()
         
         # Show All button
-        ttk.Button(filter_frame, text="All", width=4,
-                  command=self.show_all_codes).grid(row=1, column=12, padx=1, pady=1)
+        self.needs_data(ttk.Button(filter_frame, text="All", width=4,
+                                   command=self.show_all_codes)).grid(row=0, column=13, rowspan=2,
+                                                    padx=1, pady=1, sticky="ns")
                 
         # Create the treeview for the list
-        columns = ("code", "description")
-        self.code_tree = ttk.Treeview(list_frame, columns=columns, show="headings")
+        columns = ("code", "description", "localized")
+        self.code_tree = ttk.Treeview(list_frame, columns=columns, show="headings",
+                                      selectmode="extended")
         self.code_tree.heading("code", text="Code", command=lambda: self.sort_treeview("code", False))
         self.code_tree.heading("description", text="Description", command=lambda: self.sort_treeview("description", False))
+        self.code_tree.heading("localized", text="Localized", command=lambda: self.sort_treeview("localized", False))
         
         # Set column widths
         self.code_tree.column("code", width=80, minwidth=60)
         self.code_tree.column("description", width=200, minwidth=100)
+        self.code_tree.column("localized", width=200, minwidth=100)
         
         # Add scrollbar
         scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.code_tree.yview)
@@ -169,6 +315,10 @@ class BirdCodeManager:
         desc_scroll = ttk.Scrollbar(self.desc_text, orient=tk.VERTICAL, command=self.desc_text.yview)
         self.desc_text.configure(yscrollcommand=desc_scroll.set)
         desc_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+
+        # Earlier meanings of the selected code, from the code history
+        self.history_label = ttk.Label(desc_frame, text="", justify=tk.LEFT, foreground="gray")
+        self.history_label.pack(anchor=tk.W)
         
         # Buttons frame for edit actions
         edit_buttons = ttk.Frame(edit_label_frame)
@@ -193,14 +343,42 @@ class BirdCodeManager:
         button_frame.pack(fill=tk.X, pady=10)
 
         # Add new code button (left)
-        ttk.Button(button_frame, text="Add New Code", 
-                command=self.add_new_code).pack(side=tk.LEFT, padx=5)
+        self.needs_data(ttk.Button(button_frame, text="Add New Code",
+                                   command=self.add_new_code)).pack(side=tk.LEFT, padx=5)
 
         # Delete code button (left)
         self.delete_btn = ttk.Button(button_frame, text="Delete Selected", 
                                     command=self.delete_selected_code, state=tk.DISABLED)
         self.delete_btn.pack(side=tk.LEFT, padx=5)
 
+        # Batch edits on the selected codes, or every listed code (left)
+        batch_button = self.needs_data(ttk.Menubutton(button_frame, text="Batch"))
+        batch_menu = tk.Menu(batch_button, tearoff=False)
+        batch_menu.add_command(label="Rename Prefix…", command=self.rename_prefix)
+        batch_menu.add_command(label="Find and Replace…", command=self.replace_descriptions)
+        batch_button["menu"] = batch_menu
+        batch_button.pack(side=tk.LEFT, padx=5)
+
+        # Import codes from an official list (left)
+        self.needs_data(ttk.Button(button_frame, text="Import…",
+                                   command=self.import_codes)).pack(side=tk.LEFT, padx=5)
+
+        # Export codes to other formats (left)
+        self.needs_data(ttk.Button(button_frame, text="Export…",
+                                   command=self.export_codes)).pack(side=tk.LEFT, padx=5)
+
+        # Generate codes for a batch of new species names (left)
+        self.needs_data(ttk.Button(button_frame, text="Generate…",
+                                   command=self.generate_codes)).pack(side=tk.LEFT, padx=5)
+
+        # Check the whole database against the code rules (left)
+        self.needs_data(ttk.Button(button_frame, text="Lint…",
+                                   command=self.show_lint_report)).pack(side=tk.LEFT, padx=5)
+
+        # Exchange changed codes with another station (left)
+        self.needs_data(ttk.Button(button_frame, text="Sync…",
+                                   command=self.sync_codes)).pack(side=tk.LEFT, padx=5)
+
         # Close button (far right)
         ttk.Button(button_frame, text="Close", command=self.on_close).pack(side=tk.RIGHT, padx=5)
 
@@ -235,52 +413,126 @@ class BirdCodeManager:
 
         self.validate_code()
     
+    @profiled("populate")
     def populate_code_list(self, filter_text=None):
-        # Clear existing items
+        # Stop filling in the previous list, then clear existing items
+        self.cancel_populating()
         self.code_tree.delete(*self.code_tree.get_children())
+        self.listed_codes = []
+        self.listed_count = 0
+        
+        # Look the search up in the index (all codes, sorted, if empty)
+        try:
+            matching_codes = self.search_index.search(filter_text or "")
+        except QueryError as e:
+            self.update_status(str(e))
+            return
         
-        # Add all codes from data to tree
-        sorted_codes = sorted(self.code_data.items())
-        
-        for code, description in sorted_codes:
-            # Apply filter if one is provided
-            if filter_text:
-                if filter_text.startswith("^"):  # Letter filter
-                    if not code.startswith(filter_text[1:]):
-                        continue
-                else:  # Text search
-                    filter_lower = filter_text.lower()
-                    if (filter_lower not in code.lower() and 
-                        filter_lower not in description.lower()):
-                        continue
+        self.listed_codes = matching_codes
+        self.listed_filter = filter_text
+        self.insert_rows()
+
+    # Add the next chunk of listed codes to the tree (all of them if limit
+    # is None). The rest follow in later `after` callbacks.
+    def insert_rows(self, limit=POPULATE_CHUNK):
+        self.populate_job = None
+        codes = self.listed_codes
+        start = self.listed_count
+        stop = len(codes) if limit is None else min(start + limit, len(codes))
+        year = self.as_of_year()
+        for code in codes[start:stop]:
+            description = self.code_data[code]
+            if year is not None and code in self.history:
+                description = self.history.name_as_of(code, year, description) or "(not in use)"
             
             # Description to display may be truncated
             display_desc = description
             if len(display_desc) > 50:
                 display_desc = display_desc[:47] + "..."
+            localized = self.names.localized_name(code)
                 
             # Insert item into tree
-            self.code_tree.insert("", tk.END, values=(code, display_desc))
+            self.code_tree.insert("", tk.END, values=(code, display_desc, localized))
+        self.listed_count = stop
         
         # Update status
-        count = len(self.code_tree.get_children())
         total = len(self.code_data)
-        if filter_text:
-            self.update_status(f"Showing {count} of {total} codes")
+        if stop < len(codes):
+            self.update_status(f"Listing {stop} of {len(codes)} codes...")
+            self.populate_job = self.window.after(1, self.insert_rows)
+        elif self.listed_filter:
+            self.update_status(f"Showing {len(codes)} of {total} codes")
         else:
             self.update_status(f"Total: {total} codes")
+
+    def cancel_populating(self):
+        if self.populate_job is not None:
+            self.window.after_cancel(self.populate_job)
+            self.populate_job = None
+
+    # Insert the rows still waiting, before anything that needs every
+    # listed code in the tree
+    def finish_populating(self):
+        if self.populate_job is not None:
+            self.cancel_populating()
+            self.insert_rows(limit=None)
     
+    def on_locale_change(self, event=None):
+        if not self.ready:
+            return
+        # Swap the name shard; the code list itself is unchanged
+        if not self.names.set_locale(self.locale_var.get()):
+            messagebox.showerror("Error", f"Failed to load names for '{self.locale_var.get()}'")
+            self.locale_var.set(self.names.locale)
+            return
+        self.update_locale_column()
+        self.search_index.reindex_field(
+            "local", {code: self.names.localized_name(code) for code in self.code_data})
+        self.populate_code_list(self.search_var.get().strip())
+
+    # The "As of" year, or None for current names
+    def as_of_year(self):
+        year = self.year_var.get().strip()
+        return int(year) if len(year) == 4 and year.isdigit() else None
+
+    # Only show the localized column when a shard is active
+    def update_locale_column(self):
+        if self.names.locale == DEFAULT_LOCALE:
+            self.code_tree["displaycolumns"] = ("code", "description")
+        else:
+            self.code_tree.heading("localized", text=f"Name ({self.names.locale})")
+            self.code_tree["displaycolumns"] = ("code", "description", "localized")
+
     def on_search_change(self, *args):
+        if not self.ready:
+            return
         search_text = self.search_var.get().strip()
         self.populate_code_list(search_text)
         
     def filter_by_letter(self, letter):
-        self.search_var.set(f"^{letter}")
+        self.search_var.set(f"code:{letter}*")
         
+    def update_letter_counts(self):
+        for letter, btn in self.letter_buttons.items():
+            btn.config(text=f"{letter}\n{self.code_bitmap.count_prefix(letter)}")
+
     def show_all_codes(self):
         self.search_var.set("")
+
+    # Searchable fields of one entry
+    def search_fields(self, code, name, names=None):
+        names = names or self.names
+        return {"code": code, "name": name, "local": names.localized_name(code)}
+
+    # Bring one code's search entry in line with the edited data
+    def reindex_code(self, code):
+        if code in self.code_data:
+            self.search_index.add(code, self.search_fields(code, self.code_data[code]))
+        else:
+            self.search_index.remove(code)
         
     def sort_treeview(self, column, reverse):
+        self.finish_populating()
         # Get all items with their values
         item_list = [(self.code_tree.set(item, column), item) for item in 
                      self.code_tree.get_children('')]
@@ -300,7 +552,16 @@ class BirdCodeManager:
 
     def handle_selection(self):
         selection = self.code_tree.selection()
-        if selection:
+        if len(selection) > 1:
+            # Several rows: only batch actions apply, so leave the editor
+            if self.selected_code is not None and self.has_unsaved_edit():
+                if messagebox.askyesno("Unsaved Changes", 
+                                    "Save changes to the current code?"):
+                    self.save_current_edit()
+            self.clear_edit_panel()
+            self.delete_btn.config(state=tk.NORMAL)
+            self.update_status(f"{len(selection)} codes selected")
+        elif selection:
             item = selection[0]
             values = self.code_tree.item(item, "values")
             code = values[0]
@@ -316,6 +577,8 @@ class BirdCodeManager:
                 self.desc_text.config(state=tk.NORMAL)
                 self.desc_text.delete("1.0", tk.END)
                 self.desc_text.insert("1.0", self.code_data[code])
+                history = self.history.summary(code)
+                self.history_label.config(text=f"Earlier meanings:\n{history}" if history else "")
 
                 # Update buttons
                 self.set_edit_mode(True)
@@ -416,9 +679,14 @@ class BirdCodeManager:
                 # Remove old code
                 if self.selected_code in self.code_data:
                     del self.code_data[self.selected_code]
+                    self.code_bitmap.discard(self.selected_code)
+                    self.reindex_code(self.selected_code)
                     
             # Add/update with new values
             self.code_data[new_code] = new_desc
+            self.code_bitmap.add(new_code)
+            self.reindex_code(new_code)
+            self.update_letter_counts()
             
             # Update the selected code
             self.selected_code = new_code
@@ -433,6 +701,7 @@ class BirdCodeManager:
             self.populate_code_list(self.search_var.get().strip())
             
             # Select the new item
+            self.finish_populating()
             for item in self.code_tree.get_children():
                 if self.code_tree.item(item, "values")[0] == new_code:
                     self.code_tree.selection_set(item)
@@ -488,25 +757,8 @@ class BirdCodeManager:
                                 "Save changes to the current code?"):
                 self.save_current_edit()
         
-        # Get a unique new code suggestion
-        letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
-        # Start with a valid 4-letter alphabetic code (e.g., NEWW, NEWX...)
-        import string
-        base = "NEW"
-        suffix_chars = list(string.ascii_uppercase)
-        counter = 0
-
-        while True:
-            if counter < len(suffix_chars):
-                candidate = base + suffix_chars[counter]
-            else:
-                candidate = "N" + suffix_chars[counter // len(suffix_chars) % 26] + \
-                            suffix_chars[counter % 26] + "X"
-            if candidate not in self.code_data:
-                break
-            counter += 1
-
-        new_code = candidate
+        # Get a unique new code suggestion: the first free code from NEWA
+        new_code = self.code_bitmap.next_free("NEWA") or ""
 
         # Set up for editing the new code
         self.selected_code = None  # Not saved yet
@@ -539,37 +791,308 @@ class BirdCodeManager:
         self.update_status("Creating new code")
         
     def delete_selected_code(self):
-        if not self.selected_code:
+        codes = self.selected_codes()
+        if not codes:
             return
             
-        if messagebox.askyesno("Confirm Delete", 
-                             f"Are you sure you want to delete '{self.selected_code}'?"):
+        if len(codes) == 1:
+            prompt = f"Are you sure you want to delete '{codes[0]}'?"
+        else:
+            prompt = f"Are you sure you want to delete {len(codes)} codes?"
+        if messagebox.askyesno("Confirm Delete", prompt):
             try:
-                # Delete from data
-                if self.selected_code in self.code_data:
-                    del self.code_data[self.selected_code]
+                # Delete them all as one batch with a single refresh
+                self.apply_batch(bird_code_batch.delete_changes(self.code_data, codes))
                 
-                # Update the tree view
-                self.populate_code_list(self.search_var.get().strip())
-                
-                # Clear selection
-                self.selected_code = None
-                self.code_var.set("")
-                self.desc_text.delete("1.0", tk.END)
-                
-                # Update UI state
-                self.set_edit_mode(False)
+                # Clear selection and update UI state
+                self.clear_edit_panel()
                 self.delete_btn.config(state=tk.DISABLED)
-                self.mark_changes()
                 
-                self.update_status("Code deleted")
+                self.update_status("Code deleted" if len(codes) == 1
+                                   else f"Deleted {len(codes)} codes")
                 
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to delete: {str(e)}")
+
+    # Codes of the selected rows
+    def selected_codes(self):
+        codes = [self.code_tree.set(item, "code") for item in self.code_tree.selection()]
+        if not codes and self.selected_code:
+            codes = [self.selected_code]
+        return codes
+
+    # Codes a batch edit applies to: the selection, or every listed code
+    def batch_codes(self):
+        items = self.code_tree.selection()
+        if not items:
+            return list(self.listed_codes)
+        return [self.code_tree.set(item, "code") for item in items]
+
+    # Empty the edit panel, e.g. after a batch change
+    def clear_edit_panel(self):
+        self.suppress_validation = True
+        self.selected_code = None
+        self.original_edit = {"code": "", "description": ""}
+        self.code_var.set("")
+        self.desc_text.config(state=tk.NORMAL)
+        self.desc_text.delete("1.0", tk.END)
+        self.set_edit_mode(False)
+        self.code_validation.config(text="")
+        self.history_label.config(text="")
+        self.window.after_idle(lambda: setattr(self, 'suppress_validation', False))
+
+    def rename_prefix(self):
+        codes = self.batch_codes()
+        if not codes:
+            return
+        old_prefix = simpledialog.askstring(
+            "Rename Prefix", f"Prefix to replace in {len(codes)} codes:",
+            initialvalue=os.path.commonprefix(codes)[:3], parent=self.window)
+        if not old_prefix:
+            return
+        old_prefix = old_prefix.strip().upper()
+        new_prefix = simpledialog.askstring(
+            "Rename Prefix", f"Replace '{old_prefix}' with:", parent=self.window)
+        if new_prefix is None:
+            return
+        new_prefix = new_prefix.strip().upper()
+
+        changes, problems = bird_code_batch.prefix_rename_changes(
+            self.code_data, codes, old_prefix, new_prefix)
+        if problems:
+            listed = "\n".join(f"{code}: {reason}" for code, reason in problems[:10])
+            if len(problems) > 10:
+                listed += f"\n... and {len(problems) - 10} more"
+            messagebox.showerror("Rename Prefix", f"Nothing was renamed:\n{listed}",
+                                 parent=self.window)
+            return
+        if not changes:
+            messagebox.showinfo("Rename Prefix", f"No codes to rename from '{old_prefix}'.",
+                                parent=self.window)
+            return
+        if messagebox.askyesno("Rename Prefix",
+                               f"Rename {len(changes)} codes from {old_prefix}… to {new_prefix}…?",
+                               parent=self.window):
+            self.apply_batch(changes)
+            self.clear_edit_panel()
+            self.update_status(f"Renamed {len(changes)} codes")
+
+    def replace_descriptions(self):
+        codes = self.batch_codes()
+        if codes:
+            FindReplaceDialog(self.window, self.code_data, codes, self.apply_replacements)
+
+    def apply_replacements(self, changes):
+        self.apply_batch(changes)
+        self.clear_edit_panel()
+        self.update_status(f"Updated {len(changes)} descriptions")
     
+    def import_codes(self):
+        paths = filedialog.askopenfilenames(
+            parent=self.window,
+            title="Import Bird Codes",
+            filetypes=[("Code lists", "*.txt *.csv *.tsv"), ("All files", "*.*")])
+        if not paths:
+            return
+
+        # Show progress in the status bar while the files are read
+        def report(count):
+            self.update_status(f"Importing... {count} codes read")
+            self.window.update_idletasks()
+
+        try:
+            incoming = [bird_code_importer.import_file(path, progress=report)
+                        for path in paths]
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to import: {str(e)}")
+            return
+
+        if not any(incoming):
+            messagebox.showinfo("Import", "No codes were found in the selected files.")
+            return
+
+        changes = bird_code_merge.diff_code_lists(self.code_data, incoming)
+        if not changes:
+            messagebox.showinfo("Import", "The imported list matches the current codes.")
+            self.update_status("No changes to import")
+            return
+
+        MergeReviewDialog(self.window, changes, self.apply_merge)
+
+    def apply_merge(self, changes):
+        # Apply all accepted changes as one batch, then save once
+        self.apply_batch(changes)
+        if self.save_codes():
+            self.update_status(f"Applied {len(changes)} imported changes")
+
+    # Apply a list of merge Changes to the working copy, then refresh the
+    # list and the dirty state once for the whole batch
+    def apply_batch(self, changes):
+        bird_code_merge.apply_changes(self.code_data, changes)
+        # Free old codes before taking new ones, as apply_changes does
+        for change in changes:
+            if change.kind in (bird_code_merge.REMOVED, bird_code_merge.RENAMED):
+                self.code_bitmap.discard(change.code)
+        for change in changes:
+            if change.new_code:
+                self.code_bitmap.add(change.new_code)
+            for code in (change.code, change.new_code):
+                if code:
+                    self.reindex_code(code)
+        self.update_letter_counts()
+        self.populate_code_list(self.search_var.get().strip())
+        self.mark_changes()
+
+    def export_codes(self):
+        path = filedialog.asksaveasfilename(
+            parent=self.window,
+            title="Export Bird Codes",
+            defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("TSV", "*.tsv"), ("NDJSON", "*.ndjson"),
+                       ("Compact binary", "*.bcd")])
+        if not path:
+            return
+
+        # Export only what the current search shows
+        try:
+            codes = self.search_index.search(self.search_var.get().strip())
+            count = bird_code_exporter.export_file(
+                path, {code: self.code_data[code] for code in codes})
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to export: {str(e)}")
+            return
+        self.update_status(f"Exported {count} codes")
+
+    def sync_codes(self):
+        # Sync the saved list, so unsaved edits have to be saved first
+        if self.has_unsaved_changes:
+            if not messagebox.askyesno("Sync Codes", "Save your changes before syncing?"):
+                return
+            if not self.save_codes():
+                return
+        url = simpledialog.askstring("Sync Codes", "Sync server address:",
+                                     initialvalue=bird_code_sync.load_sync_url(),
+                                     parent=self.window)
+        if not url:
+            return
+        bird_code_sync.save_sync_url(url)
+
+        state = bird_code_sync.SyncState(
+            dict(self.code_data.items()), bird_code_sync.meta_path_for(self.repository.path))
+        self.update_status(f"Syncing with {url}...")
+
+        # Talk to the server on a worker thread; the window polls for the end
+        outcome = {}
+
+        def work():
+            try:
+                outcome["result"] = bird_code_sync.sync_state(
+                    state, bird_code_sync.http_requester(url))
+            except Exception as e:
+                outcome["error"] = e
+
+        worker = threading.Thread(target=work, daemon=True)
+        worker.start()
+
+        def check():
+            if worker.is_alive():
+                self.window.after(100, check)
+            else:
+                self.finish_sync(state, outcome)
+
+        self.window.after(100, check)
+
+    def finish_sync(self, state, outcome):
+        if "error" in outcome:
+            messagebox.showerror("Error", f"Sync failed: {outcome['error']}")
+            self.update_status("Sync failed")
+            return
+        result = outcome["result"]
+
+        # Pulled entries go in as one batch through the merge path
+        changes = []
+        for code, name in result.edits:
+            old_name = self.code_data.get(code)
+            if name is None:
+                changes.append(bird_code_merge.Change(bird_code_merge.REMOVED, code, old_name, None, None))
+            elif old_name is None:
+                changes.append(bird_code_merge.Change(bird_code_merge.ADDED, code, None, name, code))
+            else:
+                changes.append(bird_code_merge.Change(
+                    bird_code_merge.DESCRIPTION_CHANGED, code, old_name, name, code))
+        if changes:
+            self.apply_merge(changes)
+            if self.has_unsaved_changes:
+                # Saving failed; keep the old stamps so nothing is lost
+                return
+
+        try:
+            state.save_meta()
+        except OSError as e:
+            messagebox.showerror("Error", f"Failed to save sync state: {str(e)}")
+            return
+        self.update_status(f"Synced: {result.pulled} received, {result.pushed} sent "
+                           f"in {result.round_trips} round trips")
+
+    def generate_codes(self):
+        GenerateCodesDialog(self.window, self.code_data, self.apply_merge)
+
+    def show_lint_report(self):
+        # The save-time lint still holds if nothing was edited since
+        if self.lint_data is self.original_data and not self.code_data.is_modified():
+            LintReportDialog(self.window, self.lint_issues, self.select_code)
+            return
+        self.update_status("Checking codes...")
+        data = self.code_data.copy().freeze()
+
+        def show(issues):
+            self.lint_data, self.lint_issues = data, issues
+            self.update_status(f"{bird_code_lint.count_problems(issues)} lint problems")
+            LintReportDialog(self.window, issues, self.select_code)
+
+        self.lint_in_background(data, show)
+
+    # Lint a frozen view on a worker thread; the window polls for the end
+    # and hands the issues to on_done
+    def lint_in_background(self, data, on_done):
+        outcome = {}
+
+        def work():
+            outcome["issues"] = bird_code_lint.run_lint(data)
+
+        worker = threading.Thread(target=work, daemon=True)
+        worker.start()
+
+        def check():
+            if worker.is_alive():
+                self.window.after(100, check)
+            elif "issues" in outcome:
+                on_done(outcome["issues"])
+
+        self.window.after(100, check)
+
+    def report_save_lint(self, saved, issues):
+        self.lint_data, self.lint_issues = saved, issues
+        problems = bird_code_lint.count_problems(issues)
+        if problems and saved is self.original_data:
+            self.update_status(f"Saved {len(saved)} codes successfully. "
+                               f"{problems} lint problems - see Lint…")
+
+    # Select a code in the list, clearing the filter if it is hidden
+    def select_code(self, code):
+        for _ in range(2):
+            self.finish_populating()
+            for item in self.code_tree.get_children():
+                if self.code_tree.item(item, "values")[0] == code:
+                    self.code_tree.selection_set(item)
+                    self.code_tree.see(item)
+                    return True
+            self.search_var.set("")
+        return False
+
     def mark_changes(self):
         # Check if we have unsaved changes
-        if self.original_data != self.code_data:
+        if self.code_data.is_modified():
             if not self.has_unsaved_changes:
                 self.has_unsaved_changes = True
                 self.window.title("Bird Code Manager *")
@@ -597,23 +1120,366 @@ class BirdCodeManager:
         # Call callback if provided
         if self.callback:
             self.callback()
+
+        # Stop loading and filling in the list. Names loaded but not yet
+        # installed are closed here; a worker still running closes its own.
+        with self.loading_lock:
+            self.closed = True
+            unused, self.loading_outcome = self.loading_outcome, None
+        if unused and unused.get("names") is not None:
+            unused["names"].close()
+        self.cancel_populating()
+
+        # Let go of any locale shard this window was using
+        if self.names is not None:
+            self.names.close()
             
         # Close window
         self.window.destroy()
 
+# Lists the changes found by an import so they can be reviewed.
+# Selected rows are accepted; removals start unselected.
+class MergeReviewDialog:
+    def __init__(self, master, changes, on_apply):
+        self.changes = changes
+        self.on_apply = on_apply
+
+        self.window = tk.Toplevel(master)
+        self.window.title("Review Imported Changes")
+        self.window.geometry("700x450")
+        self.window.transient(master)
+
+        frame = ttk.Frame(self.window, padding="10")
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        ttk.Label(frame, text="Select the changes to apply:").pack(anchor=tk.W)
+
+        # Treeview listing every change
+        columns = ("kind", "code", "old", "new")
+        list_frame = ttk.Frame(frame)
+        list_frame.pack(fill=tk.BOTH, expand=True, pady=5)
+        self.tree = ttk.Treeview(list_frame, columns=columns, show="headings",
+                                 selectmode="extended")
+        self.tree.heading("kind", text="Change")
+        self.tree.heading("code", text="Code")
+        self.tree.heading("old", text="Current")
+        self.tree.heading("new", text="Incoming")
+        self.tree.column("kind", width=130, minwidth=100)
+        self.tree.column("code", width=100, minwidth=80)
+        self.tree.column("old", width=200, minwidth=100)
+        self.tree.column("new", width=200, minwidth=100)
+
+        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        selected = []
+        for index, change in enumerate(changes):
+            code = change.code
+            if change.kind == bird_code_merge.RENAMED:
+                code = f"{change.code} → {change.new_code}"
+            item = self.tree.insert("", tk.END, iid=str(index), values=(
+                change.kind, code, change.old_name or "", change.new_name or ""))
+            if change.kind != bird_code_merge.REMOVED:
+                selected.append(item)
+        self.tree.selection_set(selected)
+
+        # Summary of the whole diff
+        summary = bird_code_merge.format_diff(changes).rsplit("\n", 1)[-1]
+        ttk.Label(frame, text=summary).pack(anchor=tk.W)
+
+        button_frame = ttk.Frame(frame)
+        button_frame.pack(fill=tk.X, pady=(10, 0))
+        ttk.Button(button_frame, text="Select All",
+                   command=lambda: self.tree.selection_set(self.tree.get_children())
+                   ).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Save Report…",
+                   command=self.save_report).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Cancel",
+                   command=self.window.destroy).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(button_frame, text="Apply Selected",
+                   command=self.apply_selected).pack(side=tk.RIGHT, padx=5)
+
+    def save_report(self):
+        path = filedialog.asksaveasfilename(
+            parent=self.window, title="Save Diff Report",
+            defaultextension=".txt", filetypes=[("Text files", "*.txt")])
+        if not path:
+            return
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(bird_code_merge.format_diff(self.changes))
+                f.write("\n")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to save report: {str(e)}",
+                                 parent=self.window)
+
+    def apply_selected(self):
+        accepted = [self.changes[int(item)] for item in self.tree.selection()]
+        self.window.destroy()
+        if accepted:
+            self.on_apply(accepted)
+
+# Find and replace in the descriptions of a set of codes. All
+# replacements are handed back as one batch.
+class FindReplaceDialog:
+    def __init__(self, master, code_data, codes, on_apply):
+        self.code_data = code_data
+        self.codes = codes
+        self.on_apply = on_apply
+
+        self.window = tk.Toplevel(master)
+        self.window.title("Find and Replace")
+        self.window.transient(master)
+        self.window.resizable(False, False)
+
+        frame = ttk.Frame(self.window, padding="10")
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        ttk.Label(frame, text=f"Descriptions of {len(codes)} codes").grid(
+            row=0, column=0, columnspan=2, sticky=tk.W, pady=(0, 5))
+        ttk.Label(frame, text="Find:").grid(row=1, column=0, sticky=tk.W)
+        self.find_var = tk.StringVar()
+        find_entry = ttk.Entry(frame, textvariable=self.find_var, width=40)
+        find_entry.grid(row=1, column=1, padx=5, pady=2)
+        ttk.Label(frame, text="Replace with:").grid(row=2, column=0, sticky=tk.W)
+        self.replace_var = tk.StringVar()
+        ttk.Entry(frame, textvariable=self.replace_var, width=40).grid(
+            row=2, column=1, padx=5, pady=2)
+
+        self.regex_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(frame, text="Regular expression",
+                        variable=self.regex_var).grid(row=3, column=1, sticky=tk.W)
+        self.ignore_case_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(frame, text="Ignore case",
+                        variable=self.ignore_case_var).grid(row=4, column=1, sticky=tk.W)
+
+        self.result_label = ttk.Label(frame, text="")
+        self.result_label.grid(row=5, column=0, columnspan=2, sticky=tk.W, pady=5)
+
+        button_frame = ttk.Frame(frame)
+        button_frame.grid(row=6, column=0, columnspan=2, sticky=tk.EW)
+        ttk.Button(button_frame, text="Cancel",
+                   command=self.window.destroy).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(button_frame, text="Replace All",
+                   command=self.replace_all).pack(side=tk.RIGHT, padx=5)
+
+        find_entry.focus()
+
+    def replace_all(self):
+        if not self.find_var.get():
+            return
+        try:
+            changes = bird_code_batch.find_replace_changes(
+                self.code_data, self.codes, self.find_var.get(), self.replace_var.get(),
+                regex=self.regex_var.get(), ignore_case=self.ignore_case_var.get())
+        except re.error as e:
+            self.result_label.config(text=f"Invalid expression: {e}")
+            return
+        if not changes:
+            self.result_label.config(text="No matches")
+            return
+        self.window.destroy()
+        self.on_apply(changes)
+
+# Filterable list of lint issues. Double-click an issue to select its
+# code in the manager.
+class LintReportDialog:
+    def __init__(self, master, issues, on_select):
+        self.issues = issues
+        self.on_select = on_select
+
+        self.window = tk.Toplevel(master)
+        self.window.title("Lint Report")
+        self.window.geometry("700x450")
+        self.window.transient(master)
+
+        frame = ttk.Frame(self.window, padding="10")
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        # Filters: issue kind and free text
+        filter_frame = ttk.Frame(frame)
+        filter_frame.pack(fill=tk.X)
+        ttk.Label(filter_frame, text="Show:").pack(side=tk.LEFT)
+        kinds = sorted({issue.kind for issue in issues})
+        self.kind_var = tk.StringVar(value="All")
+        kind_box = ttk.Combobox(filter_frame, textvariable=self.kind_var,
+                                values=["All"] + kinds, state="readonly", width=18)
+        kind_box.pack(side=tk.LEFT, padx=5)
+        kind_box.bind("<<ComboboxSelected>>", lambda event: self.populate())
+
+        ttk.Label(filter_frame, text="Filter:").pack(side=tk.LEFT, padx=(10, 0))
+        self.filter_var = tk.StringVar()
+        ttk.Entry(filter_frame, textvariable=self.filter_var).pack(
+            side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.filter_var.trace("w", lambda *args: self.populate())
+
+        # Treeview listing the issues
+        columns = ("code", "severity", "kind", "message")
+        list_frame = ttk.Frame(frame)
+        list_frame.pack(fill=tk.BOTH, expand=True, pady=5)
+        self.tree = ttk.Treeview(list_frame, columns=columns, show="headings")
+        self.tree.heading("code", text="Code")
+        self.tree.heading("severity", text="Severity")
+        self.tree.heading("kind", text="Issue")
+        self.tree.heading("message", text="Details")
+        self.tree.column("code", width=70, minwidth=60)
+        self.tree.column("severity", width=80, minwidth=60)
+        self.tree.column("kind", width=120, minwidth=80)
+        self.tree.column("message", width=330, minwidth=100)
+
+        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.bind("<Double-1>", self.on_double_click)
+
+        self.count_label = ttk.Label(frame, text="")
+        self.count_label.pack(anchor=tk.W)
+
+        ttk.Button(frame, text="Close", command=self.window.destroy).pack(
+            side=tk.RIGHT, pady=(10, 0))
+
+        self.populate()
+
+    def populate(self):
+        self.tree.delete(*self.tree.get_children())
+        kind = self.kind_var.get()
+        filter_lower = self.filter_var.get().strip().lower()
+        shown = 0
+        for issue in self.issues:
+            if kind != "All" and issue.kind != kind:
+                continue
+            if (filter_lower and filter_lower not in issue.code.lower() and
+                    filter_lower not in issue.message.lower()):
+                continue
+            self.tree.insert("", tk.END, values=(
+                issue.code, issue.severity, issue.kind, issue.message))
+            shown += 1
+        self.count_label.config(text=f"Showing {shown} of {len(self.issues)} issues")
+
+    def on_double_click(self, event):
+        item = self.tree.identify_row(event.y)
+        if item:
+            self.on_select(self.tree.item(item, "values")[0])
+
+# Generates codes for pasted species names. The results can be reviewed
+# and the selected ones added in one batch.
+class GenerateCodesDialog:
+    def __init__(self, master, code_data, on_apply):
+        self.code_data = code_data
+        self.on_apply = on_apply
+        self.results = []
+
+        self.window = tk.Toplevel(master)
+        self.window.title("Generate Codes")
+        self.window.geometry("700x550")
+        self.window.transient(master)
+
+        frame = ttk.Frame(self.window, padding="10")
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        ttk.Label(frame, text="Species names (one per line):").pack(anchor=tk.W)
+        self.names_text = tk.Text(frame, height=8, wrap=tk.NONE)
+        self.names_text.pack(fill=tk.X, pady=5)
+
+        options = ttk.Frame(frame)
+        options.pack(fill=tk.X)
+        self.resolve_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(options, text="Resolve collisions automatically",
+                        variable=self.resolve_var).pack(side=tk.LEFT)
+        ttk.Button(options, text="Load File…", command=self.load_names).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(options, text="Generate", command=self.generate).pack(side=tk.RIGHT, padx=5)
+
+        # Results
+        columns = ("code", "name", "status", "note")
+        list_frame = ttk.Frame(frame)
+        list_frame.pack(fill=tk.BOTH, expand=True, pady=5)
+        self.tree = ttk.Treeview(list_frame, columns=columns, show="headings",
+                                 selectmode="extended")
+        self.tree.heading("code", text="Code")
+        self.tree.heading("name", text="Name")
+        self.tree.heading("status", text="Status")
+        self.tree.heading("note", text="Note")
+        self.tree.column("code", width=70, minwidth=60)
+        self.tree.column("name", width=220, minwidth=100)
+        self.tree.column("status", width=90, minwidth=70)
+        self.tree.column("note", width=250, minwidth=100)
+
+        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.summary_label = ttk.Label(frame, text="")
+        self.summary_label.pack(anchor=tk.W)
+
+        button_frame = ttk.Frame(frame)
+        button_frame.pack(fill=tk.X, pady=(10, 0))
+        ttk.Button(button_frame, text="Cancel",
+                   command=self.window.destroy).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(button_frame, text="Add Selected",
+                   command=self.add_selected).pack(side=tk.RIGHT, padx=5)
+
+    def load_names(self):
+        path = filedialog.askopenfilename(
+            parent=self.window, title="Load Species Names",
+            filetypes=[("Text files", "*.txt"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.names_text.delete("1.0", tk.END)
+                self.names_text.insert("1.0", f.read())
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load names: {str(e)}",
+                                 parent=self.window)
+
+    def generate(self):
+        names = self.names_text.get("1.0", tk.END).splitlines()
+        self.results = bird_code_generator.generate_codes(
+            names, self.code_data, auto_resolve=self.resolve_var.get())
+
+        # Pre-select everything that can be added
+        self.tree.delete(*self.tree.get_children())
+        addable = (bird_code_generator.ASSIGNED, bird_code_generator.RESOLVED)
+        selected = []
+        for index, result in enumerate(self.results):
+            item = self.tree.insert("", tk.END, iid=str(index), values=(
+                result.code, result.name, result.status, result.note))
+            if result.status in addable:
+                selected.append(item)
+        self.tree.selection_set(selected)
+
+        unresolved = sum(1 for result in self.results if result.status not in addable)
+        self.summary_label.config(
+            text=f"{len(selected)} new codes, {unresolved} not added")
+
+    def add_selected(self):
+        addable = (bird_code_generator.ASSIGNED, bird_code_generator.RESOLVED)
+        changes = []
+        for item in self.tree.selection():
+            result = self.results[int(item)]
+            if result.status in addable:
+                changes.append(bird_code_merge.Change(
+                    bird_code_merge.ADDED, result.code, None, result.name, result.code))
+        self.window.destroy()
+        if changes:
+            self.on_apply(changes)
+
 # Function to replace open_codes_file
 def open_codes_manager(master=None):
     """Opens the bird code manager window instead of the raw file"""
-    # Create the manager window, pass the master window
-    # and a callback to reload codes after editing
-    BirdCodeManager(master, callback=lambda: reload_codes())
+    # Saved edits go straight into the shared repository, so no reload
+    # callback is needed
+    BirdCodeManager(master)
     
     return True
 
-# Function to reload codes after editing
+# Function to reload codes from disk, e.g. after the file was edited by hand
 def reload_codes():
-    global code_map
-    code_map = load_codes()
+    get_repository().load()
     return True
 
 # For testing purposes
@@ -0,0 +1,252 @@
+import gc
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque, namedtuple
+
+# ------- CONFIGURATION -------
+# Settings file holding the optional budget:
+#   {"memory_budget_mb": 120, "object_budget": 400000}
+CONFIG_FILE = "app_config.json"
+
+# Seconds between samples while the budget monitor runs
+SAMPLE_INTERVAL = 60.0
+
+# Samples kept in memory (a week at one per minute)
+MAX_SAMPLES = 7 * 24 * 60
+
+# Append-only log of samples, for graphs over days
+MEMORY_LOG_FILE = "memory log.tsv"
+
+# A warning is repeated only after usage drops below this share of the budget
+REARM_RATIO = 0.9
+# ---------------------------
+
+MemorySample = namedtuple("MemorySample", "timestamp rss objects")
+
+
+# Resident set size of this process in bytes, or None if unavailable
+def current_rss():
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    if sys.platform == "win32":
+        return _windows_rss()
+    try:
+        import resource
+        # Only the peak is available here; kilobytes on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except (ImportError, OSError):
+        return None
+
+
+def _windows_rss():
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+                (name, ctypes.c_size_t) for name in (
+                    "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage",
+                    "QuotaPagedPoolUsage", "QuotaPeakNonPagedPoolUsage",
+                    "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage")]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize
+    except Exception:
+        pass
+    return None
+
+
+# Number of objects tracked by the garbage collector
+def object_count():
+    return len(gc.get_objects())
+
+
+# Objects tracked by the garbage collector, counted per type name
+def type_counts():
+    return Counter(type(obj).__name__ for obj in gc.get_objects())
+
+
+def format_bytes(size):
+    if size is None:
+        return "unknown"
+    return f"{size / (1024 * 1024):.1f} MB"
+
+
+# Read the budget from the settings file: (budget in bytes, object budget),
+# either of which may be None
+def load_budget_settings(path=CONFIG_FILE):
+    try:
+        with open(path, "r") as f:
+            config = json.load(f)
+    except Exception:
+        return None, None
+    budget_mb = config.get("memory_budget_mb")
+    object_budget = config.get("object_budget")
+    budget = int(budget_mb * 1024 * 1024) if budget_mb else None
+    return budget, (int(object_budget) if object_budget else None)
+
+
+# Samples resident memory and the Python object count at a fixed interval
+# and calls on_warning(message) once per excursion over either budget.
+# Samples are also appended to a log file so growth over days can be seen
+# afterwards.
+class MemoryMonitor:
+    def __init__(self, budget=None, object_budget=None, interval=SAMPLE_INTERVAL,
+                 on_warning=None, log_path=MEMORY_LOG_FILE, clock=time.time):
+        self.budget = budget
+        self.object_budget = object_budget
+        self.interval = interval
+        self.on_warning = on_warning
+        self.log_path = log_path
+        self.clock = clock
+        self.samples = deque(maxlen=MAX_SAMPLES)
+        self._warned = {"rss": False, "objects": False}
+        self._stopped = threading.Event()
+        self._thread = None
+
+    # Monitor configured from the settings file, or None if no budget is set
+    @classmethod
+    def from_config(cls, on_warning=None, path=CONFIG_FILE):
+        budget, object_budget = load_budget_settings(path)
+        if budget is None and object_budget is None:
+            return None
+        return cls(budget, object_budget, on_warning=on_warning)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._sample_loop, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def _sample_loop(self):
+        while not self._stopped.is_set():
+            self.sample()
+            self._stopped.wait(self.interval)
+
+    # Take one sample, log it and check it against the budget
+    def sample(self):
+        sample = MemorySample(self.clock(), current_rss(), object_count())
+        self.samples.append(sample)
+        self._log(sample)
+        self._check("rss", sample.rss, self.budget,
+                    lambda: f"Memory use {format_bytes(sample.rss)} is over "
+                            f"the budget of {format_bytes(self.budget)}")
+        self._check("objects", sample.objects, self.object_budget,
+                    lambda: f"{sample.objects} Python objects is over "
+                            f"the budget of {self.object_budget}")
+        return sample
+
+    def _check(self, kind, value, budget, message):
+        if value is None or budget is None:
+            return
+        if value > budget and not self._warned[kind]:
+            self._warned[kind] = True
+            if self.on_warning is not None:
+                self.on_warning(message())
+        elif value < budget * REARM_RATIO:
+            self._warned[kind] = False
+
+    def _log(self, sample):
+        if not self.log_path:
+            return
+        stamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(sample.timestamp))
+        try:
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(f"{stamp}\t{sample.rss or ''}\t{sample.objects}\n")
+        except OSError as e:
+            print(f"Error writing memory log: {e}")
+
+    # Change in (rss, objects) from the first sample to the latest
+    def growth(self):
+        if len(self.samples) < 2:
+            return 0, 0
+        first, last = self.samples[0], self.samples[-1]
+        rss = (last.rss - first.rss) if first.rss is not None and last.rss is not None else 0
+        return rss, last.objects - first.objects
+
+    # Short text summary for the popup
+    def summary_text(self):
+        sample = self.samples[-1] if self.samples else MemorySample(
+            self.clock(), current_rss(), object_count())
+        lines = [f"Memory: {format_bytes(sample.rss)}, {sample.objects} objects"]
+        if self.budget or self.object_budget:
+            lines.append(f"Budget: {format_bytes(self.budget) if self.budget else '-'}, "
+                         f"{self.object_budget or '-'} objects")
+        if len(self.samples) >= 2:
+            hours = (self.samples[-1].timestamp - self.samples[0].timestamp) / 3600
+            rss, objects = self.growth()
+            lines.append(f"Growth over {hours:.1f} h: {rss / (1024 * 1024):+.1f} MB, "
+                         f"{objects:+d} objects")
+        return "\n".join(lines)
+
+
+SoakReport = namedtuple(
+    "SoakReport", "iterations seconds rss_start rss_end objects_start objects_end type_growth samples")
+
+
+# Drive an action with thousands of inputs and measure what stays behind.
+# The first `warmup` calls fill caches and are not counted; after that a
+# sample is taken every `sample_every` calls. `settle`, if given, is called
+# before each sample (e.g. to wait for queued popups to be shown).
+def soak_test(action, inputs, iterations=5000, sample_every=500, warmup=200, settle=None):
+    inputs = list(inputs)
+    if not inputs:
+        raise ValueError("Soak test needs at least one input")
+
+    def run(start, stop):
+        for i in range(start, stop):
+            action(inputs[i % len(inputs)])
+
+    def take_sample():
+        if settle is not None:
+            settle()
+        gc.collect()
+        return MemorySample(time.time(), current_rss(), object_count())
+
+    run(0, warmup)
+    first = take_sample()
+    types_before = type_counts()
+    samples = [first]
+    started = time.perf_counter()
+    for start in range(0, iterations, sample_every):
+        run(warmup + start, warmup + min(start + sample_every, iterations))
+        samples.append(take_sample())
+    seconds = time.perf_counter() - started
+
+    types_after = type_counts()
+    growth = Counter({name: types_after[name] - types_before.get(name, 0)
+                      for name in types_after})
+    type_growth = [(name, count) for name, count in growth.most_common(10) if count > 0]
+    last = samples[-1]
+    return SoakReport(iterations, seconds, first.rss, last.rss,
+                      first.objects, last.objects, type_growth, samples)
+
+
+def format_soak_report(report):
+    lines = [f"Soak test: {report.iterations} decodes in {report.seconds:.1f} s"]
+    if report.rss_start is not None and report.rss_end is not None:
+        lines.append(f"RSS: {format_bytes(report.rss_start)} -> {format_bytes(report.rss_end)} "
+                     f"({(report.rss_end - report.rss_start) / 1024:+.0f} KB)")
+    lines.append(f"Objects: {report.objects_start} -> {report.objects_end} "
+                 f"({report.objects_end - report.objects_start:+d})")
+    if report.type_growth:
+        lines.append("Types that grew:")
+        for name, count in report.type_growth:
+            lines.append(f"  {count:+8d}  {name}")
+    lines.append("Samples (RSS, objects):")
+    for sample in report.samples:
+        lines.append(f"  {format_bytes(sample.rss):>10}  {sample.objects}")
+    return "\n".join(lines)
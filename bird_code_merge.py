@@ -0,0 +1,160 @@
+import heapq
+import json
+import sys
+from collections import namedtuple
+
+# Kinds of change reported by the merge engine
+ADDED = "added"
+REMOVED = "removed"
+RENAMED = "renamed"
+DESCRIPTION_CHANGED = "description changed"
+
+# One difference between the current data and the incoming lists.
+# For renames, code is the old code and new_code is the replacement.
+Change = namedtuple("Change", "kind code old_name new_name new_code")
+
+
+# Normalize a name so renames are matched regardless of case and spacing
+def name_key(name):
+    return " ".join(name.lower().split())
+
+
+# Combine several incoming lists into one sorted sequence of (code, name).
+# When a code appears in more than one list, the later list wins.
+def combine_lists(incoming_lists):
+    sorted_lists = [
+        [(code, index, name) for code, name in sorted(codes.items())]
+        for index, codes in enumerate(incoming_lists)
+    ]
+    pending = None
+    for code, index, name in heapq.merge(*sorted_lists):
+        if pending is not None and pending[0] != code:
+            yield pending
+        pending = (code, name)
+    if pending is not None:
+        yield pending
+
+
+# Compare the current data against one or more incoming lists in a single
+# sorted pass. Codes missing from the incoming lists are only reported as
+# removed when include_removed is set (i.e. the lists are complete).
+def diff_code_lists(current, incoming_lists, include_removed=True):
+    if isinstance(incoming_lists, dict):
+        incoming_lists = [incoming_lists]
+
+    current_items = sorted(current.items())
+    incoming_items = combine_lists(incoming_lists)
+
+    added = []
+    removed = []
+    changes = []
+
+    i = 0
+    for code, name in incoming_items:
+        # Everything before this code exists only in the current data
+        while i < len(current_items) and current_items[i][0] < code:
+            removed.append(current_items[i])
+            i += 1
+        if i < len(current_items) and current_items[i][0] == code:
+            old_name = current_items[i][1]
+            if old_name != name:
+                changes.append(Change(DESCRIPTION_CHANGED, code, old_name, name, code))
+            i += 1
+        else:
+            added.append((code, name))
+    removed.extend(current_items[i:])
+
+    # A removed code whose name reappears under an added code is a rename
+    removed_by_name = {}
+    for code, name in removed:
+        removed_by_name.setdefault(name_key(name), []).append(code)
+    renamed_codes = set()
+    for code, name in added:
+        candidates = removed_by_name.get(name_key(name))
+        if candidates:
+            old_code = candidates.pop(0)
+            renamed_codes.add(old_code)
+            renamed_codes.add(code)
+            changes.append(Change(RENAMED, old_code, current[old_code], name, code))
+
+    for code, name in added:
+        if code not in renamed_codes:
+            changes.append(Change(ADDED, code, None, name, code))
+    if include_removed:
+        for code, name in removed:
+            if code not in renamed_codes:
+                changes.append(Change(REMOVED, code, name, None, None))
+
+    changes.sort(key=lambda change: change.code)
+    return changes
+
+
+# Apply a batch of changes to a code dict in place. Old codes are removed
+# before anything is written, so renames within the batch can reuse each
+# other's codes (AMRO -> AMRX while AMRX -> AMRY).
+def apply_changes(code_data, changes):
+    for change in changes:
+        if change.kind in (REMOVED, RENAMED):
+            code_data.pop(change.code, None)
+    for change in changes:
+        if change.kind == RENAMED:
+            code_data[change.new_code] = change.new_name
+        elif change.kind != REMOVED:
+            code_data[change.code] = change.new_name
+    return code_data
+
+
+# One line of the human-readable diff report
+def describe_change(change):
+    if change.kind == ADDED:
+        return f"+ {change.code}: {change.new_name}"
+    if change.kind == REMOVED:
+        return f"- {change.code}: {change.old_name}"
+    if change.kind == RENAMED:
+        return f"~ {change.code} -> {change.new_code}: {change.new_name}"
+    return f"* {change.code}: {change.old_name} -> {change.new_name}"
+
+
+# Build the full diff report, with a summary line at the end
+def format_diff(changes):
+    lines = [describe_change(change) for change in changes]
+    counts = {}
+    for change in changes:
+        counts[change.kind] = counts.get(change.kind, 0) + 1
+    summary = ", ".join(f"{counts.get(kind, 0)} {kind}"
+                        for kind in (ADDED, REMOVED, RENAMED, DESCRIPTION_CHANGED))
+    lines.append(summary)
+    return "\n".join(lines)
+
+
+# Command line entry point:
+#   python bird_code_merge.py "bird codes.json" new_list.csv [--apply]
+def main(argv=None):
+    import argparse
+    import bird_code_importer
+
+    parser = argparse.ArgumentParser(description="Merge official code lists into a code file")
+    parser.add_argument("current", help="Current JSON code file")
+    parser.add_argument("incoming", nargs="+", help="Lists to merge (table, CSV or TSV)")
+    parser.add_argument("--keep-missing", action="store_true",
+                        help="Do not report codes missing from the incoming lists as removed")
+    parser.add_argument("--apply", action="store_true",
+                        help="Write the merged result back to the current file")
+    args = parser.parse_args(argv)
+
+    with open(args.current, "r") as f:
+        current = json.load(f)
+    incoming = [bird_code_importer.import_file(path) for path in args.incoming]
+
+    changes = diff_code_lists(current, incoming, include_removed=not args.keep_missing)
+    print(format_diff(changes))
+
+    if args.apply and changes:
+        apply_changes(current, changes)
+        with open(args.current, "w") as f:
+            json.dump(current, f, indent=4, sort_keys=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
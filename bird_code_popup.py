@@ -0,0 +1,228 @@
+import queue
+import threading
+import tkinter as tk
+
+# ------- CONFIGURATION -------
+# How often the popup thread checks for new messages, in milliseconds.
+# call() also wakes it straight away, so this is only a backstop.
+POLL_INTERVAL = 50
+
+# Popups on screen at once; older ones are closed to make room
+MAX_POPUPS = 5
+# ---------------------------
+
+
+# A function queued to run on the popup thread
+class _Call:
+    def __init__(self, func):
+        self.func = func
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+    def run(self, root):
+        try:
+            self.result = self.func(root)
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done.set()
+
+
+# Shows popups from one resident Tk root on its own thread. The root is
+# created once and stays hidden, and each popup is a Toplevel destroyed
+# when it times out, so decodes leave no interpreter or thread behind.
+# show() and call() can be called from any thread.
+class PopupHost:
+    def __init__(self, duration=3000, bg="black", fg="white", font=("Arial", 14), images=None):
+        self.duration = duration
+        self.bg = bg
+        self.fg = fg
+        self.font = font
+        # Optional ImageCards giving a thumbnail to show next to the text
+        self.images = images
+        self.root = None
+        self._queue = queue.Queue()
+        self._popups = []
+        # Open popups by key, and text for keys not shown yet
+        self._keyed = {}
+        self._early_updates = {}
+        self._ready = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    # Start the popup thread (done automatically by the first show)
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        self._ready.wait()
+
+    def _run(self):
+        try:
+            self.root = tk.Tk()
+            self.root.withdraw()
+        except tk.TclError:
+            # No display; show() and call() report the failure
+            self.root = None
+            return
+        finally:
+            self._ready.set()
+        self.root.bind("<<Wake>>", self._on_wake)
+        self.root.after(POLL_INTERVAL, self._poll)
+        self.root.mainloop()
+
+    # Queue a message to be shown at the mouse position, with the
+    # thumbnail for the code `image` if there is one. A popup shown with
+    # a key can have its text changed later with update().
+    def show(self, message, image=None, key=None):
+        if self._thread is None:
+            self.start()
+        if self.root is None:
+            return False
+        self._queue.put((message, image, key))
+        return True
+
+    # Change the text of the popup shown with key, if it is still open
+    def update(self, key, message):
+        if self.root is None:
+            return False
+        self._queue.put(_Call(lambda root: self._update(key, message)))
+        return True
+
+    def _update(self, key, message):
+        if key in self._keyed:
+            self._keyed[key].label.config(text=message)
+        else:
+            # The popup itself may still be in the queue. Updates for
+            # popups already closed are dropped as newer ones come in.
+            self._early_updates[key] = message
+            while len(self._early_updates) > MAX_POPUPS:
+                del self._early_updates[next(iter(self._early_updates))]
+
+    # Run func(root) on the popup thread and return its result, for other
+    # Tk work (such as reading the clipboard) that needs the resident root.
+    # Raises TimeoutError if the popup thread does not get to it in time.
+    def call(self, func, timeout=1.0):
+        if self._thread is None:
+            self.start()
+        if self.root is None:
+            raise RuntimeError("No display for Tk")
+        request = _Call(func)
+        self._queue.put(request)
+        self._wake()
+        if not request.done.wait(timeout):
+            raise TimeoutError("Popup thread did not respond")
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    # Wait until every queued message has been shown
+    def drain(self):
+        if self.root is not None:
+            self._queue.join()
+
+    def stop(self):
+        if self.root is not None:
+            self._queue.put(None)
+
+    # Ask the popup thread to handle the queue now rather than at the next
+    # poll. Tk runs this on its own thread, so the caller waits for the
+    # event to be queued; show() does not use it and never waits.
+    def _wake(self):
+        try:
+            self.root.event_generate("<<Wake>>", when="tail")
+        except (tk.TclError, RuntimeError):
+            # Main loop not running yet or already stopped; the poll or
+            # the caller's timeout takes over
+            pass
+
+    def _on_wake(self, event):
+        self._drain()
+
+    def _poll(self):
+        if self._drain():
+            self.root.after(POLL_INTERVAL, self._poll)
+
+    # Handle every queued message; returns False once asked to stop
+    def _drain(self):
+        while True:
+            try:
+                message = self._queue.get_nowait()
+            except queue.Empty:
+                return True
+            try:
+                if message is None:
+                    self.root.quit()
+                    return False
+                if isinstance(message, _Call):
+                    message.run(self.root)
+                else:
+                    self._create_popup(*message)
+            except tk.TclError:
+                pass
+            except Exception as e:
+                # Keep polling; one bad message must not stop every later popup
+                print(f"Error showing popup: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _create_popup(self, message, image=None, key=None):
+        if key is not None:
+            message = self._early_updates.pop(key, message)
+
+        # Close the oldest popups first if too many are open
+        while len(self._popups) >= MAX_POPUPS:
+            self._close(self._popups[0])
+
+        mouse_x, mouse_y = self.root.winfo_pointerxy()
+
+        popup = tk.Toplevel(self.root)
+        popup.withdraw()  # Hide initially
+        popup.overrideredirect(True)  # Remove title bar and borders
+        popup.attributes("-topmost", True)  # Keep on top
+
+        # Create a frame with border
+        frame = tk.Frame(popup, bg=self.bg, padx=15, pady=10,
+                         highlightbackground="white", highlightthickness=1)
+        frame.pack()
+
+        # Add the text label
+        label = tk.Label(frame, text=message, bg=self.bg, fg=self.fg,
+                         font=self.font, justify=tk.LEFT)
+        label.pack(side=tk.LEFT)
+
+        # Add the species thumbnail, if there is one. One still being
+        # loaded is added when it arrives, if the popup is still open.
+        if image is not None and self.images is not None:
+            def add_image(photo):
+                if photo is not None and popup in self._popups:
+                    self._add_image(label, photo)
+            photo = self.images.photo(image, self.root, on_ready=add_image)
+            if photo is not None:
+                self._add_image(label, photo)
+
+        # Position window near mouse cursor
+        popup.geometry(f"+{mouse_x + 20}+{mouse_y + 20}")
+        popup.deiconify()  # Make visible
+
+        self._popups.append(popup)
+        popup.key = key
+        popup.label = label
+        if key is not None:
+            self._keyed[key] = popup
+        # Auto-close after set duration
+        popup.after(self.duration, lambda: self._close(popup))
+
+    def _add_image(self, label, photo):
+        image_label = tk.Label(label.master, image=photo, bg=self.bg)
+        image_label.image = photo  # Keep it alive if the cache drops it
+        image_label.pack(side=tk.LEFT, padx=(0, 10), before=label)
+
+    def _close(self, popup):
+        if popup in self._popups:
+            self._popups.remove(popup)
+            if self._keyed.get(popup.key) is popup:
+                del self._keyed[popup.key]
+            popup.destroy()
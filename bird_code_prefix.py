@@ -0,0 +1,91 @@
+import heapq
+from bisect import bisect_left, insort
+
+from bird_code_repository import ADDED, RELOADED, REMOVED
+
+
+# First string after every string starting with prefix
+def _prefix_end(prefix):
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+# Sorted list of codes; all codes starting with a prefix form one slice
+# of it, found with two binary searches.
+class PrefixIndex:
+    def __init__(self, codes=()):
+        self._codes = sorted(codes)
+
+    def __len__(self):
+        return len(self._codes)
+
+    def __contains__(self, code):
+        i = bisect_left(self._codes, code)
+        return i < len(self._codes) and self._codes[i] == code
+
+    # Slice bounds of the codes starting with prefix
+    def bounds(self, prefix):
+        if not prefix:
+            return 0, len(self._codes)
+        start = bisect_left(self._codes, prefix)
+        return start, bisect_left(self._codes, _prefix_end(prefix), start)
+
+    def count(self, prefix):
+        start, stop = self.bounds(prefix)
+        return stop - start
+
+    # Codes starting with prefix, alphabetically, at most limit of them
+    def codes_with_prefix(self, prefix, limit=None):
+        start, stop = self.bounds(prefix)
+        if limit is not None:
+            stop = min(stop, start + limit)
+        return self._codes[start:stop]
+
+    # Up to limit completions for a prefix, plus the total number of
+    # matches. With weights (code -> number, e.g. how often each code was
+    # decoded) heavier codes come first; ties stay alphabetical. Only the
+    # weighted codes are ranked and the rest are read off the slice, so
+    # the cost depends on the number of weights, not of matches.
+    def complete(self, prefix, limit=10, weights=None):
+        start, stop = self.bounds(prefix)
+        total = stop - start
+        if not weights:
+            return self._codes[start:min(stop, start + limit)], total
+        # list() copies the items in one step, as weights may be a tally
+        # another thread is adding to
+        weighted = [code for code, weight in list(weights.items())
+                    if weight > 0 and code.startswith(prefix) and code in self]
+        ranked = heapq.nsmallest(limit, weighted, key=lambda code: (-weights.get(code, 0), code))
+        chosen = set(ranked)
+        i = start
+        while len(ranked) < limit and i < stop:
+            if self._codes[i] not in chosen:
+                ranked.append(self._codes[i])
+            i += 1
+        return ranked, total
+
+    def add(self, code):
+        if code in self:
+            return False
+        insort(self._codes, code)
+        return True
+
+    def discard(self, code):
+        i = bisect_left(self._codes, code)
+        if i < len(self._codes) and self._codes[i] == code:
+            del self._codes[i]
+            return True
+        return False
+
+    # Keep the index in step with a repository's change events
+    def attach(self, repository):
+        def on_change(events):
+            for event in events:
+                if event.action == RELOADED:
+                    self._codes = sorted(repository)
+                elif event.action == ADDED:
+                    self.add(event.code)
+                elif event.action == REMOVED:
+                    self.discard(event.code)
+        self._codes = sorted(repository)
+        repository.subscribe(on_change)
+        return on_change
@@ -0,0 +1,232 @@
+# Opt-in profiling for the decoder and the code manager. Nothing is
+# measured unless profiling is switched on, either with the
+# BIRD_CODE_PROFILE environment variable or the --profile switch:
+#
+#   BIRD_CODE_PROFILE=all python "Bird Code Decode.py"
+#   python "Bird Code Decode.py" --profile=hotkey,popup,memory
+#
+# Each profiled call writes a cProfile report to PROFILE_DIR, named after
+# its section and the time. The "memory" section records a tracemalloc
+# snapshot at every popup and writes the growth since the previous popup.
+import cProfile
+import functools
+import io
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+
+# ------- CONFIGURATION -------
+# Environment variable listing the sections to profile, or "all"
+PROFILE_ENV = "BIRD_CODE_PROFILE"
+
+# Folder the reports are written to
+PROFILE_DIR = "profiles"
+
+# Functions listed in each cProfile report
+REPORT_LIMIT = 40
+
+# Allocation sites listed in each memory report, and stack depth kept
+MEMORY_LIMIT = 30
+MEMORY_FRAMES = 10
+# ---------------------------
+
+# Sections that can be switched on
+SECTIONS = {
+    "startup": "main() until the decoder is listening",
+    "hotkey": "on_hotkey_action",
+    "popup": "show_popup",
+    "manager": "BirdCodeManager.__init__",
+    "populate": "BirdCodeManager.populate_code_list",
+    "save": "BirdCodeManager.save_codes",
+    "memory": "tracemalloc snapshots diffed between popups",
+}
+
+_enabled = frozenset()
+_report_counter = 0
+_report_lock = threading.Lock()
+_previous_snapshot = None
+_snapshot_lock = threading.Lock()
+# The SectionProfile currently running, if any
+_active_profile = None
+_active_lock = threading.Lock()
+
+
+# Parse "hotkey,popup" or "all" into a set of section names
+def parse_sections(value):
+    names = {name.strip().lower() for name in (value or "").split(",") if name.strip()}
+    if "all" in names or "1" in names:
+        return frozenset(SECTIONS)
+    unknown = names - set(SECTIONS)
+    if unknown:
+        print(f"Unknown profiling sections ignored: {', '.join(sorted(unknown))}")
+    return frozenset(names & set(SECTIONS))
+
+
+# Switch profiling on for the given sections (a string or an iterable)
+def configure(sections):
+    global _enabled
+    if isinstance(sections, str):
+        sections = parse_sections(sections)
+    _enabled = frozenset(sections)
+    if "memory" in _enabled and not tracemalloc.is_tracing():
+        tracemalloc.start(MEMORY_FRAMES)
+    if _enabled:
+        print(f"Profiling {', '.join(sorted(_enabled))}; reports go to {os.path.abspath(PROFILE_DIR)}")
+
+
+# Apply --profile / --profile=sections from a command line and return the
+# remaining arguments. A bare --profile means all sections.
+def configure_from_argv(argv):
+    remaining = []
+    sections = None
+    for arg in argv:
+        if arg == "--profile":
+            sections = "all"
+        elif arg.startswith("--profile="):
+            sections = arg.split("=", 1)[1]
+        else:
+            remaining.append(arg)
+    if sections is not None:
+        configure(sections)
+    return remaining
+
+
+def is_enabled(section):
+    return section in _enabled
+
+
+# Timestamped report path, unique even for several reports per second
+def report_path(section, extension):
+    global _report_counter
+    with _report_lock:
+        _report_counter += 1
+        number = _report_counter
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return os.path.join(PROFILE_DIR, f"{section}-{stamp}-{number:04d}.{extension}")
+
+
+# cProfile run over one section, started by start_profile. stop() writes
+# the report; calling it again does nothing.
+class SectionProfile:
+    def __init__(self, section):
+        global _active_profile
+        self.section = section
+        self.started = time.perf_counter()
+        self.profiler = None
+        # Only one section is profiled at a time: a second profiler would
+        # replace the first one's hook (Python 3.11) or fail to start (3.12),
+        # so a section started inside another goes unmeasured
+        with _active_lock:
+            if _active_profile is not None:
+                return
+            _active_profile = self
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Someone else's profiler is running
+            self._release()
+            return
+        self.profiler = profiler
+
+    def _release(self):
+        global _active_profile
+        with _active_lock:
+            if _active_profile is self:
+                _active_profile = None
+
+    def stop(self):
+        if self.profiler is None:
+            return None
+        self.profiler.disable()
+        elapsed = time.perf_counter() - self.started
+        profiler, self.profiler = self.profiler, None
+        self._release()
+        return write_profile_report(self.section, profiler, elapsed)
+
+
+class _NoProfile:
+    def stop(self):
+        return None
+
+
+_NO_PROFILE = _NoProfile()
+
+
+# Start profiling a section if it is enabled; call .stop() on the result
+def start_profile(section):
+    if section not in _enabled:
+        return _NO_PROFILE
+    return SectionProfile(section)
+
+
+# Write the cProfile stats as text (sorted by cumulative time) plus the raw
+# .prof file for viewers such as snakeviz. Returns the text report path.
+def write_profile_report(section, profiler, elapsed):
+    try:
+        path = report_path(section, "txt")
+        profiler.dump_stats(path[:-len("txt")] + "prof")
+        text = io.StringIO()
+        stats = pstats.Stats(profiler, stream=text)
+        stats.sort_stats("cumulative").print_stats(REPORT_LIMIT)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"Section: {section} ({SECTIONS.get(section, '')})\n")
+            f.write(f"Wall time: {elapsed * 1000:.1f} ms\n")
+            f.write(text.getvalue())
+        return path
+    except Exception as e:
+        print(f"Error writing profile report: {e}")
+        return None
+
+
+# Decorator profiling every call of a function while its section is enabled
+def profiled(section):
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if section not in _enabled:
+                return function(*args, **kwargs)
+            profile = SectionProfile(section)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                profile.stop()
+        return wrapper
+    return decorate
+
+
+# Take a tracemalloc snapshot and write what grew since the previous one.
+# Does nothing unless the "memory" section is enabled.
+def snapshot_memory(label):
+    global _previous_snapshot
+    if "memory" not in _enabled or not tracemalloc.is_tracing():
+        return None
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    ))
+    with _snapshot_lock:
+        previous, _previous_snapshot = _previous_snapshot, snapshot
+    if previous is None:
+        return None
+    try:
+        differences = snapshot.compare_to(previous, "lineno")
+        current, peak = tracemalloc.get_traced_memory()
+        growth = sum(difference.size_diff for difference in differences)
+        path = report_path("memory", "txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"Snapshot: {label}\n")
+            f.write(f"Traced: {current / 1024:.1f} KiB (peak {peak / 1024:.1f} KiB), "
+                    f"{growth / 1024:+.1f} KiB since the previous snapshot\n\n")
+            for difference in differences[:MEMORY_LIMIT]:
+                f.write(f"{difference}\n")
+        return path
+    except Exception as e:
+        print(f"Error writing memory report: {e}")
+        return None
+
+
+configure(parse_sections(os.environ.get(PROFILE_ENV, "")))
@@ -0,0 +1,405 @@
+# Chain of places to look a code up in. The popup asks every provider
+# that accepts the copied text:
+#
+#   LocalProvider        the code database ("bird codes.json"), authoritative
+#   ListProvider         a secondary project list, one per JSON file in the
+#                        "project lists" folder ({"CODE": "Name"}, as usual)
+#   ReverseNameProvider  a species name copied instead of a code
+#   HttpProvider         a lookup service, from "lookup_url" in
+#                        app_config.json, e.g. "http://localhost:8000/{code}"
+#
+# Providers that only look in memory answer straight away. Providers that
+# need I/O run on a thread pool, each with its own timeout, and their
+# answers are kept for a while in a TTL cache. The popup is shown with the
+# answers available at once and updated as the slower ones arrive.
+import heapq
+import json
+import os
+import threading
+import time
+import urllib.parse
+import urllib.request
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+# ------- CONFIGURATION -------
+# Folder of extra code lists, one JSON file per list
+PROJECT_LISTS_DIR = "project lists"
+
+# Seconds before a slow provider's answer is given up on
+PROVIDER_TIMEOUT = 2.0
+
+# Slow lookups running at once
+MAX_WORKERS = 4
+
+# How long, in seconds, slow providers' answers are remembered, and how
+# many of them
+CACHE_TTL = 10 * 60
+CACHE_SIZE = 2000
+
+# Settings file shared with the decoder
+CONFIG_FILE = "app_config.json"
+# ---------------------------
+
+# One provider's answer. `authoritative` answers are trusted enough to
+# headline the popup.
+Answer = namedtuple("Answer", "provider name authoritative")
+
+
+def is_code(text):
+    return len(text) == 4 and text.isalpha()
+
+
+# The main code database, with names in the popup's locale.
+class LocalProvider:
+    name = "local"
+    authoritative = True
+    blocking = False
+
+    def __init__(self, code_map, names=None):
+        self.code_map = code_map
+        self.names = names
+
+    def accepts(self, text):
+        return is_code(text)
+
+    def lookup(self, code):
+        name = self.code_map.get(code)
+        if name is not None and self.names is not None:
+            name = self.names.name(code, name)
+        return name
+
+
+# A secondary code list, read from its file the first time it is used.
+class ListProvider:
+    authoritative = False
+    blocking = False
+
+    def __init__(self, name, path):
+        self.name = name
+        self.path = path
+        self._codes = None
+        self._lock = threading.Lock()
+
+    def accepts(self, text):
+        return is_code(text)
+
+    def lookup(self, code):
+        with self._lock:
+            if self._codes is None:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._codes = {key.upper(): value for key, value in json.load(f).items()}
+        return self._codes.get(code)
+
+
+# Species name -> code, for when a name is copied instead of a code. The
+# index is rebuilt after the repository changes.
+class ReverseNameProvider:
+    name = "names"
+    authoritative = True
+    blocking = False
+
+    def __init__(self, repository):
+        self.repository = repository
+        self._index = None
+        repository.subscribe(self.invalidate)
+
+    def invalidate(self, *args):
+        self._index = None
+
+    def accepts(self, text):
+        return len(text) > 4 or (len(text) == 4 and not text.isalpha())
+
+    def lookup(self, text):
+        index = self._index
+        if index is None:
+            index = self._index = {" ".join(name.upper().split()): code
+                                   for code, name in self.repository.items()}
+        return index.get(" ".join(text.split()))
+
+
+# A lookup service. "{code}" in the URL is replaced by the code; the
+# response is JSON with a "name" field, or the name as plain text.
+class HttpProvider:
+    authoritative = False
+    blocking = True
+
+    def __init__(self, url, name="web", timeout=PROVIDER_TIMEOUT):
+        self.url = url
+        self.name = name
+        self.timeout = timeout
+
+    def accepts(self, text):
+        return is_code(text)
+
+    def lookup(self, code):
+        url = self.url.replace("{code}", urllib.parse.quote(code))
+        with urllib.request.urlopen(url, timeout=self.timeout) as response:
+            body = response.read().decode("utf-8", "replace").strip()
+        if body.startswith("{"):
+            return json.loads(body).get("name") or None
+        return body or None
+
+
+# Remembers values for `ttl` seconds, dropping the least recently used
+# entries when more than `max_entries` are held.
+class TTLCache:
+    _MISSING = object()
+
+    def __init__(self, ttl=CACHE_TTL, max_entries=CACHE_SIZE, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    # (found, value)
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key, self._MISSING)
+            if entry is self._MISSING:
+                return False, None
+            expires, value = entry
+            if expires <= self.clock():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# One lookup's slow providers still to report. Providers finishing before
+# start_reporting() are counted into the answers lookup() returns; later
+# ones are reported through on_update.
+class _Lookup:
+    def __init__(self, answers, order, on_update):
+        self.answers = answers
+        self.order = order
+        self.on_update = on_update
+        self.waiting = {}
+        self.reporting = False
+        self._lock = threading.Lock()
+
+    # The answers so far and the number still pending; from here on,
+    # changes go to on_update
+    def start_reporting(self):
+        with self._lock:
+            self.reporting = True
+            return list(self.answers), len(self.waiting)
+
+    # A provider answered (name) or ran out of time (None)
+    def resolve(self, future, name):
+        with self._lock:
+            provider = self.waiting.pop(future, None)
+            if provider is None:
+                return
+            if name:
+                self.answers.append(Answer(provider.name, name, provider.authoritative))
+                self.answers.sort(key=lambda answer: self.order.get(answer.provider, len(self.order)))
+            if not self.reporting or self.on_update is None:
+                return
+            answers, pending = list(self.answers), len(self.waiting)
+        self.on_update(answers, pending)
+
+
+# One thread for every lookup's timeouts: resolves a provider with no
+# answer when its deadline passes before it has finished.
+class _Deadlines:
+    def __init__(self):
+        self._heap = []
+        self._counter = 0
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopped = False
+
+    def add(self, deadline, lookup, future):
+        with self._condition:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True,
+                                                name="bird-code-lookup-deadlines")
+                self._thread.start()
+            self._counter += 1
+            heapq.heappush(self._heap, (deadline, self._counter, lookup, future))
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._stopped and (not self._heap or self._heap[0][0] > time.monotonic()):
+                    timeout = self._heap[0][0] - time.monotonic() if self._heap else None
+                    self._condition.wait(timeout)
+                if self._stopped:
+                    return
+                _, _, lookup, future = heapq.heappop(self._heap)
+            if not future.done():
+                lookup.resolve(future, None)
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._heap.clear()
+            self._condition.notify()
+
+
+# Asks providers in order. lookup() returns the answers available at
+# once; slow providers report to `on_update` as they finish.
+class ProviderChain:
+    def __init__(self, providers, max_workers=MAX_WORKERS, cache=None):
+        self.providers = list(providers)
+        self.cache = cache if cache is not None else TTLCache()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="bird-code-lookup")
+        self._deadlines = _Deadlines()
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    # Answers for text, in provider order, plus the number of slow
+    # providers still working. `on_update(answers, pending)` is called
+    # from a worker thread each time one of them finishes or times out.
+    def lookup(self, text, on_update=None):
+        answers = []
+        slow = []
+        for provider in self.providers:
+            if not provider.accepts(text):
+                continue
+            if provider.blocking:
+                found, name = self.cache.get((provider.name, text))
+                if not found:
+                    slow.append(provider)
+                    continue
+            else:
+                name = self._ask(provider, text)
+            if name:
+                answers.append(Answer(provider.name, name, provider.authoritative))
+
+        if not slow:
+            return answers, 0
+        return self._fan_out(text, slow, answers, on_update)
+
+    @staticmethod
+    def _ask(provider, text):
+        try:
+            return provider.lookup(text)
+        except Exception as e:
+            print(f"Lookup in {provider.name} failed: {e}")
+            return None
+
+    # Like _ask, for the thread pool: the failure is raised again so the
+    # future records it and it is not cached as "no answer"
+    @staticmethod
+    def _ask_slow(provider, text):
+        try:
+            return provider.lookup(text)
+        except Exception as e:
+            print(f"Lookup in {provider.name} failed: {e}")
+            raise
+
+    # Run a slow provider, sharing one request between lookups that
+    # overlap and caching what it says (including "no answer", but not a
+    # failure, which is asked again next time)
+    def _submit(self, provider, text):
+        key = (provider.name, text)
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future
+            future = self._executor.submit(self._ask_slow, provider, text)
+            self._inflight[key] = future
+
+        def finished(future):
+            with self._lock:
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
+            if not future.cancelled() and future.exception() is None:
+                self.cache.put(key, future.result())
+
+        # Outside the lock: a future that is already done runs the
+        # callback straight away on this thread
+        future.add_done_callback(finished)
+        return future
+
+    # Ask the slow providers. Each one is reported as soon as it answers
+    # (from the worker that ran it) or runs out of time (from the shared
+    # deadline thread); no thread is started per lookup.
+    def _fan_out(self, text, providers, answers, on_update):
+        started = time.monotonic()
+        order = {provider.name: i for i, provider in enumerate(self.providers)}
+        lookup = _Lookup(answers, order, on_update)
+        futures = []
+        for provider in providers:
+            future = self._submit(provider, text)
+            lookup.waiting[future] = provider
+            futures.append((future, started + getattr(provider, "timeout", PROVIDER_TIMEOUT)))
+        for future, deadline in futures:
+            future.add_done_callback(lambda future: lookup.resolve(future, _future_name(future)))
+            self._deadlines.add(deadline, lookup, future)
+        return lookup.start_reporting()
+
+    def clear_cache(self):
+        self.cache.clear()
+
+    def shutdown(self):
+        self._deadlines.stop()
+        self._executor.shutdown(wait=False)
+
+
+# A slow provider's answer, or None if it was cancelled or failed
+def _future_name(future):
+    if future.cancelled() or future.exception() is not None:
+        return None
+    return future.result()
+
+
+# Popup text for a set of answers: the first authoritative answer (or
+# the first answer) as the headline, and any other names below it
+def format_answers(text, answers, pending=0):
+    if answers:
+        best = next((answer for answer in answers if answer.authoritative), answers[0])
+        source = "" if best.provider in ("local", "names") else f" ({best.provider})"
+        lines = [f"{text}: {best.name}{source}"]
+        for answer in answers:
+            if answer is not best and answer.name != best.name:
+                lines.append(f"  {answer.provider}: {answer.name}")
+    else:
+        lines = [f"{text}: Code not found"]
+    if pending:
+        lines.append(f"(checking {pending} more source{'s' if pending != 1 else ''}…)")
+    return "\n".join(lines)
+
+
+# Read the lookup service address from the settings file, if any
+def load_lookup_url():
+    try:
+        with open(CONFIG_FILE, "r") as f:
+            return json.load(f).get("lookup_url")
+    except Exception:
+        return None
+
+
+# The usual chain: the code database, the project lists, names, then the
+# lookup service if one is set
+def default_chain(repository, names=None, lists_dir=PROJECT_LISTS_DIR, url=None):
+    providers = [LocalProvider(repository, names)]
+    if os.path.isdir(lists_dir):
+        for filename in sorted(os.listdir(lists_dir)):
+            if filename.lower().endswith(".json"):
+                providers.append(ListProvider(os.path.splitext(filename)[0],
+                                              os.path.join(lists_dir, filename)))
+    providers.append(ReverseNameProvider(repository))
+    url = url if url is not None else load_lookup_url()
+    if url:
+        providers.append(HttpProvider(url))
+    return ProviderChain(providers)
@@ -0,0 +1,183 @@
+import json
+import os
+import threading
+from collections import namedtuple
+from collections.abc import Mapping
+
+from bird_code_store import CodeStore, OverlayMap
+
+# ------- CONFIGURATION -------
+# File holding the code database
+CODES_FILE = "bird codes.json"
+
+# Fold committed edits back into a fresh store after this many changes
+COMPACT_THRESHOLD = 1000
+# ---------------------------
+
+# Written when no code file exists yet
+SAMPLE_DATA = {"TEST": "This is a test code", "ABCD": "Sample code description"}
+
+# Change event actions
+ADDED = "added"
+REMOVED = "removed"
+CHANGED = "changed"
+RELOADED = "reloaded"
+
+# One change delivered to subscribers. For RELOADED events code and both
+# names are None and subscribers should rebuild from the repository.
+CodeChange = namedtuple("CodeChange", "action code old_name new_name")
+
+
+# Collects edits and commits them to the repository as one batch. Use
+# it as a context manager: the edits are committed when the block exits
+# normally and discarded if it raises.
+class Transaction:
+    def __init__(self, repository):
+        self.repository = repository
+        self.view = OverlayMap(repository.snapshot())
+
+    def set(self, code, name):
+        self.view[code] = name
+
+    def delete(self, code):
+        if code in self.view:
+            del self.view[code]
+
+    def get(self, code, default=None):
+        return self.view.get(code, default)
+
+    def commit(self):
+        return self.repository.commit(self.view.diff())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        return False
+
+
+# The process-wide code database. Reads go to an immutable snapshot that
+# is swapped on every commit, so other threads never see a half-applied
+# batch. Subscribers get the list of CodeChange events for each commit.
+class CodeRepository(Mapping):
+    def __init__(self, path=CODES_FILE):
+        self.path = path
+        self.version = 0
+        self.load_error = None
+        self._view = OverlayMap(CodeStore.from_dict({})).freeze()
+        self._lock = threading.RLock()
+        self._subscribers = []
+
+    # Read the code file, creating it with sample data if it is missing
+    def load(self):
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = SAMPLE_DATA
+            with open(self.path, "w") as f:
+                json.dump(data, f, indent=4)
+        with self._lock:
+            self._view = OverlayMap(CodeStore.from_dict(data)).freeze()
+            self.version += 1
+            self.load_error = None
+        self._notify([CodeChange(RELOADED, None, None, None)])
+        return True
+
+    # Write the current data back to the code file
+    def save(self):
+        data = dict(self._view.items())
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(data, f, indent=4, sort_keys=True)
+        os.replace(temp_path, self.path)
+        return True
+
+    # The current view. It is frozen, so it never changes after it is
+    # returned; copy() it to edit
+    def snapshot(self):
+        return self._view
+
+    # The compact store behind the current view
+    @property
+    def store(self):
+        return self._view.base
+
+    def transaction(self):
+        return Transaction(self)
+
+    # Apply (code, name) pairs, where a name of None deletes the code,
+    # and notify subscribers. Returns the events that were sent.
+    def commit(self, edits):
+        events = []
+        with self._lock:
+            view = self._view.copy()
+            for code, name in edits:
+                old_name = view.get(code)
+                if name is None:
+                    if old_name is not None:
+                        del view[code]
+                        events.append(CodeChange(REMOVED, code, old_name, None))
+                elif old_name is None:
+                    view[code] = name
+                    events.append(CodeChange(ADDED, code, None, name))
+                elif old_name != name:
+                    view[code] = name
+                    events.append(CodeChange(CHANGED, code, old_name, name))
+            if not events:
+                return events
+            if view.change_count() > COMPACT_THRESHOLD:
+                view = OverlayMap(view.compact())
+            self._view = view.freeze()
+            self.version += 1
+        self._notify(events)
+        return events
+
+    def subscribe(self, callback):
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def _notify(self, events):
+        for callback in list(self._subscribers):
+            try:
+                callback(events)
+            except Exception as e:
+                print(f"Error in code change subscriber: {e}")
+
+    def __getitem__(self, code):
+        return self._view[code]
+
+    def __contains__(self, code):
+        return code in self._view
+
+    def __iter__(self):
+        return iter(self._view)
+
+    def __len__(self):
+        return len(self._view)
+
+
+# The repository shared by everything in this process
+_repository = None
+_repository_lock = threading.Lock()
+
+
+# Get the shared repository, loading it on first use
+def get_repository():
+    global _repository
+    with _repository_lock:
+        if _repository is None:
+            _repository = CodeRepository()
+            try:
+                _repository.load()
+            except Exception as e:
+                _repository.load_error = str(e)
+        return _repository
@@ -0,0 +1,312 @@
+# Trigram index and query language for searching the code list. A query
+# is a list of terms that must all match:
+#
+#   warbler             code, name or localized name contains "warbler"
+#   "hermit thrush"     phrase, spaces included
+#   code:AM*            code starts with AM ("*" matches anything)
+#   name:*warbler       name ends with warbler
+#   -name:hybrid        negation: leave out entries that match
+#   name:/^(lesser|greater) /   regular expression
+#
+# Matching ignores case. Terms with at least three known letters (or a
+# two-letter prefix, or any one-letter prefix) are answered from the
+# index; the candidates are then checked against the term itself, so the
+# index only has to narrow the search, never be exact.
+import re
+from collections import namedtuple
+
+try:
+    from re import _parser as sre_parse
+except ImportError:
+    import sre_parse
+
+# Fields that can be searched, with the names accepted in queries
+FIELDS = ("code", "name", "local")
+FIELD_ALIASES = {
+    "code": "code",
+    "name": "name",
+    "desc": "name",
+    "description": "name",
+    "local": "local",
+    "localized": "local",
+}
+
+# Markers for the start and end of a field, so prefixes and suffixes have
+# trigrams of their own
+START = "\x02"
+END = "\x03"
+
+TEXT = "text"
+GLOB = "glob"
+REGEX = "regex"
+
+# One term: optional '-', optional 'field:', then "phrase", /regex/ or a word
+TOKEN = re.compile(r'\s*(-?)(?:([A-Za-z]+):)?(?:"([^"]*)"?|/((?:\\.|[^/\\])*)/?|(\S+))')
+
+_EMPTY = frozenset()
+
+
+# The search text could not be understood
+class QueryError(ValueError):
+    pass
+
+
+# A compiled query term. `literals` are lower-cased strings (with
+# START/END markers for anchors) that every matching field must contain;
+# `matches` checks a lower-cased field value.
+Term = namedtuple("Term", "fields kind value negated literals matches")
+
+
+# Trigrams of a string, each counted once
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+# Literal runs a regular expression needs in any match, lower-cased, with
+# START/END for ^ and $. Alternations and groups end a run.
+def regex_literals(pattern):
+    try:
+        parsed = sre_parse.parse(pattern, re.IGNORECASE)
+    except re.error:
+        return []
+    literals = []
+    run = ""
+    for op, argument in parsed:
+        name = str(op)
+        if name == "LITERAL":
+            run += chr(argument).lower()
+            continue
+        if name == "AT" and str(argument) == "AT_BEGINNING" and not run and not literals:
+            run = START
+            continue
+        if name == "AT" and str(argument) == "AT_END":
+            literals.append(run + END)
+            run = ""
+            continue
+        if run:
+            literals.append(run)
+        run = ""
+    if run:
+        literals.append(run)
+    return [literal for literal in literals if literal.strip(START + END)]
+
+
+def _compile_term(fields, kind, value, negated):
+    if kind == TEXT:
+        value = value.lower()
+        return Term(fields, kind, value, negated, [value] if value else [],
+                    lambda text: value in text)
+
+    if kind == GLOB:
+        value = value.lower()
+        parts = value.split("*")
+        pattern = ".*".join(re.escape(part) for part in parts)
+        matcher = re.compile(f"^{pattern}$", re.DOTALL).match
+        literals = list(parts)
+        literals[0] = START + literals[0]
+        literals[-1] = literals[-1] + END
+        literals = [literal for literal in literals if literal.strip(START + END)]
+        return Term(fields, kind, value, negated, literals,
+                    lambda text: matcher(text) is not None)
+
+    # The pattern keeps its case: lower-casing it would turn \S into \s.
+    # IGNORECASE covers the letters, and regex_literals lower-cases the
+    # literals used for the index.
+    try:
+        matcher = re.compile(value, re.IGNORECASE).search
+    except re.error as e:
+        raise QueryError(f"Invalid regular expression /{value}/: {e}")
+    return Term(fields, kind, value, negated, regex_literals(value),
+                lambda text: matcher(text) is not None)
+
+
+# Split a query into compiled terms
+def parse_query(query):
+    terms = []
+    position = 0
+    query = query.strip()
+    while position < len(query):
+        match = TOKEN.match(query, position)
+        if match is None or match.end() == position:
+            break
+        position = match.end()
+        negated, field, phrase, regex, word = match.groups()
+
+        fields = FIELDS
+        if field is not None:
+            if field.lower() in FIELD_ALIASES:
+                fields = (FIELD_ALIASES[field.lower()],)
+            elif word is not None:
+                # Not a field after all, e.g. "St.Helena:" - search it as text
+                word = f"{field}:{word}"
+
+        if regex is not None:
+            terms.append(_compile_term(fields, REGEX, regex, bool(negated)))
+        elif phrase is not None:
+            if phrase:
+                terms.append(_compile_term(fields, TEXT, phrase, bool(negated)))
+        elif word:
+            kind = GLOB if "*" in word else TEXT
+            terms.append(_compile_term(fields, kind, word, bool(negated)))
+    return terms
+
+
+# Trigram postings per field over the code list, kept up to date with
+# add() and remove() as entries are edited. Entries get small integer ids;
+# each field keeps its lower-cased text per id (for checking candidates),
+# trigram -> ids postings, and the ids per first letter for one-letter
+# prefix searches.
+class SearchIndex:
+    def __init__(self):
+        self._ids = {}
+        self._codes = {}
+        self._next_id = 0
+        self._text = {field: {} for field in FIELDS}
+        self._postings = {field: {} for field in FIELDS}
+        self._starts = {field: {} for field in FIELDS}
+
+    # Build an index from (code, {field: text}) pairs. Same result as
+    # calling add() for each, without the per-call bookkeeping.
+    @classmethod
+    def from_entries(cls, entries):
+        index = cls()
+        fields = [(field, index._text[field], index._postings[field], index._starts[field])
+                  for field in FIELDS]
+        for code, values in entries:
+            if code in index._ids:
+                index.add(code, values)
+                continue
+            entry = index._next_id
+            index._next_id += 1
+            index._ids[code] = entry
+            index._codes[entry] = code
+            for field, texts, postings, starts in fields:
+                text = (values.get(field) or "").lower()
+                texts[entry] = text
+                padded = START + text + END
+                for i in range(len(padded) - 2):
+                    ids = postings.get(padded[i:i + 3])
+                    if ids is None:
+                        postings[padded[i:i + 3]] = {entry}
+                    else:
+                        ids.add(entry)
+                if text:
+                    ids = starts.get(text[0])
+                    if ids is None:
+                        starts[text[0]] = {entry}
+                    else:
+                        ids.add(entry)
+        return index
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, code):
+        return code in self._ids
+
+    # Add an entry, or replace it if the code is already indexed
+    def add(self, code, values):
+        entry = self._ids.get(code)
+        if entry is None:
+            entry = self._next_id
+            self._next_id += 1
+            self._ids[code] = entry
+            self._codes[entry] = code
+        for field in FIELDS:
+            self._set_field(entry, field, values.get(field) or "")
+
+    def remove(self, code):
+        entry = self._ids.pop(code, None)
+        if entry is None:
+            return False
+        del self._codes[entry]
+        for field in FIELDS:
+            self._set_field(entry, field, None)
+        return True
+
+    # Replace one field for every entry, e.g. after switching locale
+    def reindex_field(self, field, values):
+        for code, entry in self._ids.items():
+            self._set_field(entry, field, values.get(code) or "")
+
+    def _set_field(self, entry, field, text):
+        texts = self._text[field]
+        postings = self._postings[field]
+        starts = self._starts[field]
+        old = texts.get(entry)
+        new = text.lower() if text is not None else None
+        if old == new:
+            return
+
+        # Drop the postings of the old value, then add the new one's
+        if old is not None:
+            del texts[entry]
+            for gram in trigrams(START + old + END):
+                ids = postings[gram]
+                ids.discard(entry)
+                if not ids:
+                    del postings[gram]
+            if old:
+                ids = starts[old[0]]
+                ids.discard(entry)
+                if not ids:
+                    del starts[old[0]]
+        if new is not None:
+            texts[entry] = new
+            for gram in trigrams(START + new + END):
+                postings.setdefault(gram, set()).add(entry)
+            if new:
+                starts.setdefault(new[0], set()).add(entry)
+
+    # Ids in one field that may contain every literal, or None when the
+    # literals are too short to narrow anything down
+    def _candidates(self, field, literals):
+        postings = self._postings[field]
+        sets = []
+        for literal in literals:
+            grams = trigrams(literal)
+            if grams:
+                sets.extend(postings.get(gram, _EMPTY) for gram in grams)
+            elif len(literal) == 2 and literal[0] == START:
+                sets.append(self._starts[field].get(literal[1], _EMPTY))
+        if not sets:
+            return None
+        sets.sort(key=len)
+        return sets[0].intersection(*sets[1:])
+
+    # Ids (within `scope`, if given) for which the term matches any field
+    def _match(self, term, scope):
+        found = set()
+        for field in term.fields:
+            candidates = self._candidates(field, term.literals)
+            if candidates is None:
+                candidates = scope if scope is not None else self._codes.keys()
+            elif scope is not None:
+                candidates = candidates & scope
+            texts = self._text[field]
+            matches = term.matches
+            found.update(entry for entry in candidates
+                         if entry not in found and matches(texts[entry]))
+        return found
+
+    # Codes matching a query (a string or parsed terms), sorted
+    def search(self, query):
+        terms = parse_query(query) if isinstance(query, str) else query
+        positive = [term for term in terms if not term.negated]
+        negative = [term for term in terms if term.negated]
+        if not positive and not negative:
+            return sorted(self._ids)
+
+        # Most selective terms first, so later ones check fewer candidates
+        positive.sort(key=lambda term: -max((len(literal) for literal in term.literals), default=0))
+        result = None
+        for term in positive:
+            result = self._match(term, result)
+            if not result:
+                return []
+        if result is None:
+            result = set(self._codes)
+        for term in negative:
+            result -= self._match(term, result)
+        codes = self._codes
+        return sorted(codes[entry] for entry in result)
@@ -0,0 +1,222 @@
+import csv
+import threading
+import time
+from collections import Counter, deque
+
+# ------- CONFIGURATION -------
+# Append-only log of every decoded code
+SESSION_LOG_FILE = "decode session log.tsv"
+
+# Buffered entries are written after this many seconds or entries
+FLUSH_INTERVAL = 10.0
+FLUSH_BATCH = 100
+
+# Rolling tally windows in seconds
+TALLY_WINDOWS = (5 * 60, 15 * 60, 60 * 60)
+
+# Upper bound on decodes remembered per rolling window
+MAX_WINDOW_EVENTS = 50000
+
+# Upper bound on log entries waiting to be written; if the log file
+# cannot be written for a long time the oldest are dropped
+MAX_PENDING = 10000
+# ---------------------------
+
+
+# Label for a window length, e.g. "15 min"
+def window_label(seconds):
+    if seconds % 3600 == 0:
+        return f"{seconds // 3600} h"
+    return f"{seconds // 60} min"
+
+
+# Counts per code over the last `seconds`, updated as decodes arrive and
+# expire, so reading it never rescans the whole session.
+class RollingTally:
+    def __init__(self, seconds, max_events=MAX_WINDOW_EVENTS):
+        self.seconds = seconds
+        self.counts = Counter()
+        self._events = deque()
+        self._max_events = max_events
+
+    def add(self, timestamp, code):
+        self._events.append((timestamp, code))
+        self.counts[code] += 1
+        if len(self._events) > self._max_events:
+            self._drop_oldest()
+
+    def expire(self, now):
+        cutoff = now - self.seconds
+        while self._events and self._events[0][0] < cutoff:
+            self._drop_oldest()
+
+    def _drop_oldest(self):
+        _, code = self._events.popleft()
+        self.counts[code] -= 1
+        if not self.counts[code]:
+            del self.counts[code]
+
+
+# Codes most likely to be decoded next, judging by the end of the
+# session log: the most frequent first, ties going to the most recent.
+def likely_codes(path=SESSION_LOG_FILE, limit=50, tail_bytes=256 * 1024):
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, 2)
+            start = max(0, f.tell() - tail_bytes)
+            f.seek(start)
+            lines = f.read().decode("utf-8", "replace").splitlines()
+    except OSError:
+        return []
+    if start > 0:
+        # The first line was cut in half by the seek
+        lines = lines[1:]
+    counts = Counter()
+    last_seen = {}
+    for position, line in enumerate(lines):
+        fields = line.split("\t")
+        if len(fields) >= 2:
+            counts[fields[1]] += 1
+            last_seen[fields[1]] = position
+    ranked = sorted(counts, key=lambda code: (-counts[code], -last_seen[code]))
+    return ranked[:limit]
+
+
+# Records decodes for the current session. Entries are appended to the
+# log file in batches by a background thread; running tallies cover the
+# whole session and each rolling window.
+class SessionLog:
+    def __init__(self, path=SESSION_LOG_FILE, windows=TALLY_WINDOWS, clock=time.time):
+        self.path = path
+        self.clock = clock
+        self.started = clock()
+        self.total = 0
+        self.session_counts = Counter()
+        self.names = {}
+        self.windows = [RollingTally(seconds) for seconds in windows]
+        self._pending = []
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    # Start the background writer
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._flush_loop, daemon=True)
+            self._thread.start()
+
+    # Stop the background writer and write anything still buffered
+    def stop(self):
+        self._stopped.set()
+        self._wake.set()
+        self.flush()
+
+    def _flush_loop(self):
+        while not self._stopped.is_set():
+            self._wake.wait(FLUSH_INTERVAL)
+            self._wake.clear()
+            self.flush()
+
+    # Record one decoded code
+    def record(self, code, name):
+        now = self.clock()
+        with self._lock:
+            self.total += 1
+            self.session_counts[code] += 1
+            self.names[code] = name
+            for window in self.windows:
+                window.add(now, code)
+            stamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(now))
+            self._pending.append(f"{stamp}\t{code}\t{name}\n")
+            self._trim_pending()
+            if len(self._pending) >= FLUSH_BATCH:
+                self._wake.set()
+
+    # Drop the oldest unwritten entries beyond MAX_PENDING. Call with the
+    # lock held.
+    def _trim_pending(self):
+        excess = len(self._pending) - MAX_PENDING
+        if excess > 0:
+            del self._pending[:excess]
+            self.dropped += excess
+
+    # Append buffered entries to the log file in one write
+    def flush(self):
+        with self._lock:
+            if not self._pending:
+                return 0
+            lines = self._pending
+            self._pending = []
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("".join(lines))
+        except OSError as e:
+            print(f"Error writing session log: {e}")
+            with self._lock:
+                self._pending[:0] = lines
+                self._trim_pending()
+            return 0
+        return len(lines)
+
+    # Session tallies as (code, name, count), most frequent first
+    def tallies(self):
+        with self._lock:
+            return [(code, self.names.get(code, ""), count)
+                    for code, count in self.session_counts.most_common()]
+
+    # Tallies for one rolling window length
+    def window_tallies(self, seconds):
+        now = self.clock()
+        with self._lock:
+            for window in self.windows:
+                if window.seconds == seconds:
+                    window.expire(now)
+                    return [(code, self.names.get(code, ""), count)
+                            for code, count in window.counts.most_common()]
+        raise ValueError(f"No tally window of {seconds} seconds")
+
+    # Short text summary for the popup: the session's top codes, then a
+    # line per rolling window with its busiest codes
+    def summary_text(self, limit=10, window_limit=3):
+        tallies = self.tallies()
+        if not tallies:
+            return "No codes decoded this session."
+        minutes = int((self.clock() - self.started) // 60)
+        lines = [f"Session: {self.total} decodes, {len(tallies)} species ({minutes} min)"]
+        for code, name, count in tallies[:limit]:
+            lines.append(f"{count:>4}  {code}  {name}")
+        if len(tallies) > limit:
+            lines.append(f"... and {len(tallies) - limit} more")
+        for window in self.windows:
+            recent = self.window_tallies(window.seconds)
+            label = f"Last {window_label(window.seconds)}"
+            if not recent:
+                lines.append(f"{label}: none")
+                continue
+            top = ", ".join(f"{code} {count}" for code, _, count in recent[:window_limit])
+            lines.append(f"{label}: {sum(count for _, _, count in recent)} decodes, "
+                         f"{len(recent)} species ({top})")
+        if self.dropped:
+            lines.append(f"({self.dropped} log entries could not be written)")
+        return "\n".join(lines)
+
+    # Write session and rolling-window tallies to a CSV file
+    def export_csv(self, path):
+        now = self.clock()
+        with self._lock:
+            for window in self.windows:
+                window.expire(now)
+            rows = [
+                [code, self.names.get(code, ""), count] +
+                [window.counts.get(code, 0) for window in self.windows]
+                for code, count in self.session_counts.most_common()
+            ]
+        header = ["code", "name", "session"] + [
+            f"last {window_label(window.seconds)}" for window in self.windows]
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(rows)
+        return len(rows)
@@ -0,0 +1,204 @@
+import string
+from array import array
+from collections.abc import Mapping, MutableMapping
+
+# Letters that make up a banding code
+ALPHABET = string.ascii_uppercase
+
+# Number of possible 4-letter codes (AAAA..ZZZZ)
+CODE_SPACE = 26 ** 4
+
+
+# Convert a 4-letter code to its position in the AAAA..ZZZZ code space,
+# or -1 if it is not a 4-letter A-Z code
+def code_to_index(code):
+    if len(code) != 4:
+        return -1
+    index = 0
+    for char in code:
+        value = ord(char) - 65
+        if value < 0 or value > 25:
+            return -1
+        index = index * 26 + value
+    return index
+
+
+# Convert a position in the code space back to its 4-letter code
+def index_to_code(index):
+    chars = []
+    for _ in range(4):
+        index, value = divmod(index, 26)
+        chars.append(ALPHABET[value])
+    return "".join(reversed(chars))
+
+
+# Read-only code -> name mapping kept in flat buffers: sorted fixed-width
+# codes, one UTF-8 blob of names and an offset array. Strings are only
+# created when an entry is read.
+class CodeStore(Mapping):
+    def __init__(self, codes, width, blob, offsets):
+        self._codes = codes
+        self._width = width
+        self._blob = blob
+        self._offsets = offsets
+
+    @classmethod
+    def from_items(cls, items):
+        items = sorted((code.encode("utf-8"), name) for code, name in items)
+        width = max((len(code) for code, _ in items), default=4)
+        codes = bytearray()
+        blob = bytearray()
+        offsets = array("I", [0])
+        for code, name in items:
+            codes += code.ljust(width, b"\0")
+            blob += name.encode("utf-8")
+            offsets.append(len(blob))
+        return cls(bytes(codes), width, bytes(blob), offsets)
+
+    @classmethod
+    def from_dict(cls, data):
+        if isinstance(data, CodeStore):
+            return data
+        return cls.from_items(data.items())
+
+    # Binary search for a code; returns its position or -1
+    def index_of(self, code):
+        try:
+            key = code.encode("utf-8")
+        except (AttributeError, UnicodeError):
+            return -1
+        width = self._width
+        if len(key) > width:
+            return -1
+        key = key.ljust(width, b"\0")
+        codes = self._codes
+        low, high = 0, len(self._offsets) - 1
+        while low < high:
+            mid = (low + high) // 2
+            if codes[mid * width:(mid + 1) * width] < key:
+                low = mid + 1
+            else:
+                high = mid
+        if low < len(self._offsets) - 1 and codes[low * width:(low + 1) * width] == key:
+            return low
+        return -1
+
+    # Materialize the code stored at a position
+    def code_at(self, index):
+        width = self._width
+        return self._codes[index * width:(index + 1) * width].rstrip(b"\0").decode("utf-8")
+
+    # Materialize the name stored at a position
+    def name_at(self, index):
+        return self._blob[self._offsets[index]:self._offsets[index + 1]].decode("utf-8")
+
+    # Approximate memory held by the buffers, in bytes
+    def nbytes(self):
+        return len(self._codes) + len(self._blob) + self._offsets.itemsize * len(self._offsets)
+
+    def __getitem__(self, code):
+        index = self.index_of(code)
+        if index < 0:
+            raise KeyError(code)
+        return self.name_at(index)
+
+    def __contains__(self, code):
+        return self.index_of(code) >= 0
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.code_at(index)
+
+    def items(self):
+        return [(self.code_at(i), self.name_at(i)) for i in range(len(self))]
+
+    def copy(self):
+        return dict(self.items())
+
+
+# Editable view over a CodeStore that records only the differences, so
+# several views can share one store. A frozen view raises TypeError on
+# writes; copy() gives an editable one.
+class OverlayMap(MutableMapping):
+    def __init__(self, base):
+        self.base = base
+        self.frozen = False
+        self._changes = {}
+        self._deleted = set()
+
+    # Make the view read-only and return it
+    def freeze(self):
+        self.frozen = True
+        return self
+
+    def _check_writable(self):
+        if self.frozen:
+            raise TypeError("This code view is read-only")
+
+    def __getitem__(self, code):
+        if code in self._changes:
+            return self._changes[code]
+        if code in self._deleted:
+            raise KeyError(code)
+        return self.base[code]
+
+    def __setitem__(self, code, name):
+        self._check_writable()
+        self._deleted.discard(code)
+        if self.base.get(code) == name:
+            # Back to the stored value - no longer a change
+            self._changes.pop(code, None)
+        else:
+            self._changes[code] = name
+
+    def __delitem__(self, code):
+        self._check_writable()
+        if code not in self:
+            raise KeyError(code)
+        self._changes.pop(code, None)
+        if code in self.base:
+            self._deleted.add(code)
+
+    def __contains__(self, code):
+        if code in self._changes:
+            return True
+        return code not in self._deleted and code in self.base
+
+    def __iter__(self):
+        for code in self.base:
+            if code not in self._deleted:
+                yield code
+        for code in self._changes:
+            if code not in self.base:
+                yield code
+
+    def __len__(self):
+        added = sum(1 for code in self._changes if code not in self.base)
+        return len(self.base) - len(self._deleted) + added
+
+    # True if the view differs from its base store
+    def is_modified(self):
+        return bool(self._changes or self._deleted)
+
+    # Number of codes changed or deleted relative to the base
+    def change_count(self):
+        return len(self._changes) + len(self._deleted)
+
+    # The differences as (code, name) pairs; name is None for deletions
+    def diff(self):
+        edits = [(code, None) for code in sorted(self._deleted)]
+        edits.extend(sorted(self._changes.items()))
+        return edits
+
+    # Build a new store holding the current contents of the view
+    def compact(self):
+        return CodeStore.from_items(self.items())
+
+    def copy(self):
+        view = OverlayMap(self.base)
+        view._changes = dict(self._changes)
+        view._deleted = set(self._deleted)
+        return view
@@ -0,0 +1,248 @@
+# Hotkey storm load test.
+#
+# Presses the hotkey many times a second, for minutes on end, through the
+# real keyboard callbacks, and measures how the decoder keeps up. The
+# popup host, clipboard, mouse pointer and tray are replaced by the fakes
+# below, and the decoder loads no keyboard or tray backend, so the test
+# runs without a display:
+#
+#   python "Bird Code Decode.py" --storm 100 600        # 100/s for 10 min
+#   python "Bird Code Decode.py" --storm 100 600 5 5    # 5 s bursts, 5 s pauses
+#
+# Each press is a full Ctrl+Shift+L chord delivered to on_press/on_release
+# on one thread, like the real listener does. Each clipboard text is kept
+# for several presses, so actions that find the clipboard unchanged are
+# exercised too. The report counts presses merged by the hotkey debounce
+# ("coalesced"), hotkey actions that never produced a popup ("dropped")
+# and errors (exceptions, or popups reporting an error), and gives latency
+# from the scheduled press to the popup, the peak thread count and memory
+# growth.
+import argparse
+import gc
+import threading
+import time
+from collections import namedtuple
+
+from bird_code_memory import current_rss, format_bytes, object_count
+
+StormReport = namedtuple(
+    "StormReport",
+    "presses actions popups coalesced dropped errors repeats seconds max_lag latencies "
+    "peak_threads rss_start rss_end rss_peak objects_start objects_end")
+
+
+# Pull the load-test switches out of a command line, like the profiling
+# switches: --soak [count] and --storm [rate [duration [burst [pause]]]].
+# Returns (options, remaining arguments); options.soak is None when not
+# given and 0 for "the default count", options.storm None or a list.
+def parse_load_test_args(argv):
+    parser = argparse.ArgumentParser(prog="Bird Code Decode.py", add_help=False,
+                                     allow_abbrev=False)
+    parser.add_argument("--soak", nargs="?", type=int, const=0, metavar="COUNT")
+    parser.add_argument("--storm", nargs="*", type=float, metavar="RATE DURATION BURST PAUSE")
+    options, remaining = parser.parse_known_args(argv)
+    if options.soak is not None and options.soak < 0:
+        parser.error("--soak count must not be negative")
+    if options.storm is not None and len(options.storm) > 4:
+        parser.error("--storm takes at most rate, duration, burst and pause")
+    return options, remaining
+
+
+# Takes the place of pynput's keyboard.Listener, keeping the callbacks so
+# the test can call them itself.
+class CapturingListener:
+    def __init__(self, on_press=None, on_release=None):
+        self.on_press = on_press
+        self.on_release = on_release
+        self.running = False
+
+    def start(self):
+        self.running = True
+
+    def stop(self):
+        self.running = False
+
+    def join(self, timeout=None):
+        pass
+
+
+# Records popups instead of drawing them. `pointer` is the fake mouse
+# position they would appear at. Popups starting with one of
+# `error_prefixes` are also counted in `errors`.
+class FakePopupHost:
+    def __init__(self, pointer=(100, 100), clock=time.perf_counter, error_prefixes=()):
+        self.pointer = pointer
+        self.clock = clock
+        self.error_prefixes = tuple(error_prefixes)
+        self.images = None
+        self.popups = 0
+        self.errors = 0
+        self.updates = 0
+        self.last_message = None
+        self.on_show = None
+
+    def show(self, message, image=None, key=None):
+        self.popups += 1
+        if self.error_prefixes and message.startswith(self.error_prefixes):
+            self.errors += 1
+        self.last_message = message
+        if self.on_show is not None:
+            self.on_show(self.clock())
+        return True
+
+    def update(self, key, message):
+        self.updates += 1
+        return True
+
+    # No Tk here, so Tk clipboard reads fall back like on a headless box
+    def call(self, func, timeout=1.0):
+        raise RuntimeError("No display in the storm test")
+
+    def drain(self):
+        pass
+
+    def stop(self):
+        pass
+
+
+# Stands in for the pystray icon.
+class FakeTray:
+    def __init__(self):
+        self.title = "Bird Code Decode"
+        self.notifications = []
+        self.visible = True
+
+    def notify(self, message, title=None):
+        self.notifications.append((title, message))
+
+    def run(self):
+        pass
+
+    def stop(self):
+        self.visible = False
+
+
+# Press times, in seconds from the start: `rate` presses a second for
+# `duration` seconds, or in bursts of `burst` seconds with `pause`
+# seconds of quiet between them
+def storm_schedule(rate, duration, burst=None, pause=0.0):
+    if rate <= 0:
+        raise ValueError("Storm rate must be positive")
+    times = [i / rate for i in range(int(round(duration * rate)))]
+    if burst:
+        period = burst + pause
+        times = [t for t in times if t % period < burst]
+    return times
+
+
+def percentile(sorted_values, share):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(share * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+# Run a storm. `chord` is the list of keys pressed (and then released in
+# reverse) for one hotkey press; `clipboard` is a FakeClipboard whose text
+# is set from `inputs`, each kept for `hold` presses; `actions` returns how
+# many hotkey actions have run (e.g. the fake clipboard's read count).
+# `settle` is called before the final memory reading, e.g. to flush logs.
+def storm_test(listener, chord, host, clipboard, inputs, rate, duration,
+               burst=None, pause=0.0, actions=None, clock=time.perf_counter,
+               hold=1, settle=None):
+    inputs = list(inputs)
+    schedule = storm_schedule(rate, duration, burst, pause)
+    actions = actions or (lambda: clipboard.reads)
+    hold = max(1, int(hold))
+
+    latencies = []
+    pending = [None]
+    errors = 0
+    repeats = 0
+    last_read = None
+    max_lag = 0.0
+    peak_threads = threading.active_count()
+
+    # The first popup after a press measures its latency
+    def shown(now):
+        if pending[0] is not None:
+            latencies.append(now - pending[0])
+            pending[0] = None
+
+    host.on_show = shown
+    gc.collect()
+    rss_start = rss_peak = current_rss()
+    objects_start = object_count()
+    popups_start = host.popups
+    error_popups_start = host.errors
+    actions_start = actions()
+    next_sample = 1.0
+
+    started = clock()
+    for i, offset in enumerate(schedule):
+        delay = started + offset - clock()
+        if delay > 0:
+            time.sleep(delay)
+        scheduled = started + offset
+        max_lag = max(max_lag, clock() - scheduled)
+
+        clipboard.text = inputs[(i // hold) % len(inputs)] if inputs else ""
+        pending[0] = scheduled
+        reads = clipboard.reads
+        try:
+            for key in chord:
+                listener.on_press(key)
+            for key in reversed(chord):
+                listener.on_release(key)
+        except Exception:
+            errors += 1
+        pending[0] = None
+        if clipboard.reads != reads:
+            if clipboard.text == last_read:
+                repeats += 1
+            last_read = clipboard.text
+
+        peak_threads = max(peak_threads, threading.active_count())
+        if offset >= next_sample:
+            rss = current_rss()
+            if rss is not None and (rss_peak is None or rss > rss_peak):
+                rss_peak = rss
+            next_sample = offset + 1.0
+    seconds = clock() - started
+    host.on_show = None
+
+    if settle is not None:
+        settle()
+    gc.collect()
+    rss_end = current_rss()
+    if rss_end is not None and (rss_peak is None or rss_end > rss_peak):
+        rss_peak = rss_end
+    presses = len(schedule)
+    action_count = actions() - actions_start
+    popups = host.popups - popups_start
+    errors += host.errors - error_popups_start
+    return StormReport(presses, action_count, popups, presses - action_count,
+                       max(0, action_count - popups), errors, repeats, seconds, max_lag,
+                       sorted(latencies), peak_threads, rss_start, rss_end, rss_peak,
+                       objects_start, object_count())
+
+
+def format_storm_report(report):
+    lines = [f"Hotkey storm: {report.presses} presses in {report.seconds:.1f} s"]
+    lines.append(f"Actions: {report.actions}, popups: {report.popups}")
+    lines.append(f"Coalesced by debounce: {report.coalesced}, dropped: {report.dropped}, "
+                 f"errors: {report.errors}")
+    lines.append(f"Actions on an unchanged clipboard: {report.repeats}")
+    if report.latencies:
+        ms = [f"{name} {percentile(report.latencies, share) * 1000:.2f}"
+              for name, share in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("max", 1.0))]
+        lines.append(f"Press to popup (ms): {', '.join(ms)}")
+    lines.append(f"Most behind schedule: {report.max_lag * 1000:.1f} ms")
+    lines.append(f"Peak threads: {report.peak_threads}")
+    if report.rss_start is not None and report.rss_end is not None:
+        lines.append(f"RSS: {format_bytes(report.rss_start)} -> {format_bytes(report.rss_end)} "
+                     f"(peak {format_bytes(report.rss_peak)}, "
+                     f"{(report.rss_end - report.rss_start) / 1024:+.0f} KB)")
+    lines.append(f"Objects: {report.objects_start} -> {report.objects_end} "
+                 f"({report.objects_end - report.objects_start:+d})")
+    return "\n".join(lines)
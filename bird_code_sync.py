@@ -0,0 +1,440 @@
+# Delta sync of code lists between workstations.
+#
+# Every entry carries a version stamp (counter, node) kept in a sidecar file
+# next to the code file. Edits made by any tool are noticed by comparing the
+# code file against the sidecar and get a fresh stamp from this node's
+# counter; entries that predate syncing share a base stamp. Deleted codes
+# keep a stamp too (a tombstone) so deletions spread.
+#
+# Two peers find their differences by comparing hashes: first one per first
+# letter, then one per two-letter prefix inside the letters that differ,
+# then the stamps of the entries in differing prefixes. Only the entries
+# that differ are sent. When both sides changed an entry, the higher
+# (counter, node) stamp wins on both sides, so every peer ends up with the
+# same list whatever order they sync in.
+#
+#   python bird_code_sync.py serve --port 8765
+#   python bird_code_sync.py sync http://127.0.0.1:8765
+import gzip
+import hashlib
+import json
+import os
+import sys
+import threading
+import urllib.request
+import uuid
+from collections import namedtuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# ------- CONFIGURATION -------
+# Code file synced by the command line tools
+CODES_FILE = "bird codes.json"
+
+# Address the sync server listens on; local only unless changed
+SYNC_HOST = "127.0.0.1"
+SYNC_PORT = 8765
+
+# Seconds to wait for a peer over a slow link
+SYNC_TIMEOUT = 60.0
+
+# Bodies larger than this are gzip-compressed
+COMPRESS_OVER = 1024
+
+# Settings file remembering the last server used from the manager
+CONFIG_FILE = "app_config.json"
+# ---------------------------
+
+# Stamp of one entry. name_hash is None for a deleted code.
+Stamp = namedtuple("Stamp", "counter node name_hash")
+
+SyncResult = namedtuple("SyncResult", "pulled pushed edits round_trips")
+
+
+# Path of the sidecar holding the stamps for a code file
+def meta_path_for(path):
+    base, _ = os.path.splitext(path)
+    return base + ".sync.json"
+
+
+def name_hash(name):
+    return hashlib.blake2b(name.encode("utf-8"), digest_size=8).hexdigest()
+
+
+# Order used to settle conflicts: higher counter wins, then higher node
+def stamp_key(stamp):
+    return (stamp.counter, stamp.node, stamp.name_hash or "")
+
+
+def _entry_digest(code, stamp):
+    text = f"{code}\0{stamp.counter}\0{stamp.node}\0{stamp.name_hash or ''}"
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+# Code data plus version stamps for one peer. `data` is a plain dict of
+# code -> name. Bucket hashes are the XOR of per-entry digests for each
+# two-letter prefix and are updated as stamps change, so answering a peer
+# never rehashes the whole list.
+class SyncState:
+    def __init__(self, data, meta_path, node=None):
+        self.data = data
+        self.meta_path = meta_path
+        self.node = node
+        self.clock = 0
+        self.stamps = {}
+        self._buckets = {}
+        self._has_meta = False
+        self._load_meta()
+        if self.node is None:
+            self.node = uuid.uuid4().hex[:12]
+        self.stamp_local_changes()
+
+    # State for a code file on disk
+    @classmethod
+    def from_file(cls, path=CODES_FILE):
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = {}
+        return cls(data, meta_path_for(path))
+
+    def _load_meta(self):
+        try:
+            with open(self.meta_path, "r") as f:
+                meta = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        self._has_meta = True
+        self.node = self.node or meta.get("node")
+        self.clock = meta.get("clock", 0)
+        for code, (counter, node, hashed) in meta.get("entries", {}).items():
+            self._set_stamp(code, Stamp(counter, node, hashed))
+
+    def _set_stamp(self, code, stamp):
+        old = self.stamps.get(code)
+        bucket = code[:2]
+        value = self._buckets.get(bucket, 0)
+        if old is not None:
+            value ^= _entry_digest(code, old)
+        value ^= _entry_digest(code, stamp)
+        self._buckets[bucket] = value
+        self.stamps[code] = stamp
+
+    # Give a new stamp to every entry edited or deleted since the last
+    # sync. Returns how many entries were stamped. On the very first run
+    # every entry gets the base stamp (0, ""), so stations that start from
+    # copies of the same file already agree and only real edits move.
+    def stamp_local_changes(self):
+        stamped = 0
+        for code, name in self.data.items():
+            hashed = name_hash(name)
+            stamp = self.stamps.get(code)
+            if stamp is None and not self._has_meta:
+                self._set_stamp(code, Stamp(0, "", hashed))
+                stamped += 1
+            elif stamp is None or stamp.name_hash != hashed:
+                self.clock += 1
+                self._set_stamp(code, Stamp(self.clock, self.node, hashed))
+                stamped += 1
+        for code, stamp in list(self.stamps.items()):
+            if stamp.name_hash is not None and code not in self.data:
+                self.clock += 1
+                self._set_stamp(code, Stamp(self.clock, self.node, None))
+                stamped += 1
+        return stamped
+
+    # Hashes of the buckets one letter below each prefix ("" or one letter)
+    def bucket_hashes(self, prefixes):
+        hashes = {}
+        for prefix in prefixes:
+            depth = len(prefix) + 1
+            for bucket, value in self._buckets.items():
+                if bucket.startswith(prefix):
+                    key = bucket[:depth]
+                    hashes[key] = hashes.get(key, 0) ^ value
+        return {key: format(value, "016x") for key, value in hashes.items() if value}
+
+    # Stamps of every entry in the given two-letter buckets
+    def stamps_in(self, buckets):
+        buckets = set(buckets)
+        return {code: list(stamp) for code, stamp in self.stamps.items() if code[:2] in buckets}
+
+    # Full entries to send to a peer: [counter, node, name_hash, name]
+    def entries(self, codes):
+        result = {}
+        for code in codes:
+            stamp = self.stamps.get(code)
+            if stamp is not None:
+                result[code] = list(stamp) + [self.data.get(code)]
+        return result
+
+    # Take in entries from a peer where their stamp wins. Returns the
+    # (code, name) edits made to the data, with None for deletions.
+    def merge(self, entries):
+        edits = []
+        for code, (counter, node, hashed, name) in entries.items():
+            incoming = Stamp(counter, node, hashed)
+            current = self.stamps.get(code)
+            self.clock = max(self.clock, counter)
+            if current is not None and stamp_key(current) >= stamp_key(incoming):
+                continue
+            self._set_stamp(code, incoming)
+            if name is None:
+                if self.data.pop(code, None) is not None:
+                    edits.append((code, None))
+            elif self.data.get(code) != name:
+                self.data[code] = name
+                edits.append((code, name))
+        return edits
+
+    def save_meta(self):
+        meta = {
+            "node": self.node,
+            "clock": self.clock,
+            "entries": {code: list(stamp) for code, stamp in sorted(self.stamps.items())},
+        }
+        temp_path = self.meta_path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(meta, f, separators=(",", ":"))
+        os.replace(temp_path, self.meta_path)
+
+    # Write the code file and the stamps together
+    def save(self, path):
+        temp_path = path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(self.data, f, indent=4, sort_keys=True)
+        os.replace(temp_path, path)
+        self.save_meta()
+
+
+# Where two hash maps disagree
+def _differing(local, remote):
+    return sorted(key for key in set(local) | set(remote) if local.get(key) != remote.get(key))
+
+
+# Reconcile a state with a peer. `request(method, payload)` sends one
+# request to the peer and returns its reply. Identical lists take one
+# round trip; otherwise four.
+def sync_state(state, request):
+    round_trips = 1
+    letters = _differing(state.bucket_hashes([""]), request("buckets", {"prefixes": [""]})["hashes"])
+    if not letters:
+        return SyncResult(0, 0, [], round_trips)
+
+    remote = request("buckets", {"prefixes": letters})["hashes"]
+    round_trips += 1
+    buckets = _differing(state.bucket_hashes(letters), remote)
+
+    remote_stamps = request("stamps", {"buckets": buckets})["stamps"]
+    round_trips += 1
+    local_stamps = state.stamps_in(buckets)
+    pull = []
+    push = []
+    for code in set(local_stamps) | set(remote_stamps):
+        local = local_stamps.get(code)
+        theirs = remote_stamps.get(code)
+        if local is None:
+            pull.append(code)
+        elif theirs is None:
+            push.append(code)
+        else:
+            local_key = stamp_key(Stamp(*local))
+            their_key = stamp_key(Stamp(*theirs))
+            if their_key > local_key:
+                pull.append(code)
+            elif local_key > their_key:
+                push.append(code)
+
+    reply = request("exchange", {"push": state.entries(push), "pull": pull})
+    round_trips += 1
+    edits = state.merge(reply["entries"])
+    return SyncResult(len(reply["entries"]), len(push), edits, round_trips)
+
+
+def _encode_body(message):
+    body = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    if len(body) > COMPRESS_OVER:
+        return gzip.compress(body), "gzip"
+    return body, None
+
+
+def _decode_body(body, encoding):
+    if encoding == "gzip":
+        body = gzip.decompress(body)
+    return json.loads(body.decode("utf-8"))
+
+
+# Request function for sync_state that talks to a sync server over HTTP
+def http_requester(url, timeout=SYNC_TIMEOUT):
+    url = url.rstrip("/")
+
+    def request(method, payload):
+        body, encoding = _encode_body(payload)
+        headers = {"Content-Type": "application/json", "Accept-Encoding": "gzip"}
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        http_request = urllib.request.Request(f"{url}/{method}", data=body, headers=headers)
+        with urllib.request.urlopen(http_request, timeout=timeout) as response:
+            return _decode_body(response.read(), response.headers.get("Content-Encoding"))
+
+    return request
+
+
+# Sync a code file with a server and write the result back
+def sync_file(url, path=CODES_FILE):
+    state = SyncState.from_file(path)
+    result = sync_state(state, http_requester(url))
+    state.save(path)
+    return result
+
+
+# Read the last sync server address from the settings file
+def load_sync_url():
+    try:
+        with open(CONFIG_FILE, "r") as f:
+            return json.load(f).get("sync_url", f"http://{SYNC_HOST}:{SYNC_PORT}")
+    except Exception:
+        return f"http://{SYNC_HOST}:{SYNC_PORT}"
+
+
+# Save the sync server address, keeping the other settings
+def save_sync_url(url):
+    try:
+        config = {}
+        if os.path.exists(CONFIG_FILE):
+            with open(CONFIG_FILE, "r") as f:
+                config = json.load(f)
+        config["sync_url"] = url
+        with open(CONFIG_FILE, "w") as f:
+            json.dump(config, f, indent=4)
+    except Exception as e:
+        print(f"Error saving config: {e}")
+
+
+# Serves one code file to peers over HTTP. Edits to the file made while
+# the server runs are picked up before each request.
+class SyncServer:
+    def __init__(self, path=CODES_FILE, host=SYNC_HOST, port=SYNC_PORT):
+        self.path = path
+        self.state = None
+        self._mtime = None
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+
+    @property
+    def address(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _refresh(self):
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if self.state is None or mtime != self._mtime:
+            self.state = SyncState.from_file(self.path)
+            self.state.save_meta()
+            self._mtime = mtime
+
+    # Answer one request from a peer
+    def handle(self, method, payload):
+        with self._lock:
+            self._refresh()
+            state = self.state
+            if method == "buckets":
+                return {"hashes": state.bucket_hashes(payload.get("prefixes", [""]))}
+            if method == "stamps":
+                return {"stamps": state.stamps_in(payload.get("buckets", []))}
+            if method == "exchange":
+                entries = state.entries(payload.get("pull", []))
+                if payload.get("push"):
+                    state.merge(payload["push"])
+                    state.save(self.path)
+                    self._mtime = os.stat(self.path).st_mtime_ns
+                return {"entries": entries}
+            raise ValueError(f"Unknown sync request: {method}")
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                try:
+                    length = int(self.headers.get("Content-Length", 0))
+                    payload = _decode_body(self.rfile.read(length),
+                                           self.headers.get("Content-Encoding"))
+                    reply = server.handle(self.path.strip("/"), payload)
+                    status = 200
+                except Exception as e:
+                    reply = {"error": str(e)}
+                    status = 400
+                body, encoding = _encode_body(reply)
+                if "gzip" not in self.headers.get("Accept-Encoding", "") and encoding:
+                    body, encoding = gzip.decompress(body), None
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                if encoding:
+                    self.send_header("Content-Encoding", encoding)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def serve_forever(self):
+        self.httpd.serve_forever()
+
+    # Serve on a background thread, e.g. for tests
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+# Command line entry point:
+#   python bird_code_sync.py serve [--host 0.0.0.0] [--port 8765]
+#   python bird_code_sync.py sync http://station-2:8765
+#   python bird_code_sync.py status
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Sync bird code lists between workstations")
+    parser.add_argument("-i", "--input", default=CODES_FILE, help="JSON code file")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    serve_parser = subparsers.add_parser("serve", help="Serve this code file to peers")
+    serve_parser.add_argument("--host", default=SYNC_HOST)
+    serve_parser.add_argument("--port", type=int, default=SYNC_PORT)
+    sync_parser = subparsers.add_parser("sync", help="Sync with a peer's server")
+    sync_parser.add_argument("url")
+    subparsers.add_parser("status", help="Show this file's sync state")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        server = SyncServer(args.input, args.host, args.port)
+        print(f"Serving {args.input} at {server.address}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    if args.command == "sync":
+        result = sync_file(args.url, args.input)
+        print(f"Pulled {result.pulled}, pushed {result.pushed}, "
+              f"{len(result.edits)} local changes in {result.round_trips} round trips")
+        return 0
+
+    state = SyncState.from_file(args.input)
+    deleted = sum(1 for stamp in state.stamps.values() if stamp.name_hash is None)
+    print(f"Node {state.node}, clock {state.clock}, {len(state.data)} codes, {deleted} deleted")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
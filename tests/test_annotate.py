@@ -0,0 +1,31 @@
+import json
+
+from bird_code_annotate import REPLACE, expand_codes, main
+
+CODES = {"AMRO": "American Robin", "BLJA": "Blue Jay"}
+
+
+def test_annotate_keeps_the_layout():
+    text = "AMRO\t3\nBLJA\t1\nNOPE\t2\r\nSAW AMRO, TOO"
+    expanded, count = expand_codes(text, CODES)
+    assert expanded == ("AMRO (American Robin)\t3\nBLJA (Blue Jay)\t1\nNOPE\t2\r\n"
+                        "SAW AMRO (American Robin), TOO")
+    assert count == 3
+    assert expand_codes(expanded, CODES) == (expanded, 0)
+
+
+def test_replace_and_ignore_case():
+    assert expand_codes("amro, BLJA", CODES, REPLACE) == ("amro, Blue Jay", 1)
+    assert expand_codes("amro, BLJA", CODES, REPLACE, ignore_case=True) == ("American Robin, Blue Jay", 2)
+    assert expand_codes("AMROS BLJAY", CODES) == ("AMROS BLJAY", 0)
+
+
+def test_command_line_expands_a_file(tmp_path, capsys):
+    codes = tmp_path / "codes.json"
+    codes.write_text(json.dumps(CODES))
+    source = tmp_path / "in.tsv"
+    source.write_text("code\tcount\nAMRO\t3\n", encoding="utf-8")
+    target = tmp_path / "out.tsv"
+    assert main([str(source), "-o", str(target), "--codes", str(codes), "--replace"]) == 0
+    assert target.read_text(encoding="utf-8") == "code\tcount\nAmerican Robin\t3\n"
+    assert "Expanded 1 codes" in capsys.readouterr().err
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+from bird_code_arrays import CodeArrays, FACTORIZE_SAMPLE, _as_unicode
+
+CODES = {"AMRO": "American Robin", "BLJA": "Blue Jay", "SORA": "Sora"}
+
+
+def test_decode_list_with_case_spaces_and_gaps():
+    arrays = CodeArrays(CODES)
+    names, found = arrays.decode(["AMRO", " blja ", None, "AMROX", "ZZZZ", 7], missing="?")
+    assert list(names) == ["American Robin", "Blue Jay", "?", "?", "?", "?"]
+    assert list(found) == [True, True, False, False, False, False]
+
+
+def test_decode_series_keeps_the_index():
+    arrays = CodeArrays(CODES)
+    names, found = arrays.decode(pd.Series(["SORA", np.nan], index=[10, 20]))
+    assert list(names.index) == [10, 20]
+    assert names[10] == "Sora" and pd.isna(names[20])
+    assert list(found) == [True, False]
+
+
+def test_large_columns_match_the_row_by_row_conversion():
+    rng = np.random.default_rng(0)
+    values = rng.choice(np.array(["AMRO", "blja ", None, np.nan, "SORA", 5, "XXXXX"], dtype=object),
+                        FACTORIZE_SAMPLE * 3)
+    expected = np.array([value if isinstance(value, str) else "" for value in values], dtype=str)
+    assert (_as_unicode(values) == expected).all()
+
+    names, found = CodeArrays(CODES).decode(pd.Series(values))
+    assert list(found) == [isinstance(value, str) and value.strip().upper() in CODES for value in values]
+
+
+def test_encode_ignores_case_and_spacing():
+    codes, found = CodeArrays(CODES).encode(["american  robin", "SORA", "Nothing", None], missing="")
+    assert list(codes) == ["AMRO", "SORA", "", ""]
+    assert list(found) == [True, True, False, False]
@@ -0,0 +1,47 @@
+import json
+
+from bird_code_batch import delete_changes, find_replace_changes, main, prefix_rename_changes
+from bird_code_merge import REMOVED, apply_changes
+
+CODES = {"AMRO": "American Robin", "AMCR": "American Crow", "AXCR": "Other Crow", "GRAJ": "Grey Jay"}
+
+
+def test_delete_skips_unknown_codes():
+    changes = delete_changes(CODES, ["AMRO", "NOPE"])
+    assert [(change.kind, change.code) for change in changes] == [(REMOVED, "AMRO")]
+
+
+def test_prefix_rename_reports_clashes():
+    changes, problems = prefix_rename_changes(CODES, ["AMRO", "AMCR"], "am", "ax")
+    assert [change.new_code for change in changes] == ["AXRO"]
+    assert problems == [("AMCR", "AXCR already exists")]
+
+    changes, problems = prefix_rename_changes(CODES, ["AMRO"], "AM", "A1")
+    assert problems == [("AMRO", "A1RO is not a 4-letter code")]
+
+
+def test_renames_can_swap_into_codes_that_move_away():
+    data = {"AMRO": "American Robin", "AXRO": "Robin X"}
+    changes, problems = prefix_rename_changes(data, ["AXRO", "AMRO"], "A", "B")
+    assert problems == []
+    data = dict(data)
+    apply_changes(data, changes)
+    assert data == {"BMRO": "American Robin", "BXRO": "Robin X"}
+
+
+def test_find_replace_plain_and_regex():
+    changes = find_replace_changes(CODES, CODES, "grey", "gray\\1", ignore_case=True)
+    assert [(change.code, change.new_name) for change in changes] == [("GRAJ", "gray\\1 Jay")]
+    changes = find_replace_changes(CODES, CODES, r"(\w+) Crow", r"Crow (\1)", regex=True)
+    assert sorted(change.new_name for change in changes) == ["Crow (American)", "Crow (Other)"]
+
+
+def test_command_line_applies_only_with_apply(tmp_path, capsys):
+    path = tmp_path / "codes.json"
+    path.write_text(json.dumps(CODES))
+    assert main(["-i", str(path), "delete", "code:AM*"]) == 0
+    assert json.loads(path.read_text()) == CODES
+    assert main(["-i", str(path), "--apply", "delete", "code:AM*"]) == 0
+    assert set(json.loads(path.read_text())) == {"AXCR", "GRAJ"}
+    assert main(["-i", str(path), "rename-prefix", "code:*CR", "AX", "GR"]) == 0
+    assert main(["-i", str(path), "rename-prefix", "code:*", "", "GRA"]) == 1
@@ -0,0 +1,44 @@
+from bird_code_bitmap import CodeBitmap
+from bird_code_repository import CodeRepository
+
+
+def test_counts_follow_adds_and_discards():
+    bitmap = CodeBitmap.from_codes(["AMRO", "AMCR", "BLJA", "bad", "AMRO"])
+    assert len(bitmap) == 3
+    assert "AMRO" in bitmap and "bad" not in bitmap
+    assert bitmap.count_prefix("am") == 2
+    assert bitmap.count_prefix("AMR") == 1
+    assert bitmap.count_prefix("AMRO") == 1
+    assert bitmap.count_prefix("") == 3
+    assert bitmap.discard("AMRO") and not bitmap.discard("AMRO")
+    assert bitmap.count_prefix("A") == 1
+
+
+def test_free_code_searches():
+    bitmap = CodeBitmap.from_codes(["AMRA", "AMRB", "AMRC", "AMQZ"])
+    assert bitmap.next_free("AMRA") == "AMRD"
+    assert bitmap.previous_free("AMRC") == "AMQY"
+    assert bitmap.nearest_free("AMRB") == "AMRD"
+    assert bitmap.free_near("AMRB", limit=3) == ["AMRD", "AMRE", "AMQY"]
+    assert CodeBitmap.from_codes(["ZZZZ"]).next_free("ZZZZ") == "AAAA"
+    assert CodeBitmap.from_codes(["ZZZZ"]).next_free("ZZZZ", wrap=False) is None
+
+
+def test_free_search_skips_full_runs():
+    bitmap = CodeBitmap.from_codes(f"A{chr(65 + i // 26)}{chr(65 + i % 26)}{c}"
+                                   for i in range(100) for c in "ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+    assert bitmap.next_free("AAAA") == "ADWA"
+    assert bitmap.previous_free("ADVZ") is None
+
+
+def test_attached_bitmap_follows_the_repository(tmp_path):
+    path = tmp_path / "codes.json"
+    path.write_text('{"AMRO": "American Robin"}')
+    repository = CodeRepository(str(path))
+    repository.load()
+    bitmap = CodeBitmap()
+    bitmap.attach(repository)
+    with repository.transaction() as transaction:
+        transaction.set("BLJA", "Blue Jay")
+        transaction.delete("AMRO")
+    assert "BLJA" in bitmap and "AMRO" not in bitmap
@@ -0,0 +1,71 @@
+import pytest
+
+from bird_code_clipboard import (ClipboardError, ClipboardWatcher, FakeClipboard,
+                                 FallbackClipboard, content_hash)
+
+
+def test_watcher_reports_changes():
+    backend = FakeClipboard("AMRO")
+    watcher = ClipboardWatcher(backend)
+
+    assert watcher.read() == ("AMRO", True)
+    assert watcher.read() == ("AMRO", False)
+    backend.text = "BLJA"
+    assert watcher.read() == ("BLJA", True)
+    assert backend.reads == 3
+
+
+def test_watcher_forget_makes_next_read_changed():
+    watcher = ClipboardWatcher(FakeClipboard("AMRO"))
+    watcher.read()
+    watcher.forget()
+    assert watcher.read() == ("AMRO", True)
+
+
+def test_watcher_treats_empty_clipboard_as_text():
+    backend = FakeClipboard(None)
+    watcher = ClipboardWatcher(backend)
+    assert watcher.read() == (None, True)
+    backend.text = ""
+    assert watcher.read() == ("", False)
+
+
+def test_watcher_passes_errors_through():
+    backend = FakeClipboard("AMRO")
+    backend.fail = True
+    with pytest.raises(ClipboardError):
+        ClipboardWatcher(backend).read()
+
+
+def test_watcher_write():
+    backend = FakeClipboard()
+    ClipboardWatcher(backend).write("AMRO (American Robin)")
+    assert backend.text == "AMRO (American Robin)"
+    assert backend.writes == 1
+
+
+def test_fallback_sticks_with_working_backend():
+    broken = FakeClipboard("broken")
+    broken.fail = True
+    working = FakeClipboard("AMRO")
+    clipboard = FallbackClipboard([broken, working])
+
+    assert clipboard.read() == "AMRO"
+    assert clipboard.active is working
+    # The broken backend is not tried again while the other one works
+    broken.fail = False
+    assert clipboard.read() == "AMRO"
+    assert broken.reads == 0
+
+
+def test_fallback_raises_when_every_backend_fails():
+    first, second = FakeClipboard(), FakeClipboard()
+    first.fail = second.fail = True
+    with pytest.raises(ClipboardError) as error:
+        FallbackClipboard([first, second]).write("AMRO")
+    assert "fake" in str(error.value)
+
+
+def test_content_hash_handles_surrogates():
+    assert content_hash("AMRO") != content_hash("BLJA")
+    assert content_hash("\ud800") == content_hash("\ud800")
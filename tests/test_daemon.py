@@ -0,0 +1,61 @@
+import os
+import socket
+import threading
+
+import pytest
+
+from bird_code_daemon import AlreadyRunning, CommandServer, send_command, socket_is_stale
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    # Unix socket paths are short; pytest's tmp_path can be too long
+    path = os.path.join("/tmp", f"bird-code-test-{os.getpid()}-{tmp_path.name}.sock")
+    yield path
+    if os.path.exists(path):
+        os.unlink(path)
+
+
+def test_commands_reach_the_server(socket_path):
+    server = CommandServer({"ping": lambda text: "pong"}, socket_path)
+    assert server.start()
+    try:
+        assert send_command("ping", path=socket_path) == {"ok": True, "result": "pong"}
+    finally:
+        server.stop()
+
+
+def test_stale_socket_file_is_replaced(socket_path):
+    dead = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    dead.bind(socket_path)
+    dead.close()
+    assert socket_is_stale(socket_path)
+    server = CommandServer({}, socket_path)
+    assert server.start()
+    server.stop()
+
+
+def test_busy_instance_keeps_its_socket(socket_path):
+    busy = threading.Event()
+    release = threading.Event()
+
+    def decode(text):
+        busy.set()
+        release.wait(5)
+        return "done"
+
+    server = CommandServer({"decode": decode, "ping": lambda text: "pong"}, socket_path)
+    server.start()
+    try:
+        threading.Thread(target=send_command, args=("decode", "AMRO", socket_path, 5),
+                         daemon=True).start()
+        assert busy.wait(2)
+        # The server is stuck on that request, so a ping would go unanswered
+        assert send_command("ping", path=socket_path, timeout=0.2) is None
+        with pytest.raises(AlreadyRunning):
+            CommandServer({}, socket_path).start()
+    finally:
+        release.set()
+        server.stop()
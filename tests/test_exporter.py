@@ -0,0 +1,57 @@
+import io
+
+import pytest
+
+from bird_code_exporter import (BINARY_MAGIC, export_file, filter_entries, iter_binary,
+                                iter_csv, read_binary)
+
+CODES = {"AMRO": "American Robin", "BLJA": "Blue Jay", "GRÜN": "Skipped", "AMGO": "American Goldfinch"}
+
+
+def binary(entries, chunk_size=1000):
+    return b"".join(iter_binary(entries, chunk_size))
+
+
+def test_binary_round_trip():
+    entries = [("AMRO", "American Robin"), ("BLJA", "Geai bleu é"), ("EMPT", "")]
+    assert list(read_binary(io.BytesIO(binary(entries, chunk_size=2)))) == entries
+
+
+def test_binary_skips_codes_that_are_not_four_ascii_letters():
+    data = binary(sorted(CODES.items()))
+    assert [code for code, _ in read_binary(io.BytesIO(data))] == ["AMGO", "AMRO", "BLJA"]
+
+
+def test_binary_truncates_long_names_on_a_character_boundary():
+    name = "é" * 40000
+    (code, read_name), = read_binary(io.BytesIO(binary([("AMRO", name)])))
+    assert read_name == "é" * (0xFFFF // 2)
+
+
+def test_binary_rejects_other_files():
+    with pytest.raises(ValueError):
+        list(read_binary(io.BytesIO(b"code,name\n")))
+
+
+@pytest.mark.parametrize("cut", [1, 3, 8])
+def test_binary_rejects_truncated_files(cut):
+    data = binary([("AMRO", "American Robin")])
+    with pytest.raises(ValueError):
+        list(read_binary(io.BytesIO(data[:-cut])))
+
+
+def test_empty_binary_export_is_just_the_header():
+    assert binary([]) == BINARY_MAGIC
+
+
+def test_csv_chunks_join_to_whole_file():
+    entries = list(filter_entries(CODES, prefix="am"))
+    chunks = list(iter_csv(entries, chunk_size=1))
+    assert "".join(chunks) == "code,name\nAMGO,American Goldfinch\nAMRO,American Robin\n"
+
+
+def test_export_file_picks_format_from_extension(tmp_path):
+    path = tmp_path / "codes.bcd"
+    assert export_file(str(path), CODES, search="jay") == 1
+    with open(path, "rb") as f:
+        assert list(read_binary(f)) == [("BLJA", "Blue Jay")]
@@ -0,0 +1,33 @@
+from bird_code_generator import ASSIGNED, CONFLICT, EXISTS, RESOLVED, fallback_codes, generate_codes
+
+
+def test_standard_codes_and_existing_names():
+    results = generate_codes(["American Robin", "  Blue   Jay ", "american robin", "123", ""],
+                             existing={"BLJA": "Blue Jay"})
+    assert [(r.name, r.code, r.status) for r in results] == [
+        ("American Robin", "AMRO", ASSIGNED),
+        ("Blue Jay", "BLJA", EXISTS),
+    ]
+
+
+def test_shared_codes_are_resolved_with_alternates():
+    results = generate_codes(["Great Blue Heron", "Great Black Heron"])
+    assert [r.status for r in results] == [RESOLVED, RESOLVED]
+    codes = [r.code for r in results]
+    assert len(set(codes)) == 2 and "GBHE" not in codes
+
+
+def test_taken_codes_are_never_displaced():
+    results = generate_codes(["Sora"], existing={"SORA": "Something Else"}, auto_resolve=False)
+    assert results[0].status == CONFLICT
+    assert "taken" in results[0].note
+
+    resolved = generate_codes(["Sora"], existing={"SORA": "Something Else"})
+    assert resolved[0].status == RESOLVED and resolved[0].code != "SORA"
+
+
+def test_fallback_codes_keep_the_leading_letters():
+    codes = list(fallback_codes("SORA"))
+    assert codes[:2] == ["SORA", "SORB"]
+    assert codes[26] == "SOAA"
+    assert len(codes) == 26 + 26 * 26
@@ -0,0 +1,89 @@
+import datetime
+import json
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bird_code_arrays import CodeArrays, _years_array
+from bird_code_history import CodeHistory, parse_as_of, record_year
+
+HISTORY = {
+    "MYWA": [{"to": 1973, "name": "Myrtle Warbler"}],
+    "YRWA": [{"from": 1973, "to": 2003, "name": "Yellow-rumped Warbler (old)"}],
+}
+
+
+def test_name_as_of_a_year():
+    history = CodeHistory.from_dict(HISTORY)
+    assert history.name_as_of("MYWA", 1970) == "Myrtle Warbler"
+    assert history.name_as_of("MYWA", 1980, "Now") == "Now"
+    assert history.name_as_of("YRWA", 1960, "Yellow-rumped Warbler") is None
+    assert history.name_as_of("YRWA", 1990) == "Yellow-rumped Warbler (old)"
+    assert history.name_as_of("AMRO", 1900, "American Robin") == "American Robin"
+
+
+def test_overlapping_revisions_are_refused():
+    history = CodeHistory.from_dict(HISTORY)
+    with pytest.raises(ValueError):
+        history.add_revision("YRWA", 2000, 2005, "Overlap")
+    history.add_revision("yrwa", 2003, 2005, None)
+    assert [revision.end for revision in history.revisions("YRWA")] == [2003, 2005]
+    assert history.name_as_of("YRWA", 2004, "Now") is None
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / "history.json")
+    history = CodeHistory.from_dict(HISTORY, path)
+    history.save()
+    assert json.load(open(path, encoding="utf-8")) == HISTORY
+    loaded = CodeHistory(path)
+    seen = []
+    loaded.subscribe(lambda: seen.append(loaded.version))
+    loaded.load()
+    assert loaded.codes() == ["MYWA", "YRWA"] and seen == [1]
+
+
+def test_readers_never_see_half_replaced_revisions():
+    history = CodeHistory.from_dict({"TEST": [{"to": 2000, "name": "Old"}]})
+    stop = threading.Event()
+    errors = []
+
+    def read():
+        while not stop.is_set():
+            try:
+                history.name_as_of("TEST", 1999)
+            except IndexError as e:
+                errors.append(e)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    for year in range(2000, 2400):
+        history.add_revision("TEST", year, year + 1, str(year))
+    history.remove_revisions("TEST")
+    stop.set()
+    reader.join()
+    assert errors == []
+
+
+def test_years_from_dates_and_text():
+    assert record_year(datetime.date(1998, 6, 14)) == 1998
+    assert record_year(pd.Timestamp("2001-02-03")) == 2001
+    assert record_year("14/06/1998") == 1998
+    assert record_year(None) is None
+    assert parse_as_of("amro in 1998") == ("AMRO", 1998)
+
+    years = _years_array([datetime.date(1970, 1, 1), "1990-05-01", None, pd.Timestamp("2010-01-01")])
+    assert list(years[[0, 1, 3]]) == [1970, 1990, 2010]
+    assert years[2] == np.iinfo(np.int64).min
+
+
+def test_arrays_decode_as_of_each_rows_date():
+    arrays = CodeArrays({"MYWA": "Myrtle Warbler", "YRWA": "Yellow-rumped Warbler"},
+                        CodeHistory.from_dict(HISTORY))
+    names, found = arrays.decode(["YRWA", "YRWA", "YRWA", "MYWA"],
+                                 years=[datetime.date(1960, 1, 1), datetime.date(1990, 1, 1),
+                                        datetime.date(2010, 1, 1), datetime.date(1970, 1, 1)])
+    assert list(names) == [None, "Yellow-rumped Warbler (old)", "Yellow-rumped Warbler", "Myrtle Warbler"]
+    assert list(found) == [False, True, True, True]
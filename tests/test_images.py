@@ -0,0 +1,63 @@
+import os
+
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+import bird_code_images
+from bird_code_images import ImageCards, image_code, import_images, name_index, thumbnail_path
+
+CODES = {"AMRO": "American Robin", "BLJA": "Blue Jay"}
+
+
+def write_photo(path, size=(400, 200), color=(200, 50, 50)):
+    Image.new("RGB", size, color).save(path)
+
+
+def test_photo_names_map_to_codes():
+    names = name_index(CODES)
+    assert image_code("AMRO.jpg", names) == "AMRO"
+    assert image_code("american_robin.JPG", names) == "AMRO"
+    assert image_code("Blue  Jay.png", names) == "BLJA"
+    assert image_code("amro.jpg", names) is None
+    assert image_code("AMRO.txt", names) is None
+
+
+def test_import_makes_scaled_thumbnails(tmp_path):
+    source = tmp_path / "photos"
+    source.mkdir()
+    write_photo(source / "American Robin.jpg")
+    write_photo(source / "Unknown Bird.jpg")
+    thumbs = tmp_path / "thumbs"
+    made, skipped = import_images(str(source), CODES, str(thumbs), size=(100, 100))
+    assert (made, skipped) == (1, ["Unknown Bird.jpg"])
+    with Image.open(thumbnail_path("AMRO", str(thumbs))) as image:
+        assert image.size == (100, 50)
+
+
+def make_cards(tmp_path):
+    images = tmp_path / "images"
+    images.mkdir()
+    return ImageCards(None, CODES, str(images), str(images / "thumbnails"), size=(60, 60)), images
+
+
+def test_load_rebuilds_thumbnails_for_changed_photos(tmp_path):
+    cards, images = make_cards(tmp_path)
+    photo = images / "AMRO.png"
+    write_photo(photo, color=(255, 0, 0))
+    assert cards.load("AMRO").getpixel((0, 0))[:3] == (255, 0, 0)
+
+    write_photo(photo, color=(0, 0, 255))
+    later = os.path.getmtime(thumbnail_path("AMRO", cards.thumb_dir)) + 10
+    os.utime(photo, (later, later))
+    assert cards.load("AMRO").getpixel((0, 0))[:3] == (0, 0, 255)
+
+
+def test_photos_added_later_are_found(tmp_path, monkeypatch):
+    monkeypatch.setattr(bird_code_images, "MISSING_RECHECK", 0.0)
+    cards, images = make_cards(tmp_path)
+    assert cards.load("BLJA") is None
+    write_photo(images / "Blue Jay.jpg")
+    stamp = os.stat(images).st_mtime_ns + 10 ** 9
+    os.utime(images, ns=(stamp, stamp))
+    assert cards.load("BLJA") is not None
@@ -0,0 +1,36 @@
+import io
+
+from bird_code_importer import clean_name, detect_format, import_file, import_stream, iter_entries
+
+
+def test_table_format_spans_lines():
+    text = "AMRO American\nRobin BLJA Blue Jay\n\nXXEX Extinct † Bird\n"
+    assert list(iter_entries(io.StringIO(text))) == [
+        ("AMRO", "American Robin"), ("BLJA", "Blue Jay"), ("XXEX", "Extinct Bird")]
+
+
+def test_csv_header_picks_columns():
+    text = "Common Name,Alpha Code\nAmerican Robin,amro\nBlue Jay,BLJA\nBad,TOOLONG\n"
+    assert import_stream(io.StringIO(text), "csv") == {"AMRO": "American Robin", "BLJA": "Blue Jay"}
+
+
+def test_tsv_without_header():
+    text = "AMRO\tAmerican Robin\nBLJA\tBlue Jay\n"
+    assert import_stream(io.StringIO(text)) == {"AMRO": "American Robin", "BLJA": "Blue Jay"}
+
+
+def test_detect_format():
+    assert detect_format("AMRO\tAmerican Robin") == "tsv"
+    assert detect_format("code,name") == "csv"
+    assert detect_format("AMRO American Robin, the bird") == "table"
+    assert clean_name("  Robin  † ") == "Robin"
+
+
+def test_progress_reports_final_count(tmp_path):
+    path = tmp_path / "codes.txt"
+    path.write_text("\n".join(f"A{chr(65 + i // 26)}{chr(65 + i % 26)}A Bird {i}" for i in range(600)),
+                    encoding="utf-8")
+    seen = []
+    codes = import_file(str(path), progress=seen.append)
+    assert len(codes) == 600
+    assert seen[-1] == 600
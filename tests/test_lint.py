@@ -0,0 +1,31 @@
+from bird_code_lint import (DUPLICATE_NAME, EMPTY_NAME, INVALID_CODE, RULE_MISMATCH, candidate_codes,
+                            count_problems, expected_code, run_lint)
+
+
+def test_expected_codes_follow_the_rules():
+    assert expected_code("Sora") == "SORA"
+    assert expected_code("American Robin") == "AMRO"
+    assert expected_code("Great Blue Heron") == "GBHE"
+    assert expected_code("Black-and-white Warbler") == "BAWW"
+    assert expected_code("Northern Flicker (Yellow-shafted)") == "NOFL"
+    assert "RIPH" in candidate_codes("Ring-necked Pheasant")
+
+
+def test_lint_reports_each_kind_of_issue():
+    issues = run_lint({"AMRO": "American Robin", "amro": "Robin", "EMPT": " ",
+                       "XXXX": "Blue Jay", "BLJA": "Blue  jay"})
+    kinds = {(issue.code, issue.kind) for issue in issues}
+    assert ("amro", INVALID_CODE) in kinds
+    assert ("EMPT", EMPTY_NAME) in kinds
+    assert ("XXXX", RULE_MISMATCH) in kinds
+    assert ("XXXX", DUPLICATE_NAME) in kinds and ("BLJA", DUPLICATE_NAME) in kinds
+    assert ("AMRO", RULE_MISMATCH) not in kinds
+    assert count_problems(issues) == 4
+
+
+def test_large_duplicate_groups_list_a_few_codes():
+    codes = {f"D{chr(65 + i // 26)}{chr(65 + i % 26)}A": "Same Bird" for i in range(40)}
+    issues = run_lint(codes, check_rules=False)
+    assert len(issues) == 40
+    assert issues[0].message == "Same name as DABA, DACA, DADA, DAEA, DAFA and 34 more"
+    assert issues[-1].message == "Same name as DAAA, DABA, DACA, DADA, DAEA and 34 more"
@@ -0,0 +1,44 @@
+import json
+
+from bird_code_locales import DEFAULT_LOCALE, LocaleNames, ShardCache, available_locales
+
+
+def write_shard(directory, locale, names):
+    (directory / f"{locale}.json").write_text(json.dumps(names), encoding="utf-8")
+
+
+def test_available_locales_lists_shards(tmp_path):
+    write_shard(tmp_path, "fr", {})
+    write_shard(tmp_path, "de", {})
+    (tmp_path / "notes.txt").write_text("")
+    assert available_locales(str(tmp_path)) == [DEFAULT_LOCALE, "de", "fr"]
+    assert available_locales(str(tmp_path / "missing")) == [DEFAULT_LOCALE]
+
+
+def test_names_fall_back_to_the_repository(tmp_path):
+    write_shard(tmp_path, "fr", {"AMRO": "Merle d'Amérique", "BLJA": ""})
+    repository = {"AMRO": "American Robin", "BLJA": "Blue Jay"}
+    names = LocaleNames(repository, "fr", ShardCache(str(tmp_path)))
+    assert names.name("AMRO") == "Merle d'Amérique"
+    assert names.name("BLJA") == "Blue Jay"
+    assert names.name("NOPE", "?") == "?"
+    assert names.localized_name("BLJA") == ""
+
+
+def test_shards_are_shared_and_released(tmp_path):
+    write_shard(tmp_path, "fr", {"AMRO": "Merle d'Amérique"})
+    cache = ShardCache(str(tmp_path))
+    popup = LocaleNames({}, "fr", cache)
+    manager = LocaleNames({}, "fr", cache)
+    assert cache.loaded() == ["fr"]
+    popup.close()
+    assert cache.loaded() == ["fr"]
+    manager.set_locale(DEFAULT_LOCALE)
+    assert cache.loaded() == []
+
+
+def test_missing_shard_keeps_the_current_locale(tmp_path):
+    names = LocaleNames({"AMRO": "American Robin"}, cache=ShardCache(str(tmp_path)))
+    assert not names.set_locale("xx")
+    assert names.locale == DEFAULT_LOCALE
+    assert names.name("AMRO") == "American Robin"
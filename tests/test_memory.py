@@ -0,0 +1,44 @@
+from bird_code_memory import MemoryMonitor, format_soak_report, soak_test
+
+
+def test_warning_is_given_once_per_excursion():
+    warnings = []
+    monitor = MemoryMonitor(object_budget=100, on_warning=warnings.append, log_path=None)
+    monitor.sample()
+    monitor.sample()
+    assert len(warnings) == 1
+    assert "over the budget of 100" in warnings[0]
+
+    monitor.object_budget = 10 ** 12
+    monitor.sample()
+    monitor.object_budget = 100
+    monitor.sample()
+    assert len(warnings) == 2
+
+
+def test_samples_are_logged(tmp_path):
+    path = tmp_path / "memory.tsv"
+    monitor = MemoryMonitor(log_path=str(path))
+    monitor.sample()
+    monitor.sample()
+    assert len(path.read_text().splitlines()) == 2
+    assert "Memory:" in monitor.summary_text()
+
+
+class Leak:
+    pass
+
+
+def test_soak_test_finds_a_leak():
+    kept = []
+    report = soak_test(lambda value: kept.append(Leak()), ["AMRO", "BLJA"],
+                       iterations=400, sample_every=100, warmup=10)
+    assert len(report.samples) == 5
+    assert ("Leak", 400) in report.type_growth
+    assert "Types that grew" in format_soak_report(report)
+
+
+def test_soak_test_is_flat_without_a_leak():
+    report = soak_test(lambda value: [Leak() for _ in range(5)], ["AMRO"],
+                       iterations=400, sample_every=100, warmup=10)
+    assert "Leak" not in dict(report.type_growth)
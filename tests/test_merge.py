@@ -0,0 +1,42 @@
+from bird_code_merge import (ADDED, DESCRIPTION_CHANGED, REMOVED, RENAMED, Change, apply_changes,
+                             combine_lists, diff_code_lists, format_diff)
+
+
+def test_combine_lists_later_list_wins():
+    combined = list(combine_lists([{"AMRO": "Robin", "BLJA": "Blue Jay"}, {"AMRO": "American Robin"}]))
+    assert combined == [("AMRO", "American Robin"), ("BLJA", "Blue Jay")]
+
+
+def test_diff_finds_every_kind_of_change():
+    current = {"AMRO": "American Robin", "BLJA": "Blue Jay", "OLDC": "Gray Jay", "GONE": "Extinct"}
+    incoming = {"AMRO": "American Robin", "BLJA": "Blue jay", "CAJA": "gray  jay", "NEWC": "New Bird"}
+    changes = diff_code_lists(current, incoming)
+    assert changes == [
+        Change(DESCRIPTION_CHANGED, "BLJA", "Blue Jay", "Blue jay", "BLJA"),
+        Change(REMOVED, "GONE", "Extinct", None, None),
+        Change(ADDED, "NEWC", None, "New Bird", "NEWC"),
+        Change(RENAMED, "OLDC", "Gray Jay", "gray  jay", "CAJA"),
+    ]
+
+
+def test_partial_lists_do_not_remove_codes():
+    changes = diff_code_lists({"AMRO": "American Robin"}, [{"BLJA": "Blue Jay"}], include_removed=False)
+    assert [change.kind for change in changes] == [ADDED]
+
+
+def test_apply_changes_allows_chained_renames():
+    data = {"AMRO": "American Robin", "AMRX": "Robin X"}
+    changes = [Change(RENAMED, "AMRO", "American Robin", "American Robin", "AMRX"),
+               Change(RENAMED, "AMRX", "Robin X", "Robin X", "AMRY")]
+    assert apply_changes(data, changes) == {"AMRX": "American Robin", "AMRY": "Robin X"}
+
+
+def test_applying_the_diff_gives_the_incoming_list():
+    current = {"AMRO": "American Robin", "BLJA": "Blue Jay", "OLDC": "Gray Jay"}
+    incoming = {"AMRO": "American robin", "CAJA": "Gray Jay", "NOCA": "Northern Cardinal"}
+    assert apply_changes(dict(current), diff_code_lists(current, incoming)) == incoming
+
+
+def test_format_diff_summary():
+    text = format_diff([Change(ADDED, "NEWC", None, "New Bird", "NEWC")])
+    assert text.splitlines() == ["+ NEWC: New Bird", "1 added, 0 removed, 0 renamed, 0 description changed"]
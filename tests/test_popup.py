@@ -0,0 +1,49 @@
+from bird_code_popup import PopupHost
+
+
+class FakeRoot:
+    def __init__(self, host=None):
+        self.host = host
+        self.timers = []
+
+    def after(self, delay, func):
+        self.timers.append(func)
+
+    def quit(self):
+        pass
+
+    # Tk would run the <<Wake>> binding on its own thread
+    def event_generate(self, sequence, when=None):
+        assert sequence == "<<Wake>>" and when == "tail"
+        if self.host is not None:
+            self.host._on_wake(None)
+
+
+def test_poll_keeps_running_after_a_failed_popup(monkeypatch):
+    host = PopupHost()
+    host.root = FakeRoot()
+    shown = []
+
+    def create_popup(message, image=None, key=None):
+        if message == "bad":
+            raise ValueError("broken popup")
+        shown.append(message)
+
+    monkeypatch.setattr(host, "_create_popup", create_popup)
+    host._queue.put(("bad", None, None))
+    host._queue.put(("AMRO", None, None))
+    host._poll()
+    assert shown == ["AMRO"]
+    assert host.root.timers == [host._poll]
+
+    host._queue.put(("BLJA", None, None))
+    host.root.timers.pop()()
+    assert shown == ["AMRO", "BLJA"]
+
+
+def test_call_wakes_the_popup_thread_without_waiting_for_a_poll():
+    host = PopupHost()
+    host.root = FakeRoot(host)
+    host._thread = object()
+    assert host.call(lambda root: root is host.root, timeout=0.01) is True
+    assert host.root.timers == []
@@ -0,0 +1,57 @@
+import itertools
+import string
+from collections import Counter
+
+import pytest
+
+from bird_code_prefix import PrefixIndex
+from bird_code_repository import CodeRepository
+
+
+@pytest.fixture
+def index():
+    return PrefixIndex(["AMRO", "AMCR", "AMGO", "BLJA", "BAEA", "AMKE"])
+
+
+def test_bounds_and_count(index):
+    assert index.codes_with_prefix("AM") == ["AMCR", "AMGO", "AMKE", "AMRO"]
+    assert index.count("B") == 2
+    assert index.count("Z") == 0
+    assert index.count("") == 6
+
+
+def test_complete_without_weights_is_alphabetical(index):
+    assert index.complete("AM", 2) == (["AMCR", "AMGO"], 4)
+
+
+def test_complete_puts_heavier_codes_first(index):
+    weights = Counter({"AMRO": 5, "AMKE": 2, "BLJA": 9, "AMGO": 0, "XXXX": 4})
+    assert index.complete("AM", 3, weights) == (["AMRO", "AMKE", "AMCR"], 4)
+    assert index.complete("AM", 10, weights) == (["AMRO", "AMKE", "AMCR", "AMGO"], 4)
+
+
+def test_complete_ignores_weighted_codes_no_longer_listed(index):
+    index.discard("AMRO")
+    assert index.complete("AM", 2, {"AMRO": 10}) == (["AMCR", "AMGO"], 3)
+
+
+def test_complete_matches_full_ranking():
+    codes = ["".join(letters) for letters in itertools.product("ABC", string.ascii_uppercase, "AB", "XY")]
+    index = PrefixIndex(codes)
+    weights = {code: i % 4 for i, code in enumerate(codes[::7])}
+    for prefix in ("", "A", "BQ", "CZB"):
+        expected = sorted((code for code in codes if code.startswith(prefix)),
+                          key=lambda code: (-weights.get(code, 0), code))[:8]
+        assert index.complete(prefix, 8, weights)[0] == expected
+
+
+def test_attach_follows_repository(tmp_path):
+    repository = CodeRepository(str(tmp_path / "codes.json"))
+    repository.load()
+    index = PrefixIndex()
+    index.attach(repository)
+    with repository.transaction() as transaction:
+        transaction.set("AMRO", "American Robin")
+        transaction.delete("TEST")
+    assert "AMRO" in index
+    assert "TEST" not in index
@@ -0,0 +1,42 @@
+import pstats
+
+import pytest
+
+import bird_code_profiling
+
+
+@pytest.fixture
+def reports(monkeypatch):
+    written = {}
+
+    def write(section, profiler, elapsed):
+        written[section] = {function for _, _, function in pstats.Stats(profiler).stats}
+        return None
+
+    monkeypatch.setattr(bird_code_profiling, "write_profile_report", write)
+    monkeypatch.setattr(bird_code_profiling, "_enabled", frozenset({"hotkey", "popup"}))
+    return written
+
+
+def test_nested_section_does_not_replace_the_outer_profile(reports):
+    def work():
+        return sum(range(1000))
+
+    @bird_code_profiling.profiled("popup")
+    def popup():
+        return work()
+
+    @bird_code_profiling.profiled("hotkey")
+    def hotkey():
+        popup()
+        return work()
+
+    hotkey()
+    assert set(reports) == {"hotkey"}
+    assert {"popup", "work"} <= reports["hotkey"]
+    assert bird_code_profiling._active_profile is None
+
+
+def test_disabled_sections_are_not_profiled(reports):
+    assert bird_code_profiling.start_profile("save").stop() is None
+    assert reports == {}
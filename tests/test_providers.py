@@ -0,0 +1,220 @@
+import threading
+import time
+from concurrent.futures import Future
+
+import pytest
+
+from bird_code_providers import (Answer, LocalProvider, ProviderChain, ReverseNameProvider,
+                                 TTLCache, format_answers)
+from bird_code_repository import CodeRepository
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class SlowProvider:
+    authoritative = False
+    blocking = True
+
+    def __init__(self, name, delay=0.0, answer=None, timeout=1.0):
+        self.name = name
+        self.delay = delay
+        self.answer = answer
+        self.timeout = timeout
+        self.calls = 0
+
+    def accepts(self, text):
+        return True
+
+    def lookup(self, code):
+        self.calls += 1
+        time.sleep(self.delay)
+        return self.answer or f"{self.name} {code}"
+
+
+# Runs work as it is submitted, so futures are done before submit() returns
+class ImmediateExecutor:
+    def submit(self, func, *args):
+        future = Future()
+        try:
+            future.set_result(func(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def shutdown(self, wait=True):
+        pass
+
+
+@pytest.fixture
+def chains():
+    made = []
+
+    def make(*args, **kwargs):
+        chain = ProviderChain(*args, **kwargs)
+        made.append(chain)
+        return chain
+
+    yield make
+    for chain in made:
+        chain.shutdown()
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Timed out waiting")
+        time.sleep(0.01)
+
+
+def test_ttl_cache_expires_entries():
+    clock = Clock()
+    cache = TTLCache(ttl=10, clock=clock)
+    cache.put("AMRO", "American Robin")
+    assert cache.get("AMRO") == (True, "American Robin")
+    clock.now = 10
+    assert cache.get("AMRO") == (False, None)
+    assert len(cache) == 0
+
+
+def test_ttl_cache_remembers_none():
+    cache = TTLCache()
+    cache.put("ZZZZ", None)
+    assert cache.get("ZZZZ") == (True, None)
+
+
+def test_ttl_cache_drops_least_recently_used():
+    cache = TTLCache(max_entries=2)
+    cache.put("A", 1)
+    cache.put("B", 2)
+    cache.get("A")
+    cache.put("C", 3)
+    assert cache.get("B") == (False, None)
+    assert cache.get("A") == (True, 1)
+    assert cache.get("C") == (True, 3)
+
+
+def test_chain_answers_local_codes_at_once(chains):
+    chain = chains([LocalProvider({"AMRO": "American Robin"})])
+    assert chain.lookup("AMRO") == ([Answer("local", "American Robin", True)], 0)
+    assert chain.lookup("BLJA") == ([], 0)
+
+
+def test_chain_does_not_deadlock_on_providers_that_finish_at_once(chains):
+    chain = chains([SlowProvider("fast")])
+    chain._executor = ImmediateExecutor()
+    done = threading.Event()
+    results = []
+
+    def run():
+        results.append(chain.lookup("AMRO"))
+        results.append(chain.lookup("BLJA"))
+        done.set()
+
+    threading.Thread(target=run, daemon=True).start()
+    assert done.wait(2.0), "lookup() never returned"
+    # Answers that were ready before lookup() returned are in its result
+    assert results == [([Answer("fast", "fast AMRO", False)], 0),
+                       ([Answer("fast", "fast BLJA", False)], 0)]
+
+
+def test_chain_reports_slow_answers_in_provider_order(chains):
+    slow = SlowProvider("slow", delay=0.1)
+    slower = SlowProvider("slower", delay=0.2)
+    chain = chains([LocalProvider({"AMRO": "American Robin"}), slower, slow])
+    updates = []
+
+    answers, pending = chain.lookup("AMRO", lambda answers, pending: updates.append((answers, pending)))
+    assert [answer.provider for answer in answers] == ["local"]
+    assert pending == 2
+
+    wait_for(lambda: updates and updates[-1][1] == 0)
+    assert [answer.provider for answer in updates[-1][0]] == ["local", "slower", "slow"]
+    # Now cached, so answered at once without asking again
+    answers, pending = chain.lookup("AMRO")
+    assert pending == 0 and len(answers) == 3
+    assert slow.calls == slower.calls == 1
+
+
+class FlakyProvider(SlowProvider):
+    def lookup(self, code):
+        self.calls += 1
+        if self.calls == 1:
+            raise OSError("service down")
+        return f"{self.name} {code}"
+
+
+def test_chain_does_not_cache_failed_lookups(chains):
+    provider = FlakyProvider("web")
+    chain = chains([provider])
+    chain._executor = ImmediateExecutor()
+    assert chain.lookup("AMRO") == ([], 0)
+    assert chain.lookup("AMRO") == ([Answer("web", "web AMRO", False)], 0)
+    assert chain.lookup("AMRO") == ([Answer("web", "web AMRO", False)], 0)
+    assert provider.calls == 2
+
+
+class SilentProvider(SlowProvider):
+    def lookup(self, code):
+        self.calls += 1
+        return None
+
+
+def test_chain_caches_a_genuine_no_answer(chains):
+    provider = SilentProvider("web")
+    chain = chains([provider])
+    chain._executor = ImmediateExecutor()
+    assert chain.lookup("AMRO") == ([], 0)
+    assert chain.lookup("AMRO") == ([], 0)
+    assert provider.calls == 1
+
+
+def test_chain_gives_up_on_providers_past_their_timeout(chains):
+    chain = chains([SlowProvider("hung", delay=1.0, timeout=0.1)])
+    updates = []
+    started = time.monotonic()
+    assert chain.lookup("AMRO", lambda answers, pending: updates.append((answers, pending))) == ([], 1)
+    wait_for(lambda: updates)
+    assert updates == [([], 0)]
+    assert time.monotonic() - started < 0.9
+
+
+def test_chain_shares_overlapping_requests(chains):
+    provider = SlowProvider("web", delay=0.2)
+    chain = chains([provider])
+    chain.lookup("AMRO")
+    chain.lookup("AMRO")
+    wait_for(lambda: chain.lookup("AMRO")[1] == 0)
+    assert provider.calls == 1
+
+
+def test_chain_does_not_start_a_thread_per_lookup(chains):
+    chain = chains([SlowProvider("web", delay=0.01)], max_workers=2)
+    chain.lookup("WARM")
+    wait_for(lambda: chain.lookup("WARM")[1] == 0)
+    before = threading.active_count()
+    for i in range(50):
+        chain.lookup(f"C{i:03d}", lambda answers, pending: None)
+    assert threading.active_count() <= before + 2
+
+
+def test_reverse_name_provider_follows_repository(tmp_path):
+    repository = CodeRepository(str(tmp_path / "codes.json"))
+    repository.load()
+    provider = ReverseNameProvider(repository)
+    with repository.transaction() as transaction:
+        transaction.set("AMRO", "American Robin")
+    assert provider.lookup("AMERICAN  ROBIN") == "AMRO"
+
+
+def test_format_answers():
+    answers = [Answer("local", "American Robin", True), Answer("project", "Robin", False)]
+    assert format_answers("AMRO", answers, 1) == (
+        "AMRO: American Robin\n  project: Robin\n(checking 1 more source…)")
+    assert format_answers("ZZZZ", []) == "ZZZZ: Code not found"
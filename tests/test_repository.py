@@ -0,0 +1,40 @@
+import pytest
+
+from bird_code_repository import ADDED, CodeRepository
+
+
+@pytest.fixture
+def repository(tmp_path):
+    repository = CodeRepository(str(tmp_path / "codes.json"))
+    repository.load()
+    return repository
+
+
+def test_snapshots_are_read_only(repository):
+    snapshot = repository.snapshot()
+    with pytest.raises(TypeError):
+        snapshot["AMRO"] = "American Robin"
+    with pytest.raises(TypeError):
+        del snapshot["TEST"]
+    copy = snapshot.copy()
+    copy["AMRO"] = "American Robin"
+    assert "AMRO" not in repository
+
+
+def test_commits_swap_snapshots_and_notify(repository):
+    events = []
+    repository.subscribe(events.extend)
+    before = repository.snapshot()
+    with repository.transaction() as transaction:
+        transaction.set("AMRO", "American Robin")
+    assert "AMRO" not in before
+    assert repository["AMRO"] == "American Robin"
+    assert [event.action for event in events] == [ADDED]
+
+
+def test_failed_transaction_changes_nothing(repository):
+    with pytest.raises(RuntimeError):
+        with repository.transaction() as transaction:
+            transaction.set("AMRO", "American Robin")
+            raise RuntimeError("abandoned")
+    assert "AMRO" not in repository
@@ -0,0 +1,51 @@
+import pytest
+
+from bird_code_search import QueryError, SearchIndex, parse_query, regex_literals
+
+ENTRIES = {
+    "AMRO": "American Robin",
+    "AMRE": "American Redstart",
+    "BLBW": "Blackburnian Warbler",
+    "HETH": "Hermit Thrush",
+    "LEGO": "Lesser Goldfinch",
+    "GRYE": "Greater Yellowlegs",
+    "RWBL": "Red-winged Blackbird",
+    "BIRD": "Bird sp.",
+}
+
+
+def make_index():
+    return SearchIndex.from_entries((code, {"code": code, "name": name}) for code, name in ENTRIES.items())
+
+
+def test_words_phrases_and_globs():
+    index = make_index()
+    assert index.search("warbler") == ["BLBW"]
+    assert index.search('"hermit thrush"') == ["HETH"]
+    assert index.search("code:AM*") == ["AMRE", "AMRO"]
+    assert index.search("name:*robin") == ["AMRO"]
+    assert index.search("american -name:robin") == ["AMRE"]
+
+
+def test_regular_expressions_keep_their_escapes():
+    index = make_index()
+    assert index.search(r"name:/\Sbird/") == ["RWBL"]
+    assert index.search(r"name:/\Abird/") == ["BIRD"]
+    assert index.search(r"name:/^(lesser|greater) /") == ["GRYE", "LEGO"]
+    assert index.search(r"code:/^AM\w\D$/") == ["AMRE", "AMRO"]
+    assert regex_literals(r"^Hermit\s+Thrush$") == ["\x02hermit", "thrush\x03"]
+
+
+def test_index_follows_edits():
+    index = make_index()
+    index.add("AMRO", {"code": "AMRO", "name": "Robin"})
+    assert index.search("american") == ["AMRE"]
+    index.remove("AMRE")
+    assert index.search("american") == []
+    assert index.search("code:A*") == ["AMRO"]
+    assert len(index) == len(ENTRIES) - 1
+
+
+def test_bad_regex_is_reported():
+    with pytest.raises(QueryError):
+        parse_query("name:/(unclosed/")
@@ -0,0 +1,53 @@
+import bird_code_session
+from bird_code_session import RollingTally, SessionLog, likely_codes
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_rolling_tally_expires_old_decodes():
+    tally = RollingTally(60)
+    tally.add(0, "AMRO")
+    tally.add(30, "AMRO")
+    tally.add(50, "BLJA")
+    tally.expire(75)
+    assert tally.counts == {"AMRO": 1, "BLJA": 1}
+
+
+def test_summary_shows_rolling_windows():
+    clock = Clock()
+    log = SessionLog("unused.tsv", windows=(300, 3600), clock=clock)
+    for code in ("AMRO", "AMRO", "BLJA"):
+        log.record(code, code.title())
+    clock.now += 600
+    log.record("NOCA", "Northern Cardinal")
+    lines = log.summary_text().splitlines()
+    assert lines[0] == "Session: 4 decodes, 3 species (10 min)"
+    assert "Last 5 min: 1 decodes, 1 species (NOCA 1)" in lines
+    assert "Last 1 h: 4 decodes, 3 species (AMRO 2, BLJA 1, NOCA 1)" in lines
+
+
+def test_flush_appends_and_likely_codes_reads_back(tmp_path):
+    path = str(tmp_path / "log.tsv")
+    log = SessionLog(path)
+    for code in ("AMRO", "BLJA", "AMRO", "NOCA"):
+        log.record(code, code.title())
+    assert log.flush() == 4
+    assert log.flush() == 0
+    assert likely_codes(path) == ["AMRO", "NOCA", "BLJA"]
+
+
+def test_unwritable_log_keeps_a_bounded_buffer(tmp_path, monkeypatch):
+    monkeypatch.setattr(bird_code_session, "MAX_PENDING", 3)
+    log = SessionLog(str(tmp_path / "missing" / "log.tsv"))
+    for i in range(5):
+        log.record("AMRO", "American Robin")
+        log.flush()
+    assert len(log._pending) == 3
+    assert log.dropped == 2
+    assert "2 log entries could not be written" in log.summary_text()
@@ -0,0 +1,47 @@
+import pytest
+
+from bird_code_store import CodeStore, OverlayMap, code_to_index, index_to_code
+
+
+def test_code_index_round_trip():
+    assert code_to_index("AAAA") == 0
+    assert code_to_index("ZZZZ") == 26 ** 4 - 1
+    assert index_to_code(code_to_index("AMRO")) == "AMRO"
+    assert code_to_index("amro") == -1
+    assert code_to_index("AMR") == -1
+
+
+def test_store_lookups():
+    store = CodeStore.from_dict({"BLJA": "Blue Jay", "AMRO": "American Robin", "ÉTOU": "Étourneau"})
+    assert list(store) == ["AMRO", "BLJA", "ÉTOU"]
+    assert store["ÉTOU"] == "Étourneau"
+    assert store.get("NOPE") is None
+    assert "BLJA" in store and 42 not in store
+    assert CodeStore.from_dict(store) is store
+    with pytest.raises(KeyError):
+        store["ZZZZ"]
+
+
+def test_overlay_records_only_differences():
+    store = CodeStore.from_dict({"AMRO": "American Robin", "BLJA": "Blue Jay"})
+    view = OverlayMap(store)
+    view["BLJA"] = "Blue jay"
+    view["NEWB"] = "New Bird"
+    del view["AMRO"]
+    assert dict(view) == {"BLJA": "Blue jay", "NEWB": "New Bird"}
+    assert view.diff() == [("AMRO", None), ("BLJA", "Blue jay"), ("NEWB", "New Bird")]
+
+    view["BLJA"] = "Blue Jay"
+    assert view.change_count() == 2
+    assert dict(view.compact()) == {"BLJA": "Blue Jay", "NEWB": "New Bird"}
+    assert dict(store) == {"AMRO": "American Robin", "BLJA": "Blue Jay"}
+
+
+def test_frozen_view_is_read_only_but_copies_are_not():
+    view = OverlayMap(CodeStore.from_dict({"AMRO": "American Robin"})).freeze()
+    with pytest.raises(TypeError):
+        view["AMRO"] = "Robin"
+    editable = view.copy()
+    editable["AMRO"] = "Robin"
+    assert view["AMRO"] == "American Robin"
+    assert editable["AMRO"] == "Robin"
@@ -0,0 +1,73 @@
+import os
+import subprocess
+import sys
+
+from bird_code_clipboard import FakeClipboard
+from bird_code_storm import (CapturingListener, FakePopupHost, format_storm_report, parse_load_test_args,
+                             storm_schedule, storm_test)
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CHORD = ["ctrl", "shift", "l"]
+
+
+# A decoder stand-in: reads the clipboard when the chord's last key is
+# pressed, except every `skip`th press, which it merges like the debounce
+def make_listener(host, clipboard, skip=0, fail_on=None):
+    presses = [0]
+
+    def on_press(key):
+        if key != CHORD[-1]:
+            return
+        presses[0] += 1
+        if skip and presses[0] % skip == 0:
+            return
+        text = clipboard.read()
+        if text == fail_on:
+            raise ValueError("decode failed")
+        host.show(f"{text}: decoded")
+
+    listener = CapturingListener(on_press, lambda key: None)
+    listener.start()
+    return listener
+
+
+def test_schedule_with_bursts():
+    assert storm_schedule(4, 1) == [0.0, 0.25, 0.5, 0.75]
+    assert storm_schedule(2, 4, burst=1, pause=1) == [0.0, 0.5, 2.0, 2.5]
+
+
+def test_storm_counts_presses_popups_and_repeats():
+    host = FakePopupHost()
+    clipboard = FakeClipboard()
+    listener = make_listener(host, clipboard, skip=5)
+    report = storm_test(listener, CHORD, host, clipboard, ["AMRO", "BLJA"], rate=200, duration=0.5, hold=2)
+    assert report.presses == 100
+    assert report.actions == 80 and report.coalesced == 20
+    assert report.popups == 80 and report.dropped == 0 and report.errors == 0
+    assert report.repeats > 0
+    assert len(report.latencies) == 80
+    assert "Hotkey storm: 100 presses" in format_storm_report(report)
+
+
+def test_storm_reports_failures():
+    host = FakePopupHost(error_prefixes=("Error",))
+    clipboard = FakeClipboard()
+    listener = make_listener(host, clipboard, fail_on="ZZZZ")
+    report = storm_test(listener, CHORD, host, clipboard, ["AMRO", "ZZZZ"], rate=100, duration=0.2)
+    assert report.errors == 10
+    assert report.dropped == 10
+
+
+def test_load_test_switches():
+    options, remaining = parse_load_test_args(["--storm", "50", "2", "--profile=all"])
+    assert options.storm == [50.0, 2.0] and options.soak is None
+    assert remaining == ["--profile=all"]
+
+
+def test_storm_runs_without_a_display():
+    env = {key: value for key, value in os.environ.items()
+           if key not in ("DISPLAY", "WAYLAND_DISPLAY", "PYNPUT_BACKEND", "PYSTRAY_BACKEND")}
+    result = subprocess.run([sys.executable, "Bird Code Decode.py", "--storm", "50", "1"],
+                            cwd=REPO, env=env, capture_output=True, text=True, timeout=60)
+    assert "Hotkey storm: 50 presses" in result.stdout, result.stderr
+    assert result.returncode == 0
@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+from bird_code_sync import SyncServer, SyncState, http_requester, meta_path_for, sync_state
+
+BASE = {"AMRO": "American Robin", "BLJA": "Blue Jay", "NOCA": "Northern Cardinal"}
+
+
+def write_codes(path, data):
+    with open(path, "w") as f:
+        json.dump(data, f)
+
+
+def read_codes(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def stations(tmp_path):
+    local_path = str(tmp_path / "local.json")
+    remote_path = str(tmp_path / "remote.json")
+    write_codes(local_path, BASE)
+    write_codes(remote_path, BASE)
+    server = SyncServer(remote_path, port=0)
+    yield local_path, remote_path, server
+    server.httpd.server_close()
+
+
+def sync(local_path, server):
+    state = SyncState.from_file(local_path)
+    result = sync_state(state, server.handle)
+    state.save(local_path)
+    return result
+
+
+def test_identical_lists_take_one_round_trip(stations):
+    local_path, _, server = stations
+    result = sync(local_path, server)
+    assert result.round_trips == 1
+    assert result.edits == []
+
+
+def test_edits_and_deletions_spread_both_ways(stations):
+    local_path, remote_path, server = stations
+    sync(local_path, server)
+
+    write_codes(local_path, dict(BASE, AMRO="American robin", CAJA="Canada Jay"))
+    remote = dict(BASE)
+    del remote["NOCA"]
+    write_codes(remote_path, remote)
+
+    result = sync(local_path, server)
+    expected = {"AMRO": "American robin", "BLJA": "Blue Jay", "CAJA": "Canada Jay"}
+    assert read_codes(local_path) == expected
+    assert read_codes(remote_path) == expected
+    assert result.edits == [("NOCA", None)]
+    assert sync(local_path, server).round_trips == 1
+
+
+def test_conflicts_settle_the_same_way_on_both_sides(tmp_path):
+    first = SyncState(dict(BASE), str(tmp_path / "a.sync.json"), node="a")
+    second = SyncState(dict(BASE), str(tmp_path / "b.sync.json"), node="b")
+    first.data["AMRO"] = "Robin (a)"
+    first.stamp_local_changes()
+    second.data["AMRO"] = "Robin (b)"
+    second.stamp_local_changes()
+
+    def request(method, payload):
+        if method == "buckets":
+            return {"hashes": second.bucket_hashes(payload["prefixes"])}
+        if method == "stamps":
+            return {"stamps": second.stamps_in(payload["buckets"])}
+        entries = second.entries(payload["pull"])
+        second.merge(payload["push"])
+        return {"entries": entries}
+
+    sync_state(first, request)
+    assert first.data == second.data
+    assert first.data["AMRO"] == "Robin (b)"
+
+
+def test_sync_over_http(stations):
+    local_path, remote_path, server = stations
+    write_codes(remote_path, dict(BASE, SNOW="Snowy Owl"))
+    server.start()
+    try:
+        state = SyncState.from_file(local_path)
+        result = sync_state(state, http_requester(server.address))
+    finally:
+        server.stop()
+    assert state.data["SNOW"] == "Snowy Owl"
+    assert result.pulled == 1
+
+
+def test_meta_path_sits_next_to_the_code_file():
+    assert meta_path_for("data/bird codes.json") == "data/bird codes.sync.json"